@@ -1,20 +1,46 @@
-"""Postgres connection helpers.
+"""Postgres connection pools.
 
-A new connection per unit of work (the assistant is low-volume; no pool needed).
-The database is selected via the ``DATABASE_URL`` env var, read at call time so it
-picks up ``.env`` (loaded after import in ``app/main.py``).
+Two process-wide ``psycopg_pool`` pools over ``DATABASE_URL``, each created on first
+use (the URL is read then, so it picks up ``.env`` loaded after import in
+``app/main.py``):
+
+* ``async_connection()`` — ``AsyncConnectionPool`` for everything running on the event
+  loop (the memory / scheduler / FPL / FX / geocode / maps repos), so DB work never
+  blocks it;
+* ``connection()`` — ``ConnectionPool`` for synchronous callers (schema bootstrap,
+  ``python -m app.db.migrate``).
+
+Both are sized by ``DB_POOL_MIN_SIZE`` / ``DB_POOL_MAX_SIZE`` (default 1 / 5), wait
+at most ``DB_POOL_TIMEOUT_SECONDS`` (default 10) for a free connection, health-check
+a connection before lending it, and set ``statement_timeout`` to
+``DB_STATEMENT_TIMEOUT_MS`` (default 5000) on every new connection.
+
+Every statement executed through a pooled connection is timed: ``query_stats()``
+reports count / average / max latency per statement, and statements slower than
+``DB_SLOW_QUERY_MS`` (default 200) are logged.
 """
 from __future__ import annotations
 
+import asyncio
 import contextlib
 import logging
 import os
-from typing import Iterator, Optional
+import threading
+import time
+from typing import AsyncIterator, Iterator, Optional
 
 import psycopg
+from psycopg_pool import AsyncConnectionPool, ConnectionPool
 
 logger = logging.getLogger(__name__)
 
+_POOL: Optional[ConnectionPool] = None
+_POOL_LOCK = threading.Lock()
+_ASYNC: dict = {"pool": None, "loop": None, "opened": None}
+
+_QUERY_STATS: dict[str, dict] = {}
+_STATS_LOCK = threading.Lock()
+
 
 def database_url() -> Optional[str]:
     url = os.getenv("DATABASE_URL")
@@ -26,18 +52,184 @@ def is_configured() -> bool:
     return database_url() is not None
 
 
-@contextlib.contextmanager
-def connection() -> Iterator["psycopg.Connection"]:
-    """Yield a Postgres connection, committing on success and rolling back on error."""
+def _env_number(name: str, default: float) -> float:
+    raw = os.getenv(name, "")
+    try:
+        return float(raw) if raw.strip() else default
+    except ValueError:
+        return default
+
+
+def pool_settings() -> dict:
+    """Pool sizing and timeouts from the environment (see the module docstring)."""
+    min_size = max(0, int(_env_number("DB_POOL_MIN_SIZE", 1)))
+    return {
+        "min_size": min_size,
+        "max_size": max(min_size, 1, int(_env_number("DB_POOL_MAX_SIZE", 5))),
+        "timeout": _env_number("DB_POOL_TIMEOUT_SECONDS", 10.0),
+        "statement_timeout_ms": int(_env_number("DB_STATEMENT_TIMEOUT_MS", 5000)),
+    }
+
+
+# -- per-query latency ---------------------------------------------------------
+
+def _statement(query) -> str:
+    text = query.decode() if isinstance(query, bytes) else str(query)
+    return " ".join(text.split())[:120]
+
+
+def record_query(query, seconds: float) -> None:
+    """Account one executed statement (called by the pooled connections' cursors)."""
+    key = _statement(query)
+    if not key:  # the pool's health-check ping
+        return
+    ms = seconds * 1000
+    with _STATS_LOCK:
+        stats = _QUERY_STATS.setdefault(key, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        stats["count"] += 1
+        stats["total_ms"] += ms
+        stats["max_ms"] = max(stats["max_ms"], ms)
+    if ms >= _env_number("DB_SLOW_QUERY_MS", 200):
+        logger.warning("[db] slow query (%.0f ms): %s", ms, key)
+
+
+def query_stats() -> dict[str, dict]:
+    """Per-statement latency since process start: count, avg_ms, max_ms, total_ms."""
+    with _STATS_LOCK:
+        return {
+            key: {
+                "count": s["count"],
+                "avg_ms": round(s["total_ms"] / s["count"], 2),
+                "max_ms": round(s["max_ms"], 2),
+                "total_ms": round(s["total_ms"], 2),
+            }
+            for key, s in _QUERY_STATS.items()
+        }
+
+
+def reset_query_stats() -> None:
+    with _STATS_LOCK:
+        _QUERY_STATS.clear()
+
+
+class _TimedCursor(psycopg.Cursor):
+    def execute(self, query, params=None, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().execute(query, params, **kwargs)
+        finally:
+            record_query(query, time.perf_counter() - start)
+
+
+class _AsyncTimedCursor(psycopg.AsyncCursor):
+    async def execute(self, query, params=None, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await super().execute(query, params, **kwargs)
+        finally:
+            record_query(query, time.perf_counter() - start)
+
+
+# -- pools ----------------------------------------------------------------------
+
+def _pool_kwargs(settings: dict) -> dict:
     url = database_url()
     if not url:
         raise RuntimeError("DATABASE_URL is not set")
-    conn = psycopg.connect(url)
-    try:
+    return {
+        "conninfo": url,
+        "min_size": settings["min_size"],
+        "max_size": settings["max_size"],
+        "timeout": settings["timeout"],
+        "open": False,
+    }
+
+
+def _sync_pool() -> ConnectionPool:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            settings = pool_settings()
+            timeout_ms = settings["statement_timeout_ms"]
+
+            def configure(conn: psycopg.Connection) -> None:
+                conn.execute(f"SET statement_timeout = {timeout_ms}")
+                conn.commit()
+
+            pool = ConnectionPool(
+                **_pool_kwargs(settings), name="jarvis",
+                kwargs={"cursor_factory": _TimedCursor},
+                configure=configure, check=ConnectionPool.check_connection,
+            )
+            pool.open()
+            _POOL = pool
+            logger.info("Postgres pool opened (size %d-%d)", settings["min_size"], settings["max_size"])
+        return _POOL
+
+
+async def _async_pool() -> AsyncConnectionPool:
+    """The async pool of the running event loop (a pool is bound to the loop it was
+    opened on; a new loop, e.g. a fresh ``asyncio.run``, gets its own)."""
+    loop = asyncio.get_running_loop()
+    if _ASYNC["pool"] is None or _ASYNC["loop"] is not loop:
+        settings = pool_settings()
+        timeout_ms = settings["statement_timeout_ms"]
+
+        async def configure(conn: psycopg.AsyncConnection) -> None:
+            await conn.execute(f"SET statement_timeout = {timeout_ms}")
+            await conn.commit()
+
+        pool = AsyncConnectionPool(
+            **_pool_kwargs(settings), name="jarvis-async",
+            kwargs={"cursor_factory": _AsyncTimedCursor},
+            configure=configure, check=AsyncConnectionPool.check_connection,
+        )
+        # Registered before opening so concurrent first callers share one pool.
+        _ASYNC.update(pool=pool, loop=loop, opened=asyncio.ensure_future(pool.open()))
+        logger.info("Postgres async pool opened (size %d-%d)", settings["min_size"], settings["max_size"])
+    await _ASYNC["opened"]
+    return _ASYNC["pool"]
+
+
+@contextlib.contextmanager
+def connection() -> Iterator["psycopg.Connection"]:
+    """Yield a pooled Postgres connection inside a transaction: committed on success,
+    rolled back on error, then returned to the pool."""
+    with _sync_pool().connection() as conn:
+        yield conn
+
+
+@contextlib.asynccontextmanager
+async def async_connection() -> AsyncIterator["psycopg.AsyncConnection"]:
+    """Async counterpart of ``connection()``, from the event loop's async pool."""
+    pool = await _async_pool()
+    async with pool.connection() as conn:
         yield conn
-        conn.commit()
-    except Exception:
-        conn.rollback()
-        raise
-    finally:
-        conn.close()
+
+
+def pool_stats() -> dict:
+    """``psycopg_pool`` counters (requests, waits, errors, sizes) of the open pools."""
+    stats = {}
+    if _POOL is not None:
+        stats["sync"] = _POOL.get_stats()
+    if _ASYNC["pool"] is not None:
+        stats["async"] = _ASYNC["pool"].get_stats()
+    return stats
+
+
+def close_pool() -> None:
+    """Close the sync pool (end of a CLI run / service shutdown)."""
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.close()
+
+
+async def close_pools() -> None:
+    """Close both pools; called from the webhook's lifespan shutdown."""
+    pool = _ASYNC["pool"]
+    _ASYNC.update(pool=None, loop=None, opened=None)
+    if pool is not None:
+        await pool.close()
+    await asyncio.to_thread(close_pool)
@@ -11,14 +11,15 @@ to the live API when it is not available.
 """
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import datetime, timezone
 from typing import Optional
 
 from psycopg.types.json import Json
 
-from app.db.connection import connection
-from app.db.schema import init_db
+from app.db.connection import async_connection
+from app.db.schema import init_db, schema_ensured
 
 logger = logging.getLogger(__name__)
 
@@ -26,26 +27,23 @@ logger = logging.getLogger(__name__)
 # table with distinct ids if ever needed.
 _BOOTSTRAP_ID = "bootstrap"
 
-_schema_ready = False
 
+async def _ensure_schema() -> None:
+    """Migrate the schema on first use in this process; a flag check afterwards."""
+    if not schema_ensured():
+        await asyncio.to_thread(init_db)
 
-def _ensure_schema() -> None:
-    """Create the tables on first use (idempotent). Cheap after the first call."""
-    global _schema_ready
-    if not _schema_ready:
-        init_db()
-        _schema_ready = True
 
-
-def get_cached_bootstrap(max_age_seconds: int) -> Optional[dict]:
+async def get_cached_bootstrap(max_age_seconds: int) -> Optional[dict]:
     """Return the cached bootstrap snapshot if present and younger than
     ``max_age_seconds``; otherwise None (signalling the caller to refresh from the API)."""
-    _ensure_schema()
-    with connection() as conn:
-        row = conn.execute(
+    await _ensure_schema()
+    async with async_connection() as conn:
+        cur = await conn.execute(
             "SELECT data, fetched_at FROM fpl_reference WHERE id = %s",
             (_BOOTSTRAP_ID,),
-        ).fetchone()
+        )
+        row = await cur.fetchone()
     if not row:
         return None
     data, fetched_at = row
@@ -61,12 +59,12 @@ def get_cached_bootstrap(max_age_seconds: int) -> Optional[dict]:
     return json.loads(data)
 
 
-def save_bootstrap(data: dict) -> None:
+async def save_bootstrap(data: dict) -> None:
     """Upsert the freshly fetched bootstrap snapshot, stamping the fetch time."""
-    _ensure_schema()
+    await _ensure_schema()
     now = datetime.now(timezone.utc)
-    with connection() as conn:
-        conn.execute(
+    async with async_connection() as conn:
+        await conn.execute(
             """
             INSERT INTO fpl_reference (id, data, fetched_at)
             VALUES (%s, %s, %s)
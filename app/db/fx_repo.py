@@ -0,0 +1,75 @@
+"""Postgres store of daily ECB reference-rate snapshots.
+
+One row per ECB rate date with the full euro table as JSONB (see ``lib/fx.py``, the
+caller). Serves the current table across processes/restarts and historical
+comparisons without refetching. Best-effort by design — the database is optional;
+``lib.fx`` swallows errors and falls back to the API.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import date, datetime, timezone
+from typing import Optional
+
+from psycopg.types.json import Json
+
+from app.db.connection import async_connection
+from app.db.schema import init_db, schema_ensured
+
+logger = logging.getLogger(__name__)
+
+
+async def _ensure_schema() -> None:
+    """Migrate the schema on first use in this process; a flag check afterwards."""
+    if not schema_ensured():
+        await asyncio.to_thread(init_db)
+
+
+def _row(row) -> Optional[dict]:
+    if not row:
+        return None
+    rate_date, rates, fetched_at = row
+    return {"date": rate_date.isoformat(), "rates": rates, "fetched_at": fetched_at}
+
+
+async def latest_snapshot() -> Optional[dict]:
+    """The most recent snapshot ({"date", "rates", "fetched_at"}), or None."""
+    await _ensure_schema()
+    async with async_connection() as conn:
+        cur = await conn.execute(
+            "SELECT rate_date, rates, fetched_at FROM fx_snapshots ORDER BY rate_date DESC LIMIT 1"
+        )
+        row = await cur.fetchone()
+    return _row(row)
+
+
+async def snapshot_on_or_before(day: date) -> Optional[dict]:
+    """The latest snapshot dated `day` or earlier, or None."""
+    await _ensure_schema()
+    async with async_connection() as conn:
+        cur = await conn.execute(
+            """
+            SELECT rate_date, rates, fetched_at FROM fx_snapshots
+            WHERE rate_date <= %s ORDER BY rate_date DESC LIMIT 1
+            """,
+            (day,),
+        )
+        row = await cur.fetchone()
+    return _row(row)
+
+
+async def save_snapshot(rate_date: str, rates: dict) -> None:
+    """Upsert the table for `rate_date` (ISO date), stamping the fetch time."""
+    await _ensure_schema()
+    async with async_connection() as conn:
+        await conn.execute(
+            """
+            INSERT INTO fx_snapshots (rate_date, rates, fetched_at)
+            VALUES (%s, %s, %s)
+            ON CONFLICT (rate_date) DO UPDATE SET
+                rates = EXCLUDED.rates, fetched_at = EXCLUDED.fetched_at
+            """,
+            (date.fromisoformat(rate_date), Json(rates), datetime.now(timezone.utc)),
+        )
+    logger.info("FX snapshot of %s stored in Postgres", rate_date)
@@ -0,0 +1,39 @@
+"""Postgres-backed geocode cache.
+
+Mirrors the interface of the JSON ``GeocodeStore`` in ``lib/geocode.py`` (get / put)
+as coroutines on the async connection pool, so it is a drop-in backend selected by
+``lib.geocode`` when ``DATABASE_URL`` is set.
+One row per normalized city name, with the Nominatim candidates as JSONB.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Optional
+
+from psycopg.types.json import Json
+
+from app.db.connection import async_connection
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresGeocodeStore:
+    async def get(self, key: str) -> Optional[list[dict]]:
+        async with async_connection() as conn:
+            cur = await conn.execute(
+                "SELECT candidates FROM geocode_cache WHERE name = %s", (key,)
+            )
+            row = await cur.fetchone()
+        return row[0] if row else None
+
+    async def put(self, key: str, candidates: list[dict]) -> None:
+        async with async_connection() as conn:
+            await conn.execute(
+                """
+                INSERT INTO geocode_cache (name, candidates, updated_at)
+                VALUES (%s, %s, now())
+                ON CONFLICT (name) DO UPDATE SET
+                    candidates = EXCLUDED.candidates, updated_at = now()
+                """,
+                (key, Json(candidates)),
+            )
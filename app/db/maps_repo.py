@@ -0,0 +1,36 @@
+"""Postgres source of the maps agent's known places.
+
+Reads the single ``maps_memory`` document (row ``name = 'default'``, written by
+``python -m app.db.migrate``) for ``lib.maps_memory``, which reloads its alias index
+whenever the row's ``updated_at`` changes. Coroutines on the async pool, like the
+other repos.
+"""
+from __future__ import annotations
+
+import logging
+
+from app.db.connection import async_connection
+
+logger = logging.getLogger(__name__)
+
+_DOCUMENT = "default"
+
+
+class PostgresMapsSource:
+    check_interval = 30.0
+
+    async def version(self):
+        async with async_connection() as conn:
+            cur = await conn.execute(
+                "SELECT updated_at FROM maps_memory WHERE name = %s", (_DOCUMENT,)
+            )
+            row = await cur.fetchone()
+        return row[0] if row else None
+
+    async def load(self) -> dict:
+        async with async_connection() as conn:
+            cur = await conn.execute(
+                "SELECT data FROM maps_memory WHERE name = %s", (_DOCUMENT,)
+            )
+            row = await cur.fetchone()
+        return row[0] if row and isinstance(row[0], dict) else {}
@@ -1,8 +1,19 @@
 """Postgres-backed long-term memory store.
 
 Mirrors the interface of the JSON ``MemoryStore`` in ``lib/memory.py`` (all /
-by_category / summary / add / update / delete), so it is a drop-in backend selected
-by ``lib.memory`` when ``DATABASE_URL`` is set.
+by_category / summary / add / update / delete) as coroutines on the async connection
+pool, so it is a drop-in backend selected by ``lib.memory`` when ``DATABASE_URL`` is
+set.
+
+It also searches in the database (migration ``0004_memory_search``): ``search()``
+matches the ``search_tsv`` full-text column (GIN) with the same folded, prefix-stemmed
+terms as the local BM25 index (``lib/memory_index.py``), plus ``pg_trgm`` word
+similarity when the extension is installed. Before inserting, ``add()`` looks for an
+entry in the same category whose trigram similarity to the new text reaches
+``NEAR_DUPLICATE_SIMILARITY``. If it finds one, nothing is written: the entry comes
+back as ``{"possible_duplicate": ...}``, because a similar text may still be a
+different fact ("nie lubi kawy" vs "lubi kawę"). The memory agent then updates the
+existing entry or saves again with ``allow_similar=True``.
 """
 from __future__ import annotations
 
@@ -11,17 +22,27 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from app.db.connection import connection
+from app.db.connection import async_connection
 from lib.memory import (
     VALID_SOURCES,
     VALID_CONFIDENCE,
     SUMMARY_CAP,
     summarize,
 )
+from lib.memory_index import terms
 
 logger = logging.getLogger(__name__)
 
 _COLS = "id, text, category, source, confidence, created_at, updated_at"
+# Trigram similarity (0-1) from which an existing entry in the same category is
+# reported as a possible duplicate of a new one.
+NEAR_DUPLICATE_SIMILARITY = 0.7
+
+
+def tsquery(query: str) -> str:
+    """``to_tsquery('simple', ...)`` text OR-ing the prefix-matched terms of `query`
+    ('' when nothing is left after stopwords)."""
+    return " | ".join(f"{t}:*" for t in dict.fromkeys(terms(query)))
 
 
 def _row(r) -> dict:
@@ -39,28 +60,71 @@ def _row(r) -> dict:
 
 
 class PostgresMemoryStore:
+    def __init__(self):
+        self._trgm: Optional[bool] = None  # pg_trgm installed? (checked on first use)
+
+    async def _has_trgm(self, conn) -> bool:
+        if self._trgm is None:
+            cur = await conn.execute("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+            self._trgm = bool((await cur.fetchone())[0])
+            if not self._trgm:
+                logger.warning("pg_trgm is not installed; memory search uses full text only")
+        return self._trgm
+
     # -- reads ----------------------------------------------------------------
-    def all(self) -> list[dict]:
-        with connection() as conn:
-            rows = conn.execute(
+    async def all(self) -> list[dict]:
+        async with async_connection() as conn:
+            cur = await conn.execute(
                 f"SELECT {_COLS} FROM memory_entries ORDER BY created_at, id"
-            ).fetchall()
+            )
+            rows = await cur.fetchall()
         return [_row(r) for r in rows]
 
-    def by_category(self, category: str) -> list[dict]:
-        with connection() as conn:
-            rows = conn.execute(
+    async def by_category(self, category: str) -> list[dict]:
+        async with async_connection() as conn:
+            cur = await conn.execute(
                 f"SELECT {_COLS} FROM memory_entries WHERE category = %s ORDER BY created_at, id",
                 (category,),
-            ).fetchall()
+            )
+            rows = await cur.fetchall()
         return [_row(r) for r in rows]
 
-    def summary(self, cap: int = SUMMARY_CAP) -> str:
-        return summarize(self.all(), cap)
+    async def summary(self, cap: int = SUMMARY_CAP) -> str:
+        return summarize(await self.all(), cap)
+
+    async def version(self) -> tuple:
+        """Changes whenever the stored entries may have, whichever process wrote them:
+        every write bumps an ``updated_at`` or the row count."""
+        async with async_connection() as conn:
+            cur = await conn.execute("SELECT count(*), max(updated_at) FROM memory_entries")
+            return tuple(await cur.fetchone())
+
+    async def search(self, query: str, limit: int = 10, category: Optional[str] = None) -> list[dict]:
+        """Entries relevant to `query`, best first, each with its `score` (full-text
+        rank plus trigram word similarity)."""
+        params = {"tsq": tsquery(query), "text": (query or "").strip().lower(),
+                  "category": category, "limit": limit}
+        async with async_connection() as conn:
+            if await self._has_trgm(conn):
+                score = "ts_rank_cd(search_tsv, q) + word_similarity(%(text)s, lower(text))"
+                match = "(search_tsv @@ q OR %(text)s <%% lower(text))"
+            elif params["tsq"]:
+                score, match = "ts_rank_cd(search_tsv, q)", "search_tsv @@ q"
+            else:
+                return []
+            cur = await conn.execute(
+                f"SELECT {_COLS}, {score} AS score "
+                "FROM memory_entries, to_tsquery('simple', %(tsq)s) AS q "
+                f"WHERE {match} AND (%(category)s::text IS NULL OR category = %(category)s) "
+                "ORDER BY score DESC, updated_at DESC LIMIT %(limit)s",
+                params,
+            )
+            rows = await cur.fetchall()
+        return [dict(_row(r), score=round(float(r[7]), 3)) for r in rows]
 
     # -- writes ---------------------------------------------------------------
-    def add(self, text: str, category: str = "preferences",
-            source: str = "user", confidence: str = "high") -> dict:
+    async def add(self, text: str, category: str = "preferences",
+            source: str = "user", confidence: str = "high", allow_similar: bool = False) -> dict:
         text = (text or "").strip()
         if not text:
             raise ValueError("memory text cannot be empty")
@@ -68,27 +132,50 @@ class PostgresMemoryStore:
         source = source if source in VALID_SOURCES else "user"
         confidence = confidence if confidence in VALID_CONFIDENCE else "high"
         now = datetime.now()
-        with connection() as conn:
-            existing = conn.execute(
+        async with async_connection() as conn:
+            cur = await conn.execute(
                 "SELECT id FROM memory_entries WHERE lower(text) = lower(%s) AND category = %s",
                 (text, category),
-            ).fetchone()
+            )
+            existing = await cur.fetchone()
             if existing:  # exact-text dedup within category: refresh instead of duplicating
-                conn.execute(
-                    "UPDATE memory_entries SET updated_at = %s, source = %s, confidence = %s WHERE id = %s",
+                cur = await conn.execute(
+                    "UPDATE memory_entries SET updated_at = %s, source = %s, confidence = %s "
+                    f"WHERE id = %s RETURNING {_COLS}",
                     (now, source, confidence, existing[0]),
                 )
-                row = conn.execute(f"SELECT {_COLS} FROM memory_entries WHERE id = %s", (existing[0],)).fetchone()
-                return _row(row)
+                return _row(await cur.fetchone())
+            near = None if allow_similar else await self._near_duplicate(conn, text, category)
+            if near:  # maybe a paraphrase, maybe a different fact: the agent decides
+                logger.info("memory: new entry not saved, similar to %s", near["id"])
+                return {"possible_duplicate": near}
             entry_id = "mem_" + uuid.uuid4().hex[:8]
-            conn.execute(
-                f"INSERT INTO memory_entries ({_COLS}) VALUES (%s, %s, %s, %s, %s, %s, %s)",
+            cur = await conn.execute(
+                f"INSERT INTO memory_entries ({_COLS}) VALUES (%s, %s, %s, %s, %s, %s, %s) "
+                f"RETURNING {_COLS}",
                 (entry_id, text, category, source, confidence, now, now),
             )
-            row = conn.execute(f"SELECT {_COLS} FROM memory_entries WHERE id = %s", (entry_id,)).fetchone()
+            row = await cur.fetchone()
         return _row(row)
 
-    def update(self, entry_id: str, text: Optional[str] = None,
+    async def _near_duplicate(self, conn, text: str, category: str) -> Optional[dict]:
+        """The most similar entry in `category` at or above NEAR_DUPLICATE_SIMILARITY
+        (found through the trigram index), with its `similarity`, if any."""
+        if not await self._has_trgm(conn):
+            return None
+        await conn.execute(
+            "SELECT set_config('pg_trgm.similarity_threshold', %s, true)",
+            (str(NEAR_DUPLICATE_SIMILARITY),),
+        )
+        cur = await conn.execute(
+            f"SELECT {_COLS}, similarity(lower(text), lower(%s)) AS sim FROM memory_entries "
+            "WHERE category = %s AND lower(text) %% lower(%s) ORDER BY sim DESC LIMIT 1",
+            (text, category, text),
+        )
+        row = await cur.fetchone()
+        return dict(_row(row), similarity=round(float(row[7]), 3)) if row else None
+
+    async def update(self, entry_id: str, text: Optional[str] = None,
                category: Optional[str] = None, confidence: Optional[str] = None) -> Optional[dict]:
         sets, params = [], []
         if text is not None:
@@ -103,14 +190,15 @@ class PostgresMemoryStore:
         sets.append("updated_at = %s")
         params.append(datetime.now())
         params.append(entry_id)
-        with connection() as conn:
-            updated = conn.execute(
+        async with async_connection() as conn:
+            cur = await conn.execute(
                 f"UPDATE memory_entries SET {', '.join(sets)} WHERE id = %s RETURNING {_COLS}",
                 params,
-            ).fetchone()
+            )
+            updated = await cur.fetchone()
         return _row(updated) if updated else None
 
-    def delete(self, entry_id: str) -> bool:
-        with connection() as conn:
-            cur = conn.execute("DELETE FROM memory_entries WHERE id = %s", (entry_id,))
+    async def delete(self, entry_id: str) -> bool:
+        async with async_connection() as conn:
+            cur = await conn.execute("DELETE FROM memory_entries WHERE id = %s", (entry_id,))
             return cur.rowcount > 0
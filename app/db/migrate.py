@@ -19,8 +19,9 @@ from pathlib import Path
 from dotenv import load_dotenv
 from psycopg.types.json import Json
 
-from app.db.connection import connection, database_url
+from app.db.connection import close_pool, connection, database_url
 from app.db.schema import init_db
+from lib.memory import MemoryStore
 
 logger = logging.getLogger(__name__)
 
@@ -52,10 +53,12 @@ def _parse_dt(value) -> datetime:
 
 
 def migrate_memory(conn) -> int:
-    data = _load(MEMORY_JSON)
-    if not data:
+    store = MemoryStore(MEMORY_JSON)
+    if not MEMORY_JSON.exists() and not store.journal_path.exists():
+        print(f"  - {MEMORY_JSON.name}: not found, skipping")
         return 0
-    entries = data.get("entries", []) if isinstance(data, dict) else []
+    # Read through the store, so mutations still in its journal are included.
+    entries = store.all()
     n = 0
     for e in entries:
         conn.execute(
@@ -140,6 +143,7 @@ def main() -> int:
         dev = migrate_devices(conn)
         prefs = _migrate_document(conn, "device_preferences", _load(PREFERENCES_JSON))
         maps = _migrate_document(conn, "maps_memory", _load(MAPS_JSON))
+    close_pool()
 
     print("\nMigration complete (JSON files left untouched):")
     print(f"  memory_entries      : {mem} row(s)")
@@ -0,0 +1,7 @@
+-- Daily ECB reference-rate tables (per 1 EUR), one row per rate date (lib/fx.py):
+-- the current table for every process and history for rate comparisons.
+CREATE TABLE IF NOT EXISTS fx_snapshots (
+    rate_date  DATE PRIMARY KEY,
+    rates      JSONB NOT NULL,
+    fetched_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
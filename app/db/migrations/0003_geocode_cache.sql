@@ -0,0 +1,7 @@
+-- City geocodes from Nominatim, keyed by normalized city name (lib/geocode.py),
+-- so weather forecasts skip the lookup for places already seen.
+CREATE TABLE IF NOT EXISTS geocode_cache (
+    name       TEXT PRIMARY KEY,
+    candidates JSONB NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
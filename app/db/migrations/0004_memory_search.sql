@@ -0,0 +1,36 @@
+-- Search over long-term memory (app/db/memory_repo.py: PostgresMemoryStore.search and
+-- near-duplicate detection in add).
+
+-- Full text: text + category, lower-cased and with Polish diacritics folded so the
+-- app's folded, prefix-stemmed query terms ("kaw:*") match "kawę". The 'simple'
+-- config does no stemming of its own (stock Postgres ships no Polish dictionary).
+ALTER TABLE memory_entries ADD COLUMN IF NOT EXISTS search_tsv tsvector
+    GENERATED ALWAYS AS (
+        to_tsvector('simple', translate(lower(text || ' ' || category),
+                                        'ąćęłńóśźż', 'acelnoszz'))
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS memory_entries_search_tsv
+    ON memory_entries USING gin (search_tsv);
+
+-- Trigram similarity (paraphrase-tolerant search and dedup). pg_trgm ships with the
+-- standard contrib package (the postgres:16 image has it) and is a trusted extension,
+-- so the database owner can create it. Where it is not installed the migration still
+-- applies and search runs on full text alone; rerun the two statements below once
+-- the extension becomes available.
+DO $$
+BEGIN
+    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+EXCEPTION WHEN OTHERS THEN
+    RAISE NOTICE 'pg_trgm unavailable (%); memory search uses full text only', SQLERRM;
+END
+$$;
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm') THEN
+        CREATE INDEX IF NOT EXISTS memory_entries_text_trgm
+            ON memory_entries USING gin (lower(text) gin_trgm_ops);
+    END IF;
+END
+$$;
@@ -1,8 +1,9 @@
 """Postgres-backed scheduled-jobs store.
 
 Mirrors the interface of the JSON ``JobStore`` in ``lib/scheduler.py`` (all / active /
-for_conversation / due / get / add / save / update / delete), so it is a drop-in
-backend selected by ``lib.scheduler`` when ``DATABASE_URL`` is set.
+for_conversation / due / get / add / save / update / delete) as coroutines on the
+async connection pool, so it is a drop-in backend selected by ``lib.scheduler`` when
+``DATABASE_URL`` is set (the runner's per-tick ``due()`` no longer blocks the loop).
 
 Timestamp columns (run_at/next_run_at/last_run_at/created_at) are TIMESTAMPTZ; they are
 returned to callers as ISO strings so the dict shape matches the JSON store exactly.
@@ -14,7 +15,7 @@ import logging
 from datetime import datetime
 from typing import Optional
 
-from app.db.connection import connection
+from app.db.connection import async_connection
 from lib.scheduler import parse_dt
 
 logger = logging.getLogger(__name__)
@@ -69,61 +70,66 @@ def _params(job: dict) -> tuple:
 
 class PostgresJobStore:
     # -- reads ----------------------------------------------------------------
-    def all(self) -> list[dict]:
-        with connection() as conn:
-            rows = conn.execute(
+    async def all(self) -> list[dict]:
+        async with async_connection() as conn:
+            cur = await conn.execute(
                 f"SELECT {_COLS} FROM scheduled_jobs ORDER BY created_at, id"
-            ).fetchall()
+            )
+            rows = await cur.fetchall()
         return [_row(r) for r in rows]
 
-    def active(self) -> list[dict]:
-        with connection() as conn:
-            rows = conn.execute(
+    async def active(self) -> list[dict]:
+        async with async_connection() as conn:
+            cur = await conn.execute(
                 f"SELECT {_COLS} FROM scheduled_jobs WHERE status = 'active' "
                 "ORDER BY next_run_at, id"
-            ).fetchall()
+            )
+            rows = await cur.fetchall()
         return [_row(r) for r in rows]
 
-    def for_conversation(self, conversation_id: str) -> list[dict]:
-        with connection() as conn:
-            rows = conn.execute(
+    async def for_conversation(self, conversation_id: str) -> list[dict]:
+        async with async_connection() as conn:
+            cur = await conn.execute(
                 f"SELECT {_COLS} FROM scheduled_jobs "
                 "WHERE status = 'active' AND conversation_id = %s ORDER BY next_run_at, id",
                 (conversation_id,),
-            ).fetchall()
+            )
+            rows = await cur.fetchall()
         return [_row(r) for r in rows]
 
-    def due(self, now: datetime) -> list[dict]:
-        with connection() as conn:
-            rows = conn.execute(
+    async def due(self, now: datetime) -> list[dict]:
+        async with async_connection() as conn:
+            cur = await conn.execute(
                 f"SELECT {_COLS} FROM scheduled_jobs "
                 "WHERE status = 'active' AND next_run_at IS NOT NULL AND next_run_at <= %s "
                 "ORDER BY next_run_at, id",
                 (now,),
-            ).fetchall()
+            )
+            rows = await cur.fetchall()
         return [_row(r) for r in rows]
 
-    def get(self, job_id: str) -> Optional[dict]:
-        with connection() as conn:
-            row = conn.execute(
+    async def get(self, job_id: str) -> Optional[dict]:
+        async with async_connection() as conn:
+            cur = await conn.execute(
                 f"SELECT {_COLS} FROM scheduled_jobs WHERE id = %s", (job_id,)
-            ).fetchone()
+            )
+            row = await cur.fetchone()
         return _row(row) if row else None
 
     # -- writes ---------------------------------------------------------------
-    def add(self, job: dict) -> dict:
-        with connection() as conn:
-            conn.execute(
+    async def add(self, job: dict) -> dict:
+        async with async_connection() as conn:
+            await conn.execute(
                 f"INSERT INTO scheduled_jobs ({_COLS}) VALUES "
                 "(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
                 _params(job),
             )
         return job
 
-    def save(self, job: dict) -> dict:
+    async def save(self, job: dict) -> dict:
         """Upsert a whole job (used after a run advances next_run_at/status)."""
-        with connection() as conn:
-            conn.execute(
+        async with async_connection() as conn:
+            await conn.execute(
                 f"INSERT INTO scheduled_jobs ({_COLS}) VALUES "
                 "(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) "
                 "ON CONFLICT (id) DO UPDATE SET "
@@ -138,25 +144,26 @@ class PostgresJobStore:
             )
         return job
 
-    def update(self, job_id: str, **fields) -> Optional[dict]:
+    async def update(self, job_id: str, **fields) -> Optional[dict]:
         fields = {k: v for k, v in fields.items() if v is not None}
         if not fields:
-            return self.get(job_id)
+            return await self.get(job_id)
         sets, params = [], []
         for k, v in fields.items():
             col = "until_spec" if k == "until" else k
             sets.append(f"{col} = %s")
             params.append(_to_ts(v) if k in _TS_FIELDS else v)
         params.append(job_id)
-        with connection() as conn:
-            row = conn.execute(
+        async with async_connection() as conn:
+            cur = await conn.execute(
                 f"UPDATE scheduled_jobs SET {', '.join(sets)} WHERE id = %s "
                 f"RETURNING {_COLS}",
                 params,
-            ).fetchone()
+            )
+            row = await cur.fetchone()
         return _row(row) if row else None
 
-    def delete(self, job_id: str) -> bool:
-        with connection() as conn:
-            cur = conn.execute("DELETE FROM scheduled_jobs WHERE id = %s", (job_id,))
+    async def delete(self, job_id: str) -> bool:
+        async with async_connection() as conn:
+            cur = await conn.execute("DELETE FROM scheduled_jobs WHERE id = %s", (job_id,))
             return cur.rowcount > 0
@@ -1,104 +1,190 @@
-"""Database schema (DDL) and initialization.
+"""Versioned database schema.
 
-Idempotent: every statement is ``CREATE ... IF NOT EXISTS`` so ``init_db()`` is safe
-to call on every startup.
+The schema is an ordered list of SQL migration files in ``app/db/migrations/``
+(``NNNN_<name>.sql``), each applied once and recorded in the ``schema_version``
+table. Migrations run inside one transaction under a Postgres advisory lock, so two
+processes starting together do not race.
+
+``init_db()`` brings the database up to date **once per process**: a single
+``SELECT max(version) FROM schema_version`` when the database is current, DDL only
+when a migration is pending. Every repo and backend selector calls it; after the
+first call it is a flag check.
+
+CLI:
+
+    poetry run python -m app.db.schema            # status: applied / pending migrations
+    poetry run python -m app.db.schema upgrade    # apply pending migrations
+    poetry run python -m app.db.schema upgrade --target 2
 """
 from __future__ import annotations
 
+import argparse
 import logging
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import psycopg
+from dotenv import load_dotenv
 
-from app.db.connection import connection
+from app.db.connection import close_pool, connection, database_url
 
 logger = logging.getLogger(__name__)
 
-SCHEMA_STATEMENTS = [
-    # general long-term memory (the active, agent-written store)
-    """
-    CREATE TABLE IF NOT EXISTS memory_entries (
-        id          TEXT PRIMARY KEY,
-        text        TEXT NOT NULL,
-        category    TEXT NOT NULL,
-        source      TEXT NOT NULL,
-        confidence  TEXT NOT NULL,
-        created_at  TIMESTAMPTZ NOT NULL,
-        updated_at  TIMESTAMPTZ NOT NULL
-    )
-    """,
-    """
-    CREATE UNIQUE INDEX IF NOT EXISTS memory_entries_text_category
-        ON memory_entries (lower(text), category)
-    """,
-    # smart-lighting device inventory (currently read from disk; migrated for future use)
-    """
-    CREATE TABLE IF NOT EXISTS smart_devices (
-        dev_id      TEXT PRIMARY KEY,
-        custom_name TEXT,
-        room        TEXT,
-        zones       JSONB,
-        local_ip    TEXT,
-        local_key   TEXT,
-        version     TEXT,
-        params      JSONB
-    )
-    """,
-    # domain preference/memory documents kept whole as JSONB (freeform, edited rarely)
-    """
-    CREATE TABLE IF NOT EXISTS device_preferences (
-        name       TEXT PRIMARY KEY,
-        data       JSONB NOT NULL,
-        updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
-    )
-    """,
-    """
-    CREATE TABLE IF NOT EXISTS maps_memory (
-        name       TEXT PRIMARY KEY,
-        data       JSONB NOT NULL,
-        updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
-    )
-    """,
-    # Fantasy Premier League reference data (the bootstrap-static snapshot: teams,
-    # players, positions, gameweeks). Cached wholesale as JSONB with a fetch timestamp
-    # so the fpl_agent can resolve player/team ids without hitting the API every turn.
-    """
-    CREATE TABLE IF NOT EXISTS fpl_reference (
-        id         TEXT PRIMARY KEY,
-        data       JSONB NOT NULL,
-        fetched_at TIMESTAMPTZ NOT NULL DEFAULT now()
-    )
-    """,
-    # Scheduled jobs written by the scheduler_agent: a natural-language prompt for
-    # Jarvis, when to run it (one-shot run_at or a cron_expr), and where to deliver
-    # the reply (channel + target). The runner fires due jobs out of band. `until` is
-    # stored as TEXT (`until_spec`) to preserve a date-only inclusive boundary as given.
-    """
-    CREATE TABLE IF NOT EXISTS scheduled_jobs (
-        id              TEXT PRIMARY KEY,
-        prompt          TEXT NOT NULL,
-        channel         TEXT NOT NULL,
-        target          TEXT,
-        conversation_id TEXT NOT NULL,
-        kind            TEXT NOT NULL,
-        cron_expr       TEXT,
-        run_at          TIMESTAMPTZ,
-        next_run_at     TIMESTAMPTZ,
-        until_spec      TEXT,
-        max_runs        INTEGER,
-        run_count       INTEGER NOT NULL DEFAULT 0,
-        last_run_at     TIMESTAMPTZ,
-        status          TEXT NOT NULL DEFAULT 'active',
-        created_at      TIMESTAMPTZ NOT NULL DEFAULT now()
-    )
-    """,
-    """
-    CREATE INDEX IF NOT EXISTS scheduled_jobs_due
-        ON scheduled_jobs (status, next_run_at)
-    """,
-]
+MIGRATIONS_DIR = Path(__file__).parent / "migrations"
+_FILENAME = re.compile(r"^(\d{4})_([a-z0-9_]+)\.sql$")
+
+_VERSION_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version    INTEGER PRIMARY KEY,
+    name       TEXT NOT NULL,
+    applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+)
+"""
+
+_ensured = False
+_ensure_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    path: Path
+
+    def sql(self) -> str:
+        return self.path.read_text(encoding="utf-8")
+
+
+def load_migrations(directory: Path = MIGRATIONS_DIR) -> list[Migration]:
+    """The migration files of `directory`, ordered by version. Raises ValueError on a
+    misnamed file or a duplicate version."""
+    migrations = {}
+    for path in sorted(directory.glob("*.sql")):
+        match = _FILENAME.match(path.name)
+        if not match:
+            raise ValueError(f"migration file name must look like 0001_name.sql: {path.name}")
+        version = int(match.group(1))
+        if version in migrations:
+            raise ValueError(f"duplicate migration version {version}: {path.name}")
+        migrations[version] = Migration(version, match.group(2), path)
+    return [migrations[v] for v in sorted(migrations)]
+
+
+def latest_version(migrations: Optional[list[Migration]] = None) -> int:
+    migrations = load_migrations() if migrations is None else migrations
+    return migrations[-1].version if migrations else 0
+
+
+def current_version(conn) -> int:
+    """The highest applied version (0 for a database that predates versioning)."""
+    try:
+        row = conn.execute("SELECT coalesce(max(version), 0) FROM schema_version").fetchone()
+    except psycopg.errors.UndefinedTable:
+        conn.rollback()
+        return 0
+    return int(row[0])
+
+
+def applied(conn) -> list[tuple[int, str, object]]:
+    """(version, name, applied_at) of every applied migration, oldest first."""
+    try:
+        return conn.execute(
+            "SELECT version, name, applied_at FROM schema_version ORDER BY version"
+        ).fetchall()
+    except psycopg.errors.UndefinedTable:
+        conn.rollback()
+        return []
+
+
+def migrate(conn, target: Optional[int] = None,
+            migrations: Optional[list[Migration]] = None) -> list[Migration]:
+    """Apply the pending migrations up to `target` (default: all) in order, in the
+    caller's transaction. Returns the migrations applied."""
+    migrations = load_migrations() if migrations is None else migrations
+    conn.execute("SELECT pg_advisory_xact_lock(hashtext('jarvis.schema_version'))")
+    conn.execute(_VERSION_TABLE)
+    done = {row[0] for row in conn.execute("SELECT version FROM schema_version").fetchall()}
+    pending = [m for m in migrations
+               if m.version not in done and (target is None or m.version <= target)]
+    for m in pending:
+        logger.info("Applying migration %04d_%s", m.version, m.name)
+        conn.execute(m.sql())
+        conn.execute(
+            "INSERT INTO schema_version (version, name) VALUES (%s, %s)", (m.version, m.name)
+        )
+    return pending
 
 
 def init_db() -> None:
-    """Create all tables/indexes if they do not exist."""
+    """Bring the schema up to date, once per process (see the module docstring)."""
+    global _ensured
+    if _ensured:
+        return
+    with _ensure_lock:
+        if _ensured:
+            return
+        migrations = load_migrations()
+        with connection() as conn:
+            if current_version(conn) < latest_version(migrations):
+                applied_now = migrate(conn, migrations=migrations)
+                logger.info("Database schema migrated (%d migration(s) applied)", len(applied_now))
+        _ensured = True
+        logger.info("Database schema ensured (version %d)", latest_version(migrations))
+
+
+def schema_ensured() -> bool:
+    """Whether ``init_db()`` already ran in this process."""
+    return _ensured
+
+
+def _status() -> int:
+    migrations = load_migrations()
     with connection() as conn:
-        for stmt in SCHEMA_STATEMENTS:
-            conn.execute(stmt)
-    logger.info("Database schema ensured")
+        rows = applied(conn)
+    done = {version: applied_at for version, _, applied_at in rows}
+    for m in migrations:
+        state = f"applied {done[m.version]:%Y-%m-%d %H:%M}" if m.version in done else "pending"
+        print(f"  {m.version:04d}_{m.name:<30} {state}")
+    unknown = sorted(set(done) - {m.version for m in migrations})
+    for version in unknown:
+        print(f"  {version:04d} (applied, but no migration file)")
+    pending = sum(1 for m in migrations if m.version not in done)
+    print(f"\nSchema version {max(done, default=0)}; latest {latest_version(migrations)}; {pending} pending.")
+    return 0
+
+
+def _upgrade(target: Optional[int]) -> int:
+    with connection() as conn:
+        applied_now = migrate(conn, target=target)
+    for m in applied_now:
+        print(f"  applied {m.version:04d}_{m.name}")
+    print("Schema is up to date." if not applied_now else f"{len(applied_now)} migration(s) applied.")
+    return 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect or apply database schema migrations.")
+    sub = parser.add_subparsers(dest="command")
+    sub.add_parser("status", help="list applied and pending migrations (default)")
+    upgrade = sub.add_parser("upgrade", help="apply pending migrations")
+    upgrade.add_argument("--target", type=int, default=None, help="stop after this version")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    load_dotenv()
+    if not database_url():
+        print("error: DATABASE_URL is not set.")
+        return 2
+    try:
+        if args.command == "upgrade":
+            return _upgrade(args.target)
+        return _status()
+    finally:
+        close_pool()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,8 +4,8 @@ Model flow (see docs/MESSENGER.md):
 
     Meta ──POST──► /webhook ──► verify signature ──► 200 OK (<5 s)
                                      │
-                                     └─(background)─► engine.handle_message
-                                                          └─► Send API reply
+                                     └─► dispatcher (per-sender queue) ─► engine.handle_message
+                                                                              └─► Send API reply
 
 Run it with uvicorn (env is loaded here so uvicorn picks up `.env`):
 
@@ -13,28 +13,36 @@ Run it with uvicorn (env is loaded here so uvicorn picks up `.env`):
 
 The endpoint is transport-only: it hands each inbound text to the same
 `engine.handle_message` the REPL uses, keyed per Messenger sender so every
-conversation keeps its own continuity.
+conversation keeps its own continuity. Turns go through a `TurnDispatcher`, so a
+sender's quick follow-up waits for the previous turn instead of forking the
+conversation, while different senders are served in parallel.
 """
 
 import asyncio
 import logging
 import os
+import sys
 from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
 from fastapi import BackgroundTasks, FastAPI, Request, Response
 
-from lib.cache import Cache, Ctx
-from lib.engine import handle_message
-from lib.hooks import LoggingRunHooks
+from lib.agents import get_coordinator_agent
+from lib.cache import Cache
+from lib.dispatcher import TurnDispatcher
+from lib.http_client import close_shared_client
 from lib.logger import Logger
 from lib.messenger import (
     iter_message_events,
     send_message,
+    send_sender_action,
+    split_flushable,
     verify_challenge,
     verify_signature,
 )
+from lib.run_config import close_shared_provider
 from lib.scheduler_runner import run_scheduler_loop, scheduler_enabled
+from lib.tools_utils import close_gmaps_client, close_tavily_client
 from lib.tracing import setup_tracing
 
 load_dotenv()
@@ -47,14 +55,20 @@ PAGE_ACCESS_TOKEN = os.getenv("MESSENGER_PAGE_ACCESS_TOKEN", "")
 # Optional allowlist: restrict the bot to one sender (the owner's PSID). Empty =
 # accept anyone the app is allowed to talk to (dev mode already limits this).
 ALLOWED_SENDER_ID = os.getenv("MESSENGER_ALLOWED_SENDER_ID", "").strip()
+# Stream replies (flush finished paragraphs while the composer is still writing).
+# Enabled by default; set MESSENGER_STREAMING to a falsy value to send one message.
+STREAMING = (os.getenv("MESSENGER_STREAMING") or "").strip().lower() not in ("0", "false", "no", "off")
+
+_ERROR_REPLY = "Przepraszam, coś poszło nie tak po mojej stronie."
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     Logger.config_root_logger()
     setup_tracing()
-    app.state.ctx = Ctx(cache=Cache())
-    app.state.hooks = LoggingRunHooks()
+    app.state.dispatcher = TurnDispatcher(cache=Cache())
+    # Build the agent graph up front so the first message doesn't pay for it.
+    get_coordinator_agent()
     if not (VERIFY_TOKEN and APP_SECRET and PAGE_ACCESS_TOKEN):
         logger.warning(
             "Messenger env incomplete — set MESSENGER_VERIFY_TOKEN, "
@@ -65,7 +79,9 @@ async def lifespan(app: FastAPI):
     # In-process asyncio task, cancelled on shutdown; disabled via SCHEDULER_ENABLED.
     scheduler_task = None
     if scheduler_enabled():
-        scheduler_task = asyncio.create_task(run_scheduler_loop())
+        scheduler_task = asyncio.create_task(
+            run_scheduler_loop(dispatcher=app.state.dispatcher)
+        )
         logger.info("Scheduler loop task started")
     else:
         logger.info("Scheduler disabled via SCHEDULER_ENABLED")
@@ -79,6 +95,15 @@ async def lifespan(app: FastAPI):
             await scheduler_task
         except asyncio.CancelledError:
             pass
+    await app.state.dispatcher.cache.close()
+    await close_shared_client()
+    await close_tavily_client()
+    close_gmaps_client()
+    await close_shared_provider()
+    # The DB layer is imported on first use only (no psycopg on the start-up path).
+    dbconn = sys.modules.get("app.db.connection")
+    if dbconn is not None:
+        await dbconn.close_pools()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -105,16 +130,51 @@ async def verify(request: Request) -> Response:
     return Response(content=challenge, media_type="text/plain")
 
 
-async def _process(ctx: Ctx, hooks: LoggingRunHooks, sender_id: str, text: str) -> None:
-    """Run the coordinator for one inbound message and send the reply back."""
-    logger.conversation(f"[MESSENGER {sender_id}] {text}")
+class _StreamedReply:
+    """Delivers a streamed reply to one sender: completed paragraphs (or sentences of a
+    long paragraph) are sent as soon as they are written, with the typing indicator
+    re-shown between them while generation continues. Nothing is sent before the
+    turn's initial `typing` indicator has gone out."""
+
+    def __init__(self, sender_id: str, typing: asyncio.Task):
+        self.sender_id = sender_id
+        self.typing = typing
+        self.buffer = ""
+
+    async def on_text(self, fragment: str) -> None:
+        self.buffer += fragment
+        ready, self.buffer = split_flushable(self.buffer)
+        if ready.strip():
+            await self.typing
+            await send_message(PAGE_ACCESS_TOKEN, self.sender_id, ready.strip())
+            await send_sender_action(PAGE_ACCESS_TOKEN, self.sender_id, "typing_on")
+
+    async def flush(self) -> None:
+        rest, self.buffer = self.buffer.strip(), ""
+        if rest:
+            await self.typing
+            await send_message(PAGE_ACCESS_TOKEN, self.sender_id, rest)
+
+
+async def _process(reply_future: asyncio.Future, sender_id: str, typing: asyncio.Task,
+                   streamed: _StreamedReply | None = None) -> None:
+    """Wait for the dispatched turn of one inbound message and send the reply back
+    (or, in streaming mode, whatever part of it has not been sent yet), after the
+    `typing` indicator."""
     try:
-        reply = await handle_message(f"messenger:{sender_id}", text, ctx, hooks)
+        reply = await reply_future
     except Exception:
+        await typing
         logger.exception("handle_message failed for %s", sender_id)
-        reply = "Przepraszam, coś poszło nie tak po mojej stronie."
+        logger.conversation(f"[ASSISTANT -> {sender_id}] {_ERROR_REPLY}")
+        await send_message(PAGE_ACCESS_TOKEN, sender_id, _ERROR_REPLY)
+        return
     logger.conversation(f"[ASSISTANT -> {sender_id}] {reply}")
-    await send_message(PAGE_ACCESS_TOKEN, sender_id, reply)
+    await typing
+    if streamed is not None:
+        await streamed.flush()
+    else:
+        await send_message(PAGE_ACCESS_TOKEN, sender_id, reply)
 
 
 @app.post("/webhook")
@@ -126,14 +186,23 @@ async def receive(request: Request, background: BackgroundTasks) -> Response:
         return Response(status_code=403)
 
     body = await request.json()
-    ctx: Ctx = request.app.state.ctx
-    hooks: LoggingRunHooks = request.app.state.hooks
+    dispatcher: TurnDispatcher = request.app.state.dispatcher
 
     for sender_id, text in iter_message_events(body):
         if ALLOWED_SENDER_ID and sender_id != ALLOWED_SENDER_ID:
             logger.info("Ignoring message from non-allowed sender %s", sender_id)
             continue
-        background.add_task(_process, ctx, hooks, sender_id, text)
+        logger.conversation(f"[MESSENGER {sender_id}] {text}")
+        # Show the typing indicator without holding up the ack; every send of this
+        # turn's reply awaits it first, so it never lands after the reply.
+        typing = asyncio.create_task(send_sender_action(PAGE_ACCESS_TOKEN, sender_id, "typing_on"))
+        # Enqueue now (in arrival order); only the wait + reply runs in the background.
+        streamed = _StreamedReply(sender_id, typing) if STREAMING else None
+        reply_future = dispatcher.submit(
+            f"messenger:{sender_id}", text,
+            on_text=streamed.on_text if streamed else None,
+        )
+        background.add_task(_process, reply_future, sender_id, typing, streamed)
 
-    # Always 200 within the 5 s window; work happens after the response is sent.
+    # Always 200 within the 5 s window; the turns run in their own tasks.
     return Response(status_code=200)
@@ -8,23 +8,43 @@ from lib.llm import LLM_BY_AGENT
 from lib.tools import TOOLS_BY_AGENT
 from lib.memory import memory
 from lib.context import environment_preamble
-from agents import Agent
+from lib.final_reply import stop_on_final_reply
+from agents import Agent, RunContextWrapper
+from typing import Awaitable, Callable, Optional
 import logging
 import os
 
 logger = logging.getLogger(__name__)
 AGENTS: dict = {}
 
+def dynamic_instructions(instructions: str,
+                         extra: Optional[Callable[[Optional[RunContextWrapper]], Awaitable[str]]] = None):
+    """Wrap static instructions into an SDK instructions callable that prepends the
+    environment block (and appends `await extra(run_context)`, if given) at run time.
+    Because it is evaluated per run, a long-lived agent keeps a current date/time
+    without rebuilds."""
+    async def build(run_context, agent) -> str:
+        text = environment_preamble() + instructions
+        if extra is not None:
+            text += await extra(run_context)
+        return text
+    return build
+
 def agents_decorator(name: str):
     def wrapper(func):
         def build(*args, **kwargs):
             agent = func(*args, **kwargs)
             # Context provider: prepend the shared environment block (date/time, timezone,
-            # currency, locale) to every agent's instructions at build time, so temporal
-            # and locale awareness reaches all agents — not just the one owning the
-            # date/time tool. Callables-as-instructions are left untouched.
+            # currency, locale) to every agent's instructions, so temporal and locale
+            # awareness reaches all agents — not just the one owning the date/time tool.
+            # Injected as dynamic instructions (evaluated per run), so prebuilt agents in
+            # the graph below never go stale. Callables-as-instructions are left untouched.
             if isinstance(agent.instructions, str):
-                agent.instructions = environment_preamble() + agent.instructions
+                agent.instructions = dynamic_instructions(agent.instructions)
+            # Composer-skip mode (lib/final_reply.py): a step whose tool results are all
+            # user-ready ends the agent's run with the templated reply.
+            if agent.tools and agent.tool_use_behavior == "run_llm_again":
+                agent.tool_use_behavior = stop_on_final_reply(name)
             return agent
         AGENTS[name] = build
         return build
@@ -39,6 +59,18 @@ def agent_enabled(name: str) -> bool:
         return True
     return raw.strip().lower() not in ("0", "false", "no", "off")
 
+async def _memory_profile(run_context: Optional[RunContextWrapper] = None) -> str:
+    # Only the entries relevant to this turn's message (lib/memory_index.py).
+    message = getattr(getattr(run_context, "context", None), "user_message", None) or ""
+    profile = await memory.profile(message)
+    if not profile:
+        return ""
+    return (
+        "\n\nWhat you already know about the user (the long-term memory entries most relevant "
+        "to this message — use them to personalize, and prefer them over asking the user again; "
+        "the memory_operator can look up more):\n" + profile
+    )
+
 @agents_decorator(name="coordinator")
 def create_coordinator_agent() -> Agent:
     name = "coordinator"
@@ -62,19 +94,6 @@ def create_coordinator_agent() -> Agent:
         If a tool call fails, still hand off to the composer and let it inform the user; pass along what went wrong."
     )
 
-    # Each subagent can be switched off via AGENT_<NAME>_ENABLED; a disabled agent is
-    # simply not exposed to the coordinator as a tool.
-    subagents = [
-        ("iot_operator", create_iot_agent, "Controls smart devices (lighting) in a houshold."),
-        ("weather_agent", create_weather_agent, "Checks current weather and weather forecast at a given location"),
-        ("finance_agent", create_finance_agent, "Retrieves and analyzes financial data."),
-        ("maps_agent", create_maps_agent, "Controls access to maps and navigation. Can calculate routes."),
-        ("news_agent", create_news_agent, "Summarizes current world and financial-market news."),
-        ("memory_operator", create_memory_agent, "Stores, retrieves and updates the user's long-term preferences and facts."),
-        ("fpl_agent", create_fpl_agent, "Fantasy Premier League: upcoming fixtures, PL teams, the owner's squad and mini-league standings."),
-        ("scheduler_agent", create_scheduler_agent, "Schedules Jarvis to act on its own later: one-off reminders and recurring proactive briefs, plus listing/cancelling them."),
-    ]
-
     if agent_enabled("scheduler_agent"):
         instructions += (
             "\n\nWhen the user asks to be reminded later or wants something done on a recurring "
@@ -89,25 +108,28 @@ def create_coordinator_agent() -> Agent:
             "memory_operator so future conversations stay personalized. Consult the memory_operator when "
             "you need details about the user's saved preferences."
         )
-        profile = memory.summary()
-        if profile:
-            instructions += (
-                "\n\nWhat you already know about the user (long-term memory — use it to personalize, "
-                "and prefer it over asking the user again):\n" + profile
-            )
 
     tools = []
-    for sub_name, factory, description in subagents:
+    # Each subagent can be switched off via AGENT_<NAME>_ENABLED; a disabled agent is
+    # simply not exposed to the coordinator as a tool.
+    for sub_name, factory, description in SUBAGENTS:
         if agent_enabled(sub_name):
             tools.append(factory().as_tool(tool_name=sub_name, tool_description=description))
         else:
             logger.info(f"Subagent '{sub_name}' disabled via env; not exposed to coordinator")
 
+    # The memory profile is appended per run (not baked in here), so the prebuilt
+    # coordinator picks up memory changes without being rebuilt, and it holds only the
+    # entries relevant to the turn's message.
+    profile = _memory_profile if agent_enabled("memory_operator") else None
+
     agent = Agent(
         name = name,
-        instructions = instructions,
+        instructions = dynamic_instructions(instructions, profile),
         tools = tools,
         handoffs = [create_composer_agent()],
+        # Subagents that answered with templated replies need no composer pass.
+        tool_use_behavior = stop_on_final_reply(first_step_only=True),
         model = model_settings["model_name"],
         model_settings = model_settings["settings"]
     )
@@ -267,8 +289,11 @@ def create_memory_agent():
         name=name,
         instructions = (
             "You manage the user's long-term memory: durable preferences, facts, habits, interests and routines.\
-            Use get_memory to look things up, save_memory to store a new durable preference or fact\
-            (set source='user' when the user stated it explicitly, 'inferred' when you concluded it),\
+            Use get_memory to look things up (pass a query to get only the entries relevant to it,\
+            best first, instead of the whole memory), save_memory to store a new durable preference or fact\
+            (set source='user' when the user stated it explicitly, 'inferred' when you concluded it;\
+            if it answers with a possible_duplicate, update that entry when the new text revises it,\
+            or save again with allow_similar=true when it is a different fact),\
             update_memory to correct an existing entry, and delete_memory to remove one.\
             Store concise, self-contained statements in natural language. Suggested categories:\
             preferences, facts, habits, interests, routines. Never store transient or one-off details,\
@@ -393,4 +418,88 @@ def create_scheduler_agent():
     )
 
     logger.info("Scheduler agent created")
-    return agent
\ No newline at end of file
+    return agent
+
+# The coordinator's subagents: (tool name, factory, description). Each can be switched
+# off via AGENT_<NAME>_ENABLED.
+SUBAGENTS = [
+    ("iot_operator", create_iot_agent, "Controls smart devices (lighting) in a houshold."),
+    ("weather_agent", create_weather_agent, "Checks current weather and weather forecast at a given location"),
+    ("finance_agent", create_finance_agent, "Retrieves and analyzes financial data."),
+    ("maps_agent", create_maps_agent, "Controls access to maps and navigation. Can calculate routes."),
+    ("news_agent", create_news_agent, "Summarizes current world and financial-market news."),
+    ("memory_operator", create_memory_agent, "Stores, retrieves and updates the user's long-term preferences and facts."),
+    ("fpl_agent", create_fpl_agent, "Fantasy Premier League: upcoming fixtures, PL teams, the owner's squad and mini-league standings."),
+    ("scheduler_agent", create_scheduler_agent, "Schedules Jarvis to act on its own later: one-off reminders and recurring proactive briefs, plus listing/cancelling them."),
+]
+
+
+# ------- prebuilt agent graph -------
+#
+# Building the coordinator constructs every subagent and wraps it with `as_tool`, so
+# doing it on every turn is pure overhead before the first token. The graph is built
+# once and reused; it is rebuilt only when one of its build-time inputs changes (the
+# AGENT_<NAME>_ENABLED flags or the model env). Date/time and the memory profile are
+# dynamic instructions evaluated per run, so they never force a rebuild.
+
+_GRAPH: dict = {"key": None, "coordinator": None, "fast_path": {}}
+
+
+def _graph_key() -> tuple:
+    flags = tuple(agent_enabled(sub_name) for sub_name, _, _ in SUBAGENTS)
+    models = tuple(os.getenv(var) for var in (
+        "OPENAI_DEFAULT_MODEL", "COORDINATOR_MODEL", "COORDINATOR_REASONING_EFFORT"))
+    return flags + models
+
+
+def get_coordinator_agent() -> Agent:
+    """Return the shared coordinator, (re)building the agent graph only when its
+    inputs changed since the last build."""
+    key = _graph_key()
+    if _GRAPH["coordinator"] is None or _GRAPH["key"] != key:
+        _GRAPH["coordinator"] = create_coordinator_agent()
+        _GRAPH["fast_path"] = {}
+        _GRAPH["key"] = key
+        logger.info("Agent graph (re)built")
+    return _GRAPH["coordinator"]
+
+
+def enabled_subagents() -> set[str]:
+    """Names of the subagents currently exposed to the coordinator."""
+    return {sub_name for sub_name, _, _ in SUBAGENTS if agent_enabled(sub_name)}
+
+
+# ------- fast-path agents -------
+#
+# For single-domain turns picked by the pre-router (lib/router.py) the engine skips
+# the coordinator and starts on the owning subagent. Such a subagent runs as the
+# top-level agent instead of as a coordinator tool, so it gets the composer as its
+# handoff target and is told to hand off once it has the data.
+
+_FAST_PATH_NOTE = (
+    "\n\nYou are handling the user's message directly, without the coordinator. Once you have "
+    "gathered what is needed (including any error messages from failed tool calls), you MUST "
+    "hand off to the 'composer' agent, which writes the final user-facing reply. Do not write "
+    "the reply yourself."
+)
+
+
+def create_fast_path_agent(name: str) -> Agent:
+    factory = {sub_name: f for sub_name, f, _ in SUBAGENTS}[name]
+    agent = factory()
+    base = agent.instructions
+
+    async def instructions(run_context, a) -> str:
+        return await base(run_context, a) + _FAST_PATH_NOTE
+
+    return agent.clone(instructions=instructions, handoffs=[create_composer_agent()])
+
+
+def get_fast_path_agent(name: str) -> Agent:
+    """Return the prebuilt fast-path agent for subagent `name`; built on first use and
+    dropped together with the rest of the graph when it is rebuilt."""
+    get_coordinator_agent()
+    if name not in _GRAPH["fast_path"]:
+        _GRAPH["fast_path"][name] = create_fast_path_agent(name)
+        logger.info(f"Fast-path agent for '{name}' built")
+    return _GRAPH["fast_path"][name]
@@ -1,12 +1,100 @@
 # import aioredis
+import asyncio
+import logging
 import os
-from typing import Any
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional
 import redis.asyncio as redis
 from lib.smart_device import SmartDevice
 
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 3600 * 24 * 5
+
+
+@dataclass(frozen=True)
+class Namespace:
+    """TTL policy for keys named "<namespace>:<id>". `sliding` refreshes the expiry on
+    every read, so an entry lives for `ttl` seconds after its last use."""
+    ttl: int
+    sliding: bool = False
+
+
+# Known key namespaces. Conversation state expires once a conversation has been idle
+# for the TTL (sliding), so keys for one-off Messenger senders do not pile up forever.
+# Per-namespace override: CACHE_TTL_<NAMESPACE> seconds (e.g. CACHE_TTL_PREVIOUS_RESPONSE_ID);
+# 0 disables expiry. Keys outside these namespaces get the Cache's default `ttl`.
+NAMESPACES: dict[str, Namespace] = {
+    "previous_response_id": Namespace(ttl=DEFAULT_TTL, sliding=True),
+    "pending_input": Namespace(ttl=DEFAULT_TTL, sliding=True),
+}
+
+
+def _env_flag(name: str) -> bool:
+    raw = os.getenv(name)
+    if raw is None or raw.strip() == "":
+        return True
+    return raw.strip().lower() not in ("0", "false", "no", "off")
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    return int(raw) if raw and raw.strip().isdigit() else default
+
+
+class LocalCache():
+    """Bounded in-process LRU with per-entry expiry — the L1 in front of Redis."""
+
+    def __init__(self, max_entries: int = 1024, ttl: int = 300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: str, val: Any, ttl: Optional[int] = None) -> None:
+        lifetime = min(ttl, self.ttl) if ttl else self.ttl
+        self._entries[key] = (time.monotonic() + lifetime, val)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _stored(val: Any) -> Any:
+    # What a decode_responses client reads back for `val`, so L1 and Redis agree.
+    if isinstance(val, bytes):
+        return val.decode()
+    return val if isinstance(val, str) else str(val)
+
 
 class Cache():
-    def __init__(self, ttl:int = 3600 * 24 * 5):
+    def __init__(self, ttl:int = DEFAULT_TTL,
+                 namespaces: Optional[dict[str, Namespace]] = None,
+                 prefix: Optional[str] = None,
+                 local: Optional[LocalCache] = None):
         # Host runs default to localhost; inside docker-compose the app sets
         # REDIS_URL=redis://redis:6379 (service name). See docker-compose.yml.
         self.redis_cache = redis.from_url(
@@ -14,16 +102,193 @@ class Cache():
             decode_responses = True
         )
         self.ttl = ttl
+        self.namespaces = dict(NAMESPACES if namespaces is None else namespaces)
+        # Optional prefix for every key (env REDIS_KEY_PREFIX), for sharing one Redis
+        # between deployments. Callers always pass the unprefixed "<namespace>:<id>" key.
+        self.prefix = os.getenv("REDIS_KEY_PREFIX", "") if prefix is None else prefix
+        # Optional L1 (env CACHE_L1_ENABLED, on by default): hot keys such as the
+        # conversation's response id are served from process memory. Writes go
+        # through to Redis and are announced on a pub/sub channel, so the other
+        # workers drop their now-stale L1 copy. L1 entries live at most CACHE_L1_TTL
+        # seconds (default 300); CACHE_L1_MAX_ENTRIES bounds the size (default 1024).
+        # Sliding namespaces are refreshed in Redis by their writes, not by L1 hits.
+        if local is None and _env_flag("CACHE_L1_ENABLED"):
+            local = LocalCache(_env_int("CACHE_L1_MAX_ENTRIES", 1024), _env_int("CACHE_L1_TTL", 300))
+        self.local = local
+        self.redis_hits = 0
+        self.redis_misses = 0
+        self._origin = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+
+    @property
+    def invalidation_channel(self) -> str:
+        return f"{self.prefix}cache:invalidate"
+
+    @staticmethod
+    def namespace_of(key: str) -> str:
+        return key.split(":", 1)[0] if ":" in key else ""
 
-    async def save_to_cache(self, key: str, val: Any):
-        """Save to redis with a given key"""
-        await self.redis_cache.set(key, val)
+    def ttl_for(self, key: str) -> Optional[int]:
+        """Expiry in seconds for `key` (None = no expiry)."""
+        name = self.namespace_of(key)
+        policy = self.namespaces.get(name)
+        ttl = policy.ttl if policy else self.ttl
+        raw = os.getenv(f"CACHE_TTL_{name.upper()}") if policy else None
+        if raw and raw.strip().isdigit():
+            ttl = int(raw)
+        return ttl if ttl and ttl > 0 else None
+
+    async def save_to_cache(self, key: str, val: Any, ttl: Optional[int] = None):
+        """Save to redis with a given key; expires after `ttl` seconds (default: the
+        key's namespace TTL)."""
+        ttl = ttl or self.ttl_for(key)
+        if self.local is None:
+            await self.redis_cache.set(self.prefix + key, val, ex=ttl)
+            return
+        # Write-through; the invalidation rides in the same round trip.
+        self._ensure_listener()
+        pipe = self.redis_cache.pipeline(transaction=False)
+        pipe.set(self.prefix + key, val, ex=ttl)
+        pipe.publish(self.invalidation_channel, self._invalidation(key))
+        await pipe.execute()
+        self.local.set(key, _stored(val), ttl)
 
     async def get_from_cache(self, key: str) -> Any:
-        """Retrieves information from cache"""
-        data = await self.redis_cache.get(key)
+        """Retrieves information from cache (L1 first; refreshing the expiry of sliding
+        namespaces on Redis reads)"""
+        if self.local is not None:
+            self._ensure_listener()
+            data = self.local.get(key)
+            if data is not None:
+                return data
+        policy = self.namespaces.get(self.namespace_of(key))
+        ttl = self.ttl_for(key)
+        if policy and policy.sliding and ttl:
+            data = await self.redis_cache.getex(self.prefix + key, ex=ttl)
+        else:
+            data = await self.redis_cache.get(self.prefix + key)
+        if data is None:
+            self.redis_misses += 1
+        else:
+            self.redis_hits += 1
+            if self.local is not None:
+                self.local.set(key, data, ttl)
         return data
 
+    async def delete_from_cache(self, key: str) -> None:
+        if self.local is None:
+            await self.redis_cache.delete(self.prefix + key)
+            return
+        self.local.invalidate(key)
+        pipe = self.redis_cache.pipeline(transaction=False)
+        pipe.delete(self.prefix + key)
+        pipe.publish(self.invalidation_channel, self._invalidation(key))
+        await pipe.execute()
+
+    def stats(self) -> dict:
+        """Hit/miss counters of both tiers since this Cache was created."""
+        local = self.local
+        return {
+            "l1_enabled": local is not None,
+            "l1_hits": local.hits if local else 0,
+            "l1_misses": local.misses if local else 0,
+            "l1_entries": len(local) if local else 0,
+            "redis_hits": self.redis_hits,
+            "redis_misses": self.redis_misses,
+        }
+
+    # ---- cross-process L1 invalidation (Redis pub/sub) ----
+
+    def _invalidation(self, key: str) -> str:
+        return f"{self._origin}|{key}"
+
+    def _ensure_listener(self) -> None:
+        if self._listener is None or self._listener.done():
+            try:
+                self._listener = asyncio.get_running_loop().create_task(self._listen())
+            except RuntimeError:
+                pass  # no running loop (sync caller); started on the next async use
+
+    async def _listen(self) -> None:
+        """Drop keys other processes wrote from L1. The L1 is cleared whenever the
+        subscription (re)connects, since invalidations may have been missed."""
+        while True:
+            pubsub = self.redis_cache.pubsub()
+            try:
+                await pubsub.subscribe(self.invalidation_channel)
+                self.local.clear()
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    origin, _, key = str(message["data"]).partition("|")
+                    if origin != self._origin:
+                        self.local.invalidate(key)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener lost ({e}); retrying")
+                self.local.clear()
+                await asyncio.sleep(1)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    async def close(self) -> None:
+        """Stop the invalidation listener and close the Redis connection pool."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener = None
+        await self.redis_cache.aclose()
+
+    async def namespace_report(self, apply_ttl: bool = False, batch: int = 500) -> dict[str, dict]:
+        """Key count, memory (bytes, per MEMORY USAGE) and keys without an expiry, per
+        namespace, for everything under this cache's prefix. With `apply_ttl`, keys
+        without an expiry in a registered namespace get that namespace's TTL (cleans up
+        keys written before TTLs were enforced); other keys are only reported, since the
+        default TTL may not suit whatever wrote them."""
+        report: dict[str, dict] = {}
+        keys: list[str] = []
+
+        async def flush():
+            pipe = self.redis_cache.pipeline(transaction=False)
+            for k in keys:
+                pipe.memory_usage(k)
+                pipe.ttl(k)
+            results = await pipe.execute()
+            expire = self.redis_cache.pipeline(transaction=False)
+            expiring = 0
+            for i, k in enumerate(keys):
+                key = k[len(self.prefix):]
+                size, ttl = results[2 * i], results[2 * i + 1]
+                stats = report.setdefault(self.namespace_of(key) or "(none)",
+                                          {"keys": 0, "bytes": 0, "no_expiry": 0})
+                stats["keys"] += 1
+                stats["bytes"] += size or 0
+                if ttl == -1:
+                    stats["no_expiry"] += 1
+                    new_ttl = self.ttl_for(key)
+                    if apply_ttl and new_ttl and self.namespace_of(key) in self.namespaces:
+                        expire.expire(k, new_ttl)
+                        expiring += 1
+            if expiring:
+                await expire.execute()
+            keys.clear()
+
+        async for k in self.redis_cache.scan_iter(match=f"{self.prefix}*", count=batch):
+            keys.append(k)
+            if len(keys) >= batch:
+                await flush()
+        if keys:
+            await flush()
+        return report
+
+
 class Ctx():
     def __init__(self, cache: Cache = Cache()):
         self.cache = cache
@@ -36,4 +301,11 @@ class Ctx():
         # The id scoping the current turn's conversation (e.g. "repl" or
         # "messenger:{psid}"). Set by lib.engine.handle_message so tools — notably
         # the scheduler — know which channel/target to deliver a proactive reply to.
-        self.conversation_id: str | None = None
\ No newline at end of file
+        self.conversation_id: str | None = None
+        # The message this turn answers (the user's text, or a scheduled job's task).
+        # The coordinator ranks long-term memory against it (lib/agents._memory_profile).
+        self.user_message: str | None = None
+        # Templated replies that ended a (sub)agent run in composer-skip mode this turn
+        # (see lib/final_reply.py), so the coordinator can recognize them as final.
+        self.final_replies: set[str] = set()
+        self.tool_steps: dict[str, int] = {}
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""
+Maintenance command: Redis footprint per key namespace.
+
+Prints, for every namespace under the configured ``REDIS_KEY_PREFIX`` (e.g.
+``previous_response_id``, ``pending_input``), the key count, the memory those keys
+use and how many have no expiry. Keys written before TTLs were enforced never expire;
+``--apply-ttl`` gives those in a registered namespace their TTL (see
+``lib.cache.NAMESPACES``); keys outside the registry are only reported.
+
+    poetry run python -m lib.cache_report
+    poetry run python -m lib.cache_report --apply-ttl
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from dotenv import load_dotenv
+
+from lib.cache import Cache
+
+
+def _human(n: int) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GiB"
+
+
+async def _run(apply_ttl: bool) -> int:
+    cache = Cache()
+    try:
+        report = await cache.namespace_report(apply_ttl=apply_ttl)
+    finally:
+        await cache.close()
+
+    if not report:
+        print("No keys found.")
+        return 0
+    print(f"{'namespace':<24} {'keys':>8} {'memory':>12} {'no expiry':>10}")
+    for name, stats in sorted(report.items(), key=lambda kv: -kv[1]["bytes"]):
+        print(f"{name:<24} {stats['keys']:>8} {_human(stats['bytes']):>12} {stats['no_expiry']:>10}")
+    if apply_ttl:
+        print("\nNamespace TTLs applied to keys that had no expiry.")
+    return 0
+
+
+def main() -> int:
+    load_dotenv()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--apply-ttl", action="store_true",
+                        help="set the namespace TTL on keys that have no expiry")
+    args = parser.parse_args()
+    return asyncio.run(_run(args.apply_ttl))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,8 +2,8 @@
 
 A single source of truth for "environment" facts that every agent should be aware
 of (current date/time, timezone, base currency, locale). Injected into each agent's
-instructions at build time so temporal/locale awareness reaches all agents without an
-extra tool hop — not just the weather agent that owns get_current_date_and_time.
+instructions (as dynamic, per-run instructions) so temporal/locale awareness reaches all
+agents without an extra tool hop — not just the weather agent that owns get_current_date_and_time.
 
 No geolocation: the service has no reliable way to know the user's physical location,
 so location is intentionally omitted (see docs/POTENTIAL_AGENTS.md).
@@ -21,8 +21,9 @@ LOCALE = "pl-PL"
 def environment_preamble() -> str:
     """Build the environment-context block prepended to every agent's instructions.
 
-    The dynamic parts (date/time/weekday) are evaluated fresh on each call; agents are
-    rebuilt every turn, so the embedded timestamp stays current.
+    The dynamic parts (date/time/weekday) are evaluated fresh on each call; agents embed
+    it via dynamic instructions evaluated per run, so the timestamp stays current even
+    though the agent graph itself is long-lived (see ``lib.agents.get_coordinator_agent``).
     """
     now = datetime.now(ZoneInfo(TIMEZONE))
     return (
@@ -0,0 +1,57 @@
+"""Currency-code lookup for the finance tools.
+
+Codes are checked against a frozen ISO 4217 table (``lib/iso4217_codes.py``,
+generated from pycountry by ``scripts/gen_iso4217.py``), so pycountry and its
+database are not loaded at startup. ``currency_code`` also accepts the common Polish
+(and English) names in their usual inflected forms ("złoty", "złotych", "euro",
+"dolarów", "funt szterling"), so the model does not need a retry to fix a name.
+"""
+from __future__ import annotations
+
+import re
+from typing import Optional
+
+from lib.iso4217_codes import CURRENCY_CODES
+from lib.text_utils import fold_diacritics
+
+# Folded name -> code. Bare "dolar"/"korona"/"frank" mean the most common currency.
+_NAMES = {
+    "PLN": ("zloty", "zlotych", "zlote", "zlotego", "zlotowka", "zlotowki", "zl", "polish zloty"),
+    "EUR": ("euro", "euros"),
+    "USD": ("dolar", "dolary", "dolarow", "dolara", "dolar amerykanski", "dolary amerykanskie",
+            "dolarow amerykanskich", "dollar", "dollars", "us dollar"),
+    "GBP": ("funt", "funty", "funtow", "funta", "funt brytyjski", "funt szterling", "funty szterlingi",
+            "funtow szterlingow", "pound", "pounds", "british pound", "sterling"),
+    "CHF": ("frank", "franki", "frankow", "franka", "frank szwajcarski", "franki szwajcarskie",
+            "frankow szwajcarskich", "swiss franc"),
+    "JPY": ("jen", "jeny", "jenow", "jena", "yen"),
+    "CNY": ("juan", "juany", "juanow", "yuan", "renminbi"),
+    "CZK": ("korona", "korony", "koron", "korona czeska", "korony czeskie", "koron czeskich", "czech koruna"),
+    "SEK": ("korona szwedzka", "korony szwedzkie", "koron szwedzkich", "swedish krona"),
+    "NOK": ("korona norweska", "korony norweskie", "koron norweskich", "norwegian krone"),
+    "DKK": ("korona dunska", "korony dunskie", "koron dunskich", "danish krone"),
+    "HUF": ("forint", "forinty", "forintow", "forinta"),
+    "UAH": ("hrywna", "hrywny", "hrywien", "hryvnia"),
+    "RON": ("lej", "leje", "lejow", "leja", "lej rumunski"),
+    "TRY": ("lira", "liry", "lir", "lira turecka", "turkish lira"),
+    "CAD": ("dolar kanadyjski", "dolary kanadyjskie", "dolarow kanadyjskich", "canadian dollar"),
+    "AUD": ("dolar australijski", "dolary australijskie", "dolarow australijskich", "australian dollar"),
+    "INR": ("rupia", "rupie", "rupii", "rupia indyjska", "rupee"),
+    "ISK": ("korona islandzka", "korony islandzkie", "koron islandzkich"),
+    "BGN": ("lew", "lewy", "lewow"),
+}
+CURRENCY_NAMES: dict[str, str] = {name: code for code, names in _NAMES.items() for name in names}
+
+_SPACES = re.compile(r"\s+")
+
+
+def is_currency_code(code: str) -> bool:
+    return (code or "").strip().upper() in CURRENCY_CODES
+
+
+def currency_code(text: str) -> Optional[str]:
+    """ISO 4217 code for a code or a known currency name, or None."""
+    raw = (text or "").strip()
+    if raw.upper() in CURRENCY_CODES:
+        return raw.upper()
+    return CURRENCY_NAMES.get(_SPACES.sub(" ", fold_diacritics(raw)))
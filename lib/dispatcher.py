@@ -0,0 +1,123 @@
+"""Turn dispatcher: per-conversation ordering, cross-conversation concurrency.
+
+``lib.engine.handle_message`` reads ``previous_response_id:{conversation_id}``, runs
+the coordinator and writes the new id back. Two turns of the *same* conversation
+running at once would both read the same id and fork the conversation, so they must
+run one after another. Turns of *different* conversations share nothing and can run
+in parallel.
+
+``TurnDispatcher`` gives each conversation its own FIFO queue drained by a single
+worker task, runs different conversations concurrently up to a global limit
+(``ENGINE_MAX_CONCURRENT_TURNS``, default 8), and hands every turn a fresh ``Ctx``
+(sharing only the Redis cache) and fresh run hooks, so per-turn state such as
+``conversation_id`` or the hooks' counters never leaks between concurrent turns. Both entry paths — the Messenger webhook and the
+scheduler runner — submit through the same dispatcher.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+from agents import RunHooks
+
+from lib.cache import Cache, Ctx
+from lib.engine import handle_message, stream_message
+from lib.hooks import LoggingRunHooks
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENT_TURNS = 8
+
+Handler = Callable[..., Awaitable[str]]
+StreamHandler = Callable[..., AsyncIterator[str]]
+OnText = Callable[[str], Awaitable[None]]
+
+
+def max_concurrent_turns() -> int:
+    """Global cap on turns running at once (env ENGINE_MAX_CONCURRENT_TURNS)."""
+    try:
+        return max(1, int(os.getenv("ENGINE_MAX_CONCURRENT_TURNS") or DEFAULT_MAX_CONCURRENT_TURNS))
+    except ValueError:
+        return DEFAULT_MAX_CONCURRENT_TURNS
+
+
+class TurnDispatcher:
+    def __init__(self, cache: Optional[Cache] = None,
+                 max_concurrency: Optional[int] = None,
+                 handler: Handler = handle_message,
+                 stream_handler: StreamHandler = stream_message,
+                 hooks_factory: Callable[[], RunHooks] = LoggingRunHooks):
+        self.cache = cache or Cache()
+        self.max_concurrency = max_concurrency or max_concurrent_turns()
+        self._handler = handler
+        self._stream_handler = stream_handler
+        self._hooks_factory = hooks_factory
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._queues: dict[str, deque] = {}
+        self._workers: dict[str, asyncio.Task] = {}
+
+    def submit(self, conversation_id: str, text: str,
+               origin: str = "user",
+               on_text: Optional[OnText] = None) -> asyncio.Future:
+        """Enqueue a turn and return a future resolving to its reply.
+
+        Enqueueing is synchronous, so turns of one conversation run in the order they
+        were submitted. Must be called from within the running event loop. With
+        `on_text`, the turn runs in streaming mode (`lib.engine.stream_message`) and
+        each reply fragment is awaited through `on_text` as it is generated; the future
+        still resolves to the whole reply."""
+        future = asyncio.get_running_loop().create_future()
+        queue = self._queues.setdefault(conversation_id, deque())
+        queue.append((text, origin, on_text, future))
+        if conversation_id not in self._workers:
+            self._workers[conversation_id] = asyncio.create_task(self._drain(conversation_id))
+        elif len(queue) > 1:
+            logger.info("Turn for %s queued behind %d earlier turn(s)", conversation_id, len(queue) - 1)
+        return future
+
+    async def run(self, conversation_id: str, text: str,
+                  origin: str = "user",
+                  on_text: Optional[OnText] = None) -> str:
+        """Submit a turn and wait for its reply."""
+        return await self.submit(conversation_id, text, origin, on_text)
+
+    def pending(self) -> dict[str, int]:
+        """Queued (not yet started) turns per conversation — for diagnostics."""
+        return {cid: len(q) for cid, q in self._queues.items() if q}
+
+    async def _stream(self, conversation_id: str, text: str, ctx: Ctx,
+                      hooks: RunHooks, origin: str, on_text: OnText) -> str:
+        parts = []
+        async for fragment in self._stream_handler(conversation_id, text, ctx, hooks, origin=origin):
+            parts.append(fragment)
+            await on_text(fragment)
+        return "".join(parts)
+
+    async def _drain(self, conversation_id: str) -> None:
+        queue = self._queues[conversation_id]
+        try:
+            while queue:
+                text, origin, on_text, future = queue.popleft()
+                if future.cancelled():
+                    continue
+                async with self._slots:
+                    try:
+                        ctx, hooks = Ctx(cache=self.cache), self._hooks_factory()
+                        if on_text is None:
+                            reply = await self._handler(conversation_id, text, ctx, hooks, origin=origin)
+                        else:
+                            reply = await self._stream(conversation_id, text, ctx, hooks, origin, on_text)
+                    except Exception as e:
+                        if not future.cancelled():
+                            future.set_exception(e)
+                        continue
+                if not future.cancelled():
+                    future.set_result(reply)
+        finally:
+            # No await between the empty-queue check and here, so nothing can slip in.
+            self._workers.pop(conversation_id, None)
+            if not queue:
+                self._queues.pop(conversation_id, None)
@@ -2,31 +2,57 @@
 
 This is the seam described in CLAUDE.md — the single entry point both the REPL
 (`lib/chatbot.py`) and the Messenger webhook (`app/webhook.py`) call. Given a
-conversation id and the user's text, it builds a fresh coordinator + run config,
-runs the OpenAI Agents SDK, and persists the `previous_response_id` so the
+conversation id and the user's text, it takes the prebuilt coordinator (see
+``lib.agents.get_coordinator_agent``) and a fresh run config, runs the OpenAI Agents SDK, and persists the `previous_response_id` so the
 conversation stays continuous across turns.
 
+Before that, single-domain user messages go through the deterministic pre-router
+(``lib.router``): when it names one subagent, the turn starts directly on that
+subagent, which hands off to the composer — skipping the reasoning-model coordinator
+call. Ambiguous messages and scheduled (system) turns always use the coordinator.
+
+A turn may also end without the composer, on a templated reply (composer-skip mode,
+see ``lib.final_reply``). That run's last model response asked for tool calls whose
+outputs the model never received, so they are kept under
+`pending_input:{conversation_id}` and sent with the next turn's input, which the
+Responses API requires before it continues from that response.
+
+`stream_message` is the streaming variant of the same turn: built on
+`Runner.run_streamed`, it yields the composer's reply text as it is generated, so a
+channel can start delivering long answers before the whole chain has finished.
+
 Conversation continuity is keyed **per user**: each channel/user gets its own
 `previous_response_id` under `previous_response_id:{conversation_id}` in Redis,
 so the REPL, Messenger, and any future channel never cross-contaminate context.
 """
 
+import json
 import logging
+from typing import AsyncIterator
 
 from agents import Runner
+from openai.types.responses import ResponseTextDeltaEvent
 
-from lib.agents import create_coordinator_agent
+from lib.agents import enabled_subagents, get_coordinator_agent, get_fast_path_agent
 from lib.cache import Ctx
 from lib.hooks import LoggingRunHooks
+from lib.router import pre_route
 from lib.run_config import Config
 
 logger = logging.getLogger(__name__)
 
+# Name of the agent writing the user-facing reply (the coordinator's handoff target).
+_COMPOSER = "composer"
+
 
 def _response_id_key(conversation_id: str) -> str:
     return f"previous_response_id:{conversation_id}"
 
 
+def _pending_input_key(conversation_id: str) -> str:
+    return f"pending_input:{conversation_id}"
+
+
 # Prefix wrapping a system-originated (scheduled) turn, so the coordinator knows this
 # is an autonomous job to execute and turn into a message for the user — not a question
 # typed by the user right now. The composer still writes the final reply in Polish.
@@ -50,7 +76,10 @@ async def handle_message(
         conversation_id: stable id scoping conversation continuity (e.g. "repl"
             for the terminal, or "messenger:{psid}" for a Messenger sender).
         text: the user's message, or — when `origin="system"` — the scheduled task.
-        ctx: shared run context (carries the Redis cache and per-run state).
+        ctx: this turn's run context (carries the Redis cache and per-run state).
+            Give every concurrent turn its own `Ctx` — `lib.dispatcher.TurnDispatcher`
+            does this and also serializes turns of the same conversation, which
+            continuity below relies on.
         hooks: optional run hooks; a fresh `LoggingRunHooks` is used if omitted.
         origin: "user" for a normal turn, or "system" for a scheduler-triggered
             proactive turn (the text is wrapped so the coordinator treats it as a job
@@ -60,25 +89,135 @@ async def handle_message(
         The coordinator's final natural-language reply.
     """
     hooks = hooks or LoggingRunHooks()
-    run_config = Config.create_config()
-    coordinator = create_coordinator_agent()
+    agent, run_config, turn_input, prev_id, had_pending = await _prepare_turn(
+        conversation_id, text, ctx, origin
+    )
 
-    # Let tools (e.g. the scheduler) know which channel/target this turn belongs to.
-    ctx.conversation_id = conversation_id
+    result = await Runner.run(
+        agent,
+        input=turn_input,
+        run_config=run_config,
+        previous_response_id=prev_id,
+        context=ctx,
+        hooks=hooks,
+    )
 
-    input_text = (_SYSTEM_PROMPT_MARKER + text) if origin == "system" else text
+    await _finish_turn(conversation_id, ctx, result, had_pending)
+    return result.final_output
 
-    key = _response_id_key(conversation_id)
-    prev_id = await ctx.cache.get_from_cache(key)
 
-    result = await Runner.run(
-        coordinator,
-        input=input_text,
+async def stream_message(
+    conversation_id: str,
+    text: str,
+    ctx: Ctx,
+    hooks: LoggingRunHooks | None = None,
+    origin: str = "user",
+) -> AsyncIterator[str]:
+    """Streaming variant of `handle_message`: yield the reply as it is generated.
+
+    Only the composer's text deltas are yielded — the coordinator's (or a fast-path
+    subagent's) own output and the subagents run as tools are not user-facing.
+    If the run ends without the composer having streamed anything (e.g. the
+    coordinator answered directly), the final output is yielded once at the end.
+    Continuity is persisted after the stream completes, exactly like `handle_message`.
+
+    Args:
+        Same as `handle_message`.
+
+    Yields:
+        Consecutive fragments of the final reply; joined, they form the whole reply.
+    """
+    hooks = hooks or LoggingRunHooks()
+    agent, run_config, turn_input, prev_id, had_pending = await _prepare_turn(
+        conversation_id, text, ctx, origin
+    )
+
+    result = Runner.run_streamed(
+        agent,
+        input=turn_input,
         run_config=run_config,
         previous_response_id=prev_id,
         context=ctx,
         hooks=hooks,
     )
 
-    await ctx.cache.save_to_cache(key, result.last_response_id)
-    return result.final_output
+    current_agent = agent.name
+    streamed = False
+    async for event in result.stream_events():
+        if event.type == "agent_updated_stream_event":
+            current_agent = event.new_agent.name
+        elif (
+            event.type == "raw_response_event"
+            and current_agent == _COMPOSER
+            and isinstance(event.data, ResponseTextDeltaEvent)
+            and event.data.delta
+        ):
+            streamed = True
+            yield event.data.delta
+
+    if not streamed and result.final_output:
+        yield str(result.final_output)
+
+    await _finish_turn(conversation_id, ctx, result, had_pending)
+
+
+async def _prepare_turn(conversation_id: str, text: str, ctx: Ctx, origin: str):
+    """Shared setup of a turn: starting agent, run config, input, the previous
+    response id and whether pending input was replayed. The starting agent is a
+    fast-path subagent when the pre-router picks one, otherwise the coordinator."""
+    run_config = Config.create_config()
+    agent = get_coordinator_agent()
+    if origin == "user":
+        target = pre_route(text, enabled_subagents())
+        if target:
+            agent = get_fast_path_agent(target)
+
+    # Let tools (e.g. the scheduler) know which channel/target this turn belongs to.
+    ctx.conversation_id = conversation_id
+    ctx.user_message = text
+    # Composer-skip bookkeeping is per turn; a reused Ctx (the REPL keeps one for the
+    # whole session) must not carry the previous turn's steps or templated replies.
+    ctx.final_replies = set()
+    ctx.tool_steps = {}
+
+    input_text = (_SYSTEM_PROMPT_MARKER + text) if origin == "system" else text
+
+    prev_id = await ctx.cache.get_from_cache(_response_id_key(conversation_id))
+    pending = await ctx.cache.get_from_cache(_pending_input_key(conversation_id))
+    turn_input = input_text
+    if prev_id and pending:
+        turn_input = json.loads(pending) + [{"role": "user", "content": input_text}]
+    return agent, run_config, turn_input, prev_id, bool(pending)
+
+
+def _unanswered_tool_outputs(result) -> list[dict]:
+    """Outputs of the tool calls requested by the run's last model response."""
+    if not result.raw_responses:
+        return []
+    call_ids = {
+        getattr(item, "call_id", None)
+        for item in result.raw_responses[-1].output
+        if getattr(item, "type", None) == "function_call"
+    }
+    return [
+        item.to_input_item()
+        for item in result.new_items
+        if item.type == "tool_call_output_item" and item.raw_item.get("call_id") in call_ids
+    ]
+
+
+async def _finish_turn(conversation_id: str, ctx: Ctx, result, had_pending: bool) -> None:
+    """Persist continuity: the last response id, plus — when the run ended on a
+    templated reply — the tool outputs and reply the model has not seen yet (or clear
+    the pending input this turn replayed)."""
+    pending = None
+    if result.final_output in ctx.final_replies:
+        outputs = _unanswered_tool_outputs(result)
+        if outputs:
+            reply = {"role": "assistant", "content": str(result.final_output)}
+            pending = json.dumps(outputs + [reply], ensure_ascii=False)
+    await ctx.cache.save_to_cache(_response_id_key(conversation_id), result.last_response_id)
+    if pending:
+        await ctx.cache.save_to_cache(_pending_input_key(conversation_id), pending)
+    elif had_pending:
+        await ctx.cache.delete_from_cache(_pending_input_key(conversation_id))
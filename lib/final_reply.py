@@ -0,0 +1,99 @@
+"""Composer-skip mode: user-ready tool results end the turn without the composer.
+
+Every turn normally ends with a handoff to the composer, one more model round trip,
+even when the whole answer is a one-line confirmation ("Światło wyłączone"). A tool
+can instead mark a successful result as final by attaching a ready Polish reply
+(``mark_final`` — rendered from ``TEMPLATES``). Agents built with
+``tool_use_behavior=stop_on_final_reply(name)`` then stop as soon as every tool call
+of a step came back final, and the run returns the templated reply as its output:
+
+* a subagent running as the coordinator's tool returns the reply without its own
+  follow-up model call, and the coordinator, whose tool outputs in that step were all
+  such replies, returns them without handing off to the composer;
+* a fast-path subagent (``lib/router.py``) returns the reply directly.
+
+Any failure, partial result or mixed step (e.g. lights + weather) is not final, so
+the usual flow — and the composer — takes over. Per-agent switch:
+``AGENT_<NAME>_COMPOSER_SKIP`` (enabled by default; the coordinator only honours
+replies its subagents were allowed to finalize). ``LoggingRunHooks`` counts the
+composer calls avoided.
+"""
+from __future__ import annotations
+
+import logging
+import os
+from typing import Any, Optional
+
+from agents import RunContextWrapper
+from agents.agent import ToolsToFinalOutputResult
+
+logger = logging.getLogger(__name__)
+
+FINAL_REPLY_KEY = "final_reply"
+
+TEMPLATES: dict[str, str] = {
+    "devices_on": "Gotowe, włączyłem: {devices}.",
+    "devices_off": "Gotowe, wyłączyłem: {devices}.",
+    "mode_changed": "Gotowe, {device} działa teraz w trybie {mode}.",
+    "color_changed": "Gotowe, zmieniłem kolor: {device}.",
+    "temperature_changed": "Gotowe, zmieniłem barwę światła: {device}.",
+    "memory_saved": "Gotowe, zapamiętałem to.",
+    "memory_deleted": "Gotowe, usunąłem to z pamięci.",
+}
+
+_NOT_FINAL = ToolsToFinalOutputResult(is_final_output=False, final_output=None)
+
+
+def mark_final(result: dict, template: str, **fields) -> dict:
+    """Attach the ready reply rendered from `TEMPLATES[template]` to a tool result."""
+    result[FINAL_REPLY_KEY] = TEMPLATES[template].format(**fields)
+    return result
+
+
+def composer_skip_enabled(agent_name: str) -> bool:
+    """Whether `agent_name` may end a turn with a templated reply. Controlled by the
+    env var AGENT_<NAME>_COMPOSER_SKIP — enabled by default; set to a falsy value
+    (0/false/no/off) to always go through the composer."""
+    raw = os.getenv(f"AGENT_{agent_name.upper()}_COMPOSER_SKIP")
+    if raw is None or raw.strip() == "":
+        return True
+    return raw.strip().lower() not in ("0", "false", "no", "off")
+
+
+def _final_reply_of(output: Any, ctx: Any) -> Optional[str]:
+    # A function tool's own dict, or the string a subagent-as-tool returned after it
+    # stopped on such a dict (remembered on the run context below).
+    if isinstance(output, dict):
+        reply = output.get(FINAL_REPLY_KEY)
+        return reply if isinstance(reply, str) and reply else None
+    if isinstance(output, str) and output in getattr(ctx, "final_replies", ()):
+        return output
+    return None
+
+
+def stop_on_final_reply(agent_name: Optional[str] = None, first_step_only: bool = False):
+    """Build a `tool_use_behavior` that ends the agent's run when every tool result of
+    a step carries a final reply. With `agent_name`, the agent's
+    AGENT_<NAME>_COMPOSER_SKIP switch is checked at run time. With `first_step_only`
+    (the coordinator), only a run whose first tool step is final stops early — data
+    gathered in earlier steps would otherwise never reach the user."""
+    async def behavior(context: RunContextWrapper, tool_results) -> ToolsToFinalOutputResult:
+        steps = getattr(context.context, "tool_steps", None)
+        step = 0
+        if steps is not None:
+            key = agent_name or "coordinator"
+            step = steps[key] = steps.get(key, 0) + 1
+        if first_step_only and step > 1:
+            return _NOT_FINAL
+        if agent_name and not composer_skip_enabled(agent_name):
+            return _NOT_FINAL
+        replies = [_final_reply_of(r.output, context.context) for r in tool_results]
+        if not replies or any(reply is None for reply in replies):
+            return _NOT_FINAL
+        reply = "\n".join(dict.fromkeys(replies))
+        final_replies = getattr(context.context, "final_replies", None)
+        if final_replies is not None:
+            final_replies.add(reply)
+        logger.info(f"[final-reply] {agent_name or 'coordinator'}: tool output is user-ready")
+        return ToolsToFinalOutputResult(is_final_output=True, final_output=reply)
+    return behavior
@@ -0,0 +1,235 @@
+"""Weather forecasts from Open-Meteo, and their compaction into small tables.
+
+Imports NumPy and the Open-Meteo SDK, so the weather tools load this module only when
+a forecast is first requested (see lib/tools/weather.py).
+"""
+import logging
+from typing import Literal, Union
+
+import numpy as np
+from openmeteo_sdk.WeatherApiResponse import WeatherApiResponse
+
+from lib import http_client
+
+# All geolocation candidates of one question go to Open-Meteo in a single request
+# (latitude/longitude accept comma-separated lists; the response is one flatbuffers
+# message per location, in order), sent through the shared lib.http_client pool with
+# its retries. Repeat questions are served by the weather_forecast tool cache.
+
+FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+
+FORECAST_VARIABLES = {
+    "daily": ["temperature_2m_max", "temperature_2m_min", "weather_code", "sunrise", "sunset", "uv_index_max", "rain_sum", "snowfall_sum"],
+    "hourly": ["temperature_2m", "apparent_temperature", "weather_code", "precipitation"],
+}
+
+
+# Daily variables Open-Meteo sends as int64 unix times rather than floats.
+_TIME_VARIABLES = ("sunrise", "sunset")
+
+
+def _local_iso(seconds: np.ndarray, utc_offset: int) -> list[str]:
+    local = (np.asarray(seconds, dtype=np.int64) + utc_offset).astype("datetime64[s]")
+    return np.datetime_as_string(local, unit="s").tolist()
+
+
+def forecast_timestamps(start: int, end: int, interval: int, utc_offset: int = 0) -> list[str]:
+    """ISO timestamps (local to the location, no offset suffix) of the series
+    [start, end) stepping by `interval` seconds."""
+    if interval <= 0 or end <= start:
+        return []
+    return _local_iso(np.arange(start, end, interval, dtype=np.int64), utc_offset)
+
+
+def _decode_forecasts(content: bytes) -> list[WeatherApiResponse]:
+    """Split an Open-Meteo flatbuffers body into its per-location messages."""
+    messages, pos = [], 0
+    while pos < len(content):
+        length = int.from_bytes(content[pos:pos + 4], byteorder="little")
+        messages.append(WeatherApiResponse.GetRootAs(content, pos + 4))
+        pos += length + 4
+    return messages
+
+
+def _forecast_result(response: WeatherApiResponse, forecast_type: str, variables: list[str]) -> dict:
+    data = response.Daily() if forecast_type == "daily" else response.Hourly()
+
+    result = {}
+    for i, variable in enumerate(variables):
+        if variable in _TIME_VARIABLES:
+            seconds = data.Variables(i).ValuesInt64AsNumpy()
+            result[variable] = _local_iso(seconds, response.UtcOffsetSeconds()) if hasattr(seconds, "tolist") else []
+            continue
+        value = data.Variables(i).ValuesAsNumpy()
+        if hasattr(value, "tolist"):
+            result[variable] = value.tolist()
+        else:
+            result[variable] = [value]
+
+    result["time"] = forecast_timestamps(
+        data.Time(), data.TimeEnd(), data.Interval(), response.UtcOffsetSeconds()
+    )
+    result["meta"] = {
+        "lat": response.Latitude(),
+        "long": response.Longitude(),
+        "elevation": response.Elevation(),
+        "utc_offset": response.UtcOffsetSeconds()
+    }
+    return result
+
+
+async def get_forecasts(locations: list[dict],
+                        forecast_days: Literal["1", "3", "7"],
+                        forecast_type: Literal["hourly", "daily"]
+                        ) -> list:
+    """Forecasts for every location ({"lat", "long"}) in one Open-Meteo request, in
+    the same order. On failure every entry is an empty list."""
+    if not locations:
+        return []
+    variables = FORECAST_VARIABLES[forecast_type]
+    request_params = {
+        "latitude": ",".join(str(loc["lat"]) for loc in locations),
+        "longitude": ",".join(str(loc["long"]) for loc in locations),
+        forecast_type: ",".join(variables),
+        "forecast_days": forecast_days,
+        "timezone": "auto",
+        "format": "flatbuffers",
+    }
+
+    try:
+        response = await http_client.get(FORECAST_URL, params=request_params)
+        if response.status_code != 200:
+            logging.error(f"Error while getting the forecast: {response.status_code} {response.text[:200]}")
+            return [[] for _ in locations]
+        messages = _decode_forecasts(response.content)
+        forecasts = [_forecast_result(m, forecast_type, variables) for m in messages]
+    except Exception as e:
+        logging.error(f"Error while getting the forecast: {e}")
+        return [[] for _ in locations]
+
+    if len(forecasts) != len(locations):
+        logging.error(f"Open-Meteo returned {len(forecasts)} forecasts for {len(locations)} locations")
+        return [[] for _ in locations]
+
+    logging.info("Forecasts obtained successfully")
+    return forecasts
+
+
+# Compact forecast tables. The raw series (every hour of every variable, plus an ISO
+# timestamp per hour) are what the weather agent's model would otherwise read: ~170
+# rows for a 7-day hourly forecast. `compact_forecast` aggregates them into a
+# columnar table ({"columns": [...], "rows": [[...], ...]}) sized by `detail`:
+#
+#   "brief"  - one row per day;
+#   "normal" - one row per part of day (night/morning/afternoon/evening), falling
+#              back to days when that would exceed FORECAST_ROW_BUDGET rows;
+#   "full"   - the raw series, unchanged.
+#
+# Hourly tables also list rain windows (consecutive hours with precipitation) and
+# weather-code runs (consecutive hours with the same code), both capped to the budget.
+
+FORECAST_DETAIL = ("brief", "normal", "full")
+FORECAST_ROW_BUDGET = {"brief": 8, "normal": 16}
+PARTS_OF_DAY = ("night", "morning", "afternoon", "evening")  # 00-06, 06-12, 12-18, 18-24
+RAIN_THRESHOLD_MM = 0.1
+
+
+def _round(values) -> list:
+    return np.round(np.asarray(values, dtype=float), 1).tolist()
+
+
+def _runs(mask_or_values: np.ndarray) -> list[tuple[int, int]]:
+    """[start, end) index ranges of consecutive equal values."""
+    if mask_or_values.size == 0:
+        return []
+    edges = np.flatnonzero(mask_or_values[1:] != mask_or_values[:-1]) + 1
+    starts = np.concatenate(([0], edges))
+    ends = np.concatenate((edges, [mask_or_values.size]))
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def _dominant_codes(codes: np.ndarray, starts: np.ndarray) -> list[int]:
+    """Most frequent weather code per group (ties go to the more severe, higher code)."""
+    dominant = []
+    for group in np.split(codes.astype(np.int64), starts[1:]):
+        values, counts = np.unique(group, return_counts=True)
+        dominant.append(int(values[counts == counts.max()].max()))
+    return dominant
+
+
+def _compact_hourly(forecast: dict, budget: int, per_day: bool) -> dict:
+    times = np.array(forecast["time"], dtype="datetime64[s]")
+    days = times.astype("datetime64[D]")
+    parts = ((times - days).astype("timedelta64[h]").astype(np.int64) // 6)
+    if not per_day and np.unique(days).size * len(PARTS_OF_DAY) > budget:
+        per_day = True
+
+    keys = days.astype(np.int64) * len(PARTS_OF_DAY) + (0 if per_day else parts)
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    counts = np.diff(np.concatenate((starts, [keys.size])))
+
+    temp = np.asarray(forecast["temperature_2m"], dtype=float)
+    feels = np.asarray(forecast["apparent_temperature"], dtype=float)
+    precip = np.asarray(forecast["precipitation"], dtype=float)
+    codes = np.asarray(forecast["weather_code"], dtype=float)
+
+    labels = np.datetime_as_string(days[starts], unit="D").tolist()
+    columns = ["day"] if per_day else ["day", "part"]
+    table_cols = [labels] if per_day else [labels, [PARTS_OF_DAY[p] for p in parts[starts].tolist()]]
+    columns += ["temp_min", "temp_max", "temp_mean", "feels_like_mean", "precipitation_mm", "weather_code"]
+    table_cols += [
+        _round(np.minimum.reduceat(temp, starts)),
+        _round(np.maximum.reduceat(temp, starts)),
+        _round(np.add.reduceat(temp, starts) / counts),
+        _round(np.add.reduceat(feels, starts) / counts),
+        _round(np.add.reduceat(precip, starts)),
+        _dominant_codes(codes, starts),
+    ]
+
+    hours = np.datetime_as_string(times, unit="m").tolist()
+    rainy = precip >= RAIN_THRESHOLD_MM
+    rain_windows = [
+        {"from": hours[a], "to": hours[b - 1], "mm": round(float(precip[a:b].sum()), 1)}
+        for a, b in _runs(rainy) if rainy[a]
+    ]
+    code_runs = [
+        {"from": hours[a], "to": hours[b - 1], "weather_code": int(codes[a])}
+        for a, b in _runs(codes)
+    ]
+    return {
+        "columns": columns,
+        "rows": [list(row) for row in zip(*table_cols)],
+        "rain_windows": rain_windows[:budget],
+        "weather_code_runs": code_runs[:budget],
+        "truncated": len(rain_windows) > budget or len(code_runs) > budget,
+    }
+
+
+def _compact_daily(forecast: dict, variables: list[str]) -> dict:
+    columns = ["day", *variables]
+    table_cols = [[t[:10] for t in forecast["time"]]]
+    for variable in variables:
+        values = forecast.get(variable, [])
+        if variable in _TIME_VARIABLES:
+            table_cols.append([v[11:16] for v in values])  # HH:MM
+        elif variable == "weather_code":
+            table_cols.append(np.asarray(values, dtype=float).astype(np.int64).tolist())
+        else:
+            table_cols.append(_round(values))
+    return {"columns": columns, "rows": [list(row) for row in zip(*table_cols)]}
+
+
+def compact_forecast(forecast: dict,
+                     forecast_type: Literal["hourly", "daily"],
+                     detail: Literal["brief", "normal", "full"] = "normal") -> Union[dict, list]:
+    """Aggregate a `get_forecasts` entry into a compact table (see above). Empty or
+    "full" forecasts are returned unchanged."""
+    if detail == "full" or not forecast or not forecast.get("time"):
+        return forecast
+    budget = FORECAST_ROW_BUDGET.get(detail, FORECAST_ROW_BUDGET["normal"])
+    if forecast_type == "daily":
+        table = _compact_daily(forecast, FORECAST_VARIABLES["daily"])
+    else:
+        table = _compact_hourly(forecast, budget, per_day=detail == "brief")
+    table["meta"] = forecast.get("meta", {})
+    return table
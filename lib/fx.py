@@ -0,0 +1,160 @@
+"""Exchange rates from the daily ECB reference table.
+
+The ECB publishes one table of euro reference rates per working day (around 16:00
+CET). Instead of asking Frankfurter for every currency pair, the whole table is
+fetched once (``/latest?base=EUR``, ~30 currencies) and kept until the next
+publication (or only a few minutes, while the source still serves the previous
+table); any pair is then a local cross rate through the euro:
+
+    price of 1 QUOTE in BASE = rates[BASE] / rates[QUOTE]      (rates are per 1 EUR)
+
+Snapshots are cached on two levels, like the FPL bootstrap (lib/tools_utils.py): an
+in-process memo and, when a database is configured, the ``fx_snapshots`` Postgres
+table (one row per ECB rate date, app/db/fx_repo.py), which also serves historical
+comparisons ("how did the rate change this week") without further calls. Past days
+missing from the table are fetched once (``/<date>?base=EUR``) and stored.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from datetime import date, datetime, timedelta
+from datetime import time as dtime
+from zoneinfo import ZoneInfo
+
+from lib import http_client
+
+logger = logging.getLogger(__name__)
+
+FRANKFURTER_URL = "https://api.frankfurter.dev/v1"
+ECB_TZ = ZoneInfo("Europe/Berlin")
+# ECB publishes ~16:00 CET; Frankfurter picks the table up shortly after.
+PUBLICATION_TIME = dtime(16, 15)
+# How long to keep a table older than the latest publication (Frankfurter has not
+# picked the new one up yet, or the ECB skipped a holiday) before asking again.
+LAGGING_RETRY_SECONDS = 300
+
+_LATEST: dict = {"snapshot": None, "valid_until": 0.0}
+_HISTORY: dict[date, dict] = {}  # requested day -> snapshot in force on that day
+
+
+class FxError(Exception):
+    """The reference rates could not be obtained."""
+
+
+def _now() -> datetime:
+    return datetime.now(ECB_TZ)
+
+
+def _publication_on(day: date) -> datetime:
+    return datetime.combine(day, PUBLICATION_TIME, tzinfo=ECB_TZ)
+
+
+def last_publication(now: datetime) -> datetime:
+    """The most recent weekday publication time at or before `now`."""
+    now = now.astimezone(ECB_TZ)
+    day = now.date() if now >= _publication_on(now.date()) else now.date() - timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return _publication_on(day)
+
+
+def next_publication(now: datetime) -> datetime:
+    """The first weekday publication time after `now`."""
+    now = now.astimezone(ECB_TZ)
+    day = now.date() if now < _publication_on(now.date()) else now.date() + timedelta(days=1)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return _publication_on(day)
+
+
+def cross_rate(snapshot: dict, base: str, quote: str) -> float:
+    """Price of 1 `quote` in `base` units. Raises KeyError for a currency the ECB
+    does not publish."""
+    rates = snapshot["rates"]
+    return rates[base] / rates[quote]
+
+
+def _snapshot(payload: dict) -> dict:
+    rates = {code: float(rate) for code, rate in payload["rates"].items()}
+    rates[payload.get("base", "EUR")] = 1.0
+    return {"date": payload["date"], "rates": rates}
+
+
+async def _fetch(path: str) -> dict:
+    try:
+        response = await http_client.get(f"{FRANKFURTER_URL}/{path}", params={"base": "EUR"})
+        response.raise_for_status()
+        return _snapshot(response.json())
+    except Exception as e:
+        raise FxError(f"Could not fetch ECB reference rates ({path}): {e}") from e
+
+
+async def _db_call(name: str, *args):
+    """Await an app.db.fx_repo coroutine. Best-effort: None without a database or on error."""
+    try:
+        from app.db import connection as dbconn
+        if not dbconn.is_configured():
+            return None
+        from app.db import fx_repo
+        return await getattr(fx_repo, name)(*args)
+    except Exception as e:  # pragma: no cover - defensive; DB is optional
+        logger.warning("FX snapshot DB %s failed (%s)", name, e)
+        return None
+
+
+async def latest_snapshot() -> dict:
+    """The current reference table ({"date", "rates"}), fetched at most once per
+    publication. Raises `FxError` when it is not cached and cannot be fetched."""
+    now = _now()
+    if _LATEST["snapshot"] is not None and time.time() < _LATEST["valid_until"]:
+        return _LATEST["snapshot"]
+
+    expected = last_publication(now).date().isoformat()
+    stored = await _db_call("latest_snapshot")
+    if stored is not None and stored["date"] == expected:
+        snapshot = {"date": stored["date"], "rates": stored["rates"]}
+        logger.info("FX rates of %s served from Postgres", snapshot["date"])
+    else:
+        snapshot = await _fetch("latest")
+        logger.info("FX rates of %s fetched (%d currencies)", snapshot["date"], len(snapshot["rates"]))
+        await _db_call("save_snapshot", snapshot["date"], snapshot["rates"])
+
+    _LATEST["snapshot"] = snapshot
+    if snapshot["date"] < expected:
+        logger.info("FX rates of %s predate the %s publication; retrying in %d s",
+                    snapshot["date"], expected, LAGGING_RETRY_SECONDS)
+        _LATEST["valid_until"] = time.time() + LAGGING_RETRY_SECONDS
+    else:
+        _LATEST["valid_until"] = next_publication(now).timestamp()
+    return snapshot
+
+
+def _covers(snapshot_date: date, day: date) -> bool:
+    """Whether a table dated `snapshot_date` is the one in force on `day` (the same
+    day, or only a weekend in between)."""
+    if snapshot_date > day:
+        return False
+    gap = snapshot_date + timedelta(days=1)
+    while gap <= day:
+        if gap.weekday() < 5:
+            return False
+        gap += timedelta(days=1)
+    return True
+
+
+async def snapshot_on(day: date) -> dict:
+    """The reference table in force on `day` (the last publication on or before it).
+    Raises `FxError` when it is not stored and cannot be fetched."""
+    if day in _HISTORY:
+        return _HISTORY[day]
+
+    stored = await _db_call("snapshot_on_or_before", day)
+    if stored is not None and _covers(date.fromisoformat(stored["date"]), day):
+        snapshot = {"date": stored["date"], "rates": stored["rates"]}
+    else:
+        snapshot = await _fetch(day.isoformat())
+        await _db_call("save_snapshot", snapshot["date"], snapshot["rates"])
+
+    _HISTORY[day] = snapshot
+    return snapshot
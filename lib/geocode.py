@@ -0,0 +1,201 @@
+"""City geocoding for ``weather_forecast``: gazetteer -> persistent cache -> Nominatim.
+
+Every forecast used to start with a live Nominatim lookup, although the city is
+almost always Warsaw or one of a handful of others. ``geocode(city)`` now resolves a
+normalized city name ("Kraków", " krakow ", "Cracow" are the same key) in order:
+
+1. ``GAZETTEER`` — built-in coordinates of the larger Polish cities (no I/O);
+2. the persistent geocode store — earlier Nominatim answers, kept for good (cities
+   don't move). Storage mirrors ``lib/memory.py``: an on-disk JSON file by default,
+   a Postgres backend (``app/db/geocode_repo.py``) when ``DATABASE_URL`` is set;
+3. Nominatim, through ``lib.http_client`` which paces that host to its usage policy
+   of at most 1 request per second. Non-empty answers are written to the store.
+
+So the common case makes one network round trip per forecast (Open-Meteo) instead
+of two. Candidates have the shape ``{"name", "lat", "long"}``; at most 3 are kept.
+"""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+import logging
+import re
+import threading
+from pathlib import Path
+from typing import Optional
+
+from lib import http_client
+from lib.text_utils import fold_diacritics
+
+logger = logging.getLogger(__name__)
+
+GEOCODE_PATH = Path("data/weather_data/geocode.json")
+NOMINATIM_URL = "https://nominatim.openstreetmap.org/search"
+NOMINATIM_HEADERS = {
+    "User-Agent": "Jarvis (lkc86484@laoia.com)",
+    "Accept": "application/json",
+}
+MAX_CANDIDATES = 3
+
+# (display name, lat, long, extra spellings). Keys are normalized with `normalize_city`.
+_CITIES = [
+    ("Warszawa, Polska", 52.2297, 21.0122, ("warsaw",)),
+    ("Kraków, Polska", 50.0647, 19.9450, ("cracow",)),
+    ("Łódź, Polska", 51.7592, 19.4560, ()),
+    ("Wrocław, Polska", 51.1079, 17.0385, ("breslau",)),
+    ("Poznań, Polska", 52.4064, 16.9252, ()),
+    ("Gdańsk, Polska", 54.3520, 18.6466, ("danzig",)),
+    ("Szczecin, Polska", 53.4285, 14.5528, ()),
+    ("Bydgoszcz, Polska", 53.1235, 18.0084, ()),
+    ("Lublin, Polska", 51.2465, 22.5684, ()),
+    ("Białystok, Polska", 53.1325, 23.1688, ()),
+    ("Katowice, Polska", 50.2649, 19.0238, ()),
+    ("Gdynia, Polska", 54.5189, 18.5305, ()),
+    ("Sopot, Polska", 54.4418, 18.5601, ()),
+    ("Częstochowa, Polska", 50.8118, 19.1203, ()),
+    ("Radom, Polska", 51.4027, 21.1471, ()),
+    ("Rzeszów, Polska", 50.0412, 21.9991, ()),
+    ("Toruń, Polska", 53.0138, 18.5984, ()),
+    ("Kielce, Polska", 50.8661, 20.6286, ()),
+    ("Olsztyn, Polska", 53.7784, 20.4801, ()),
+    ("Opole, Polska", 50.6751, 17.9213, ()),
+    ("Gliwice, Polska", 50.2945, 18.6714, ()),
+    ("Sosnowiec, Polska", 50.2863, 19.1041, ()),
+    ("Zielona Góra, Polska", 51.9356, 15.5062, ()),
+    ("Gorzów Wielkopolski, Polska", 52.7368, 15.2288, ()),
+    ("Zakopane, Polska", 49.2992, 19.9496, ()),
+]
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_city(city: str) -> str:
+    """Lookup key for a city name: case/diacritics folded, spacing collapsed."""
+    return _SPACES.sub(" ", fold_diacritics(city or "").strip())
+
+
+def _build_gazetteer() -> dict[str, list[dict]]:
+    gazetteer = {}
+    for display, lat, long, aliases in _CITIES:
+        candidate = [{"name": display, "lat": lat, "long": long}]
+        for name in (display.split(",")[0], *aliases):
+            gazetteer[normalize_city(name)] = candidate
+    return gazetteer
+
+
+GAZETTEER: dict[str, list[dict]] = _build_gazetteer()
+
+
+class GeocodeStore:
+    """On-disk JSON geocode cache ({normalized name: candidates}); loaded once,
+    written atomically under a lock (like the other JSON stores)."""
+
+    def __init__(self, path: Path = GEOCODE_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._data: Optional[dict] = None
+
+    def _load(self) -> dict:
+        if self._data is None:
+            data = {}
+            if self.path.exists():
+                try:
+                    with open(self.path, encoding="utf-8") as f:
+                        data = json.load(f)
+                except (json.JSONDecodeError, OSError) as e:
+                    logger.error(f"geocode: could not read {self.path}: {e}")
+            self._data = data if isinstance(data, dict) else {}
+        return self._data
+
+    def get(self, key: str) -> Optional[list[dict]]:
+        return self._load().get(key)
+
+    def put(self, key: str, candidates: list[dict]) -> None:
+        with self._lock:
+            data = self._load()
+            data[key] = candidates
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".json.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            tmp.replace(self.path)  # atomic swap
+
+
+def _select_backend():
+    """Postgres when DATABASE_URL is set (checked after .env load), else JSON file."""
+    try:
+        from app.db import connection as dbconn
+        if dbconn.is_configured():
+            from app.db.schema import init_db
+            from app.db.geocode_repo import PostgresGeocodeStore
+            init_db()
+            logger.info("Geocode store backend: Postgres")
+            return PostgresGeocodeStore()
+    except Exception as e:  # noqa: BLE001 - never let storage selection crash the app
+        logger.error(f"Postgres geocode backend unavailable ({e}); falling back to JSON file")
+    logger.info("Geocode store backend: JSON file")
+    return GeocodeStore()
+
+
+class _GeocodeStoreProxy:
+    """Async facade over the backend chosen lazily on first use (so .env is
+    respected): Postgres coroutines are awaited, JSON file I/O runs in a thread."""
+
+    def __init__(self):
+        self._impl = None
+
+    async def _call(self, method: str, *args):
+        if self._impl is None:
+            self._impl = await asyncio.to_thread(_select_backend)
+        fn = getattr(self._impl, method)
+        if inspect.iscoroutinefunction(fn):
+            return await fn(*args)
+        return await asyncio.to_thread(fn, *args)
+
+    async def get(self, key: str) -> Optional[list[dict]]:
+        return await self._call("get", key)
+
+    async def put(self, key: str, candidates: list[dict]) -> None:
+        await self._call("put", key, candidates)
+
+
+# module-wide singleton (backend chosen on first use)
+store = _GeocodeStoreProxy()
+
+
+async def _nominatim(city: str) -> list[dict]:
+    response = await http_client.get(
+        NOMINATIM_URL, headers=NOMINATIM_HEADERS, params={"q": city, "format": "json"}
+    )
+    response.raise_for_status()
+    return [
+        {"name": r["display_name"], "lat": r["lat"], "long": r["lon"]}
+        for r in response.json()[:MAX_CANDIDATES]
+    ]
+
+
+async def geocode(city: str) -> list[dict]:
+    """Candidate locations for `city` (best first, at most 3; empty if unknown).
+    Raises `httpx.HTTPError` when Nominatim has to be asked and fails."""
+    key = normalize_city(city)
+    if key in GAZETTEER:
+        return GAZETTEER[key]
+
+    try:
+        cached = await store.get(key)
+    except Exception as e:  # noqa: BLE001 - the cache is an optimization
+        logger.warning(f"geocode: store read failed for {key!r} ({e})")
+        cached = None
+    if cached:
+        logger.info(f"Geocode cache hit for {city}")
+        return cached
+
+    logging.info(f"Starting geolocation for {city}")
+    candidates = await _nominatim(city)
+    if candidates:
+        try:
+            await store.put(key, candidates)
+        except Exception as e:  # noqa: BLE001
+            logger.warning(f"geocode: store write failed for {key!r} ({e})")
+    return candidates
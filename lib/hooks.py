@@ -4,6 +4,9 @@ Logs which tools/subagents the network actually invokes during a run, plus hando
 so the conversation logs show the full tool-usage trail — not just agent construction.
 Because RunHooks are global to the whole run, this captures both the coordinator's
 subagent-as-tool calls and the function-tool calls the subagents make internally.
+
+It also counts the composer calls avoided by composer-skip mode (lib/final_reply.py):
+runs that ended on a templated reply instead of a handoff to the composer.
 """
 
 import logging
@@ -14,10 +17,21 @@ logger = logging.getLogger(__name__)
 
 _PREVIEW = 200
 
+# Process-wide total across all runs; each hooks instance also counts its own run.
+_COMPOSER_CALLS_AVOIDED = {"total": 0}
+
+
+def composer_calls_avoided() -> int:
+    """Composer calls avoided by composer-skip mode since process start."""
+    return _COMPOSER_CALLS_AVOIDED["total"]
+
 
 class LoggingRunHooks(RunHooks):
     """Emit an INFO line for every tool start/end and every handoff during a run."""
 
+    def __init__(self):
+        self.composer_calls_avoided = 0
+
     async def on_tool_start(self, context, agent, tool) -> None:
         logger.info(f"[tool-start] {agent.name} -> {getattr(tool, 'name', tool)}")
 
@@ -31,3 +45,12 @@ class LoggingRunHooks(RunHooks):
 
     async def on_handoff(self, context, from_agent, to_agent) -> None:
         logger.info(f"[handoff]    {from_agent.name} -> {to_agent.name}")
+
+    async def on_agent_end(self, context, agent, output) -> None:
+        if isinstance(output, str) and output in getattr(context.context, "final_replies", ()):
+            self.composer_calls_avoided += 1
+            _COMPOSER_CALLS_AVOIDED["total"] += 1
+            logger.info(
+                f"[composer-skip] {agent.name} returned a templated reply "
+                f"({_COMPOSER_CALLS_AVOIDED['total']} composer call(s) avoided so far)"
+            )
@@ -0,0 +1,198 @@
+"""Process-wide async HTTP client for the tools' outbound API calls.
+
+Tools used to call ``requests.get`` inside ``async def`` bodies, which blocks the event
+loop and stalls every other conversation and the scheduler for the duration of the
+request. All of them now go through the one ``httpx.AsyncClient`` here:
+
+* a keep-alive connection pool (HTTP/2 when the optional ``h2`` package is installed);
+* a per-host concurrency limit (``HTTP_MAX_PER_HOST``, default 8; individual hosts can
+  be tighter, see ``HOST_CONCURRENCY``) and, for hosts with a published rate limit, a
+  minimum interval between request starts (``HOST_MIN_INTERVAL``);
+* default timeouts (``HTTP_TIMEOUT_SECONDS``, default 15; 5 s to connect);
+* retries with exponential backoff and jitter for idempotent requests that fail with
+  a transport error, 429 or 5xx (``HTTP_RETRIES``, default 2), honouring a short
+  ``Retry-After``;
+* per-host latency metrics (``host_metrics()``).
+
+Responses are returned as-is (no ``raise_for_status``) — several APIs put useful
+error details in 4xx bodies, so callers decide.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+import os
+import random
+import time
+from collections import deque
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Hosts that must be called more gently than the default.
+HOST_CONCURRENCY: dict[str, int] = {
+    # Nominatim's usage policy: an absolute maximum of 1 request per second.
+    "nominatim.openstreetmap.org": 1,
+    # Unauthenticated Yahoo Finance endpoints throttle bursts.
+    "query1.finance.yahoo.com": 4,
+}
+
+# Minimum seconds between two request starts to a host (including retries).
+HOST_MIN_INTERVAL: dict[str, float] = {
+    "nominatim.openstreetmap.org": 1.0,
+}
+
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+_IDEMPOTENT = {"GET", "HEAD", "OPTIONS"}
+_MAX_RETRY_AFTER = 5.0
+_LATENCY_SAMPLES = 200
+
+_CLIENT: dict = {"client": None}
+_HOST_SLOTS: dict[str, asyncio.Semaphore] = {}
+_LAST_START: dict[str, float] = {}
+_METRICS: dict[str, dict] = {}
+
+
+def _env_number(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    try:
+        return float(raw) if raw and raw.strip() else default
+    except ValueError:
+        return default
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def shared_client() -> httpx.AsyncClient:
+    """The process-wide client, created on first use."""
+    if _CLIENT["client"] is None:
+        _CLIENT["client"] = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60),
+            timeout=httpx.Timeout(_env_number("HTTP_TIMEOUT_SECONDS", 15), connect=5.0),
+            http2=_http2_available(),
+            follow_redirects=True,
+        )
+        logger.info("Shared HTTP client created (http2=%s)", _http2_available())
+    return _CLIENT["client"]
+
+
+async def close_shared_client() -> None:
+    """Close the shared pool (on service shutdown). Safe to call when unused."""
+    client = _CLIENT["client"]
+    _CLIENT["client"] = None
+    if client is not None:
+        await client.aclose()
+
+
+def _host_slots(host: str) -> asyncio.Semaphore:
+    slots = _HOST_SLOTS.get(host)
+    if slots is None:
+        limit = HOST_CONCURRENCY.get(host) or int(_env_number("HTTP_MAX_PER_HOST", 8))
+        slots = _HOST_SLOTS[host] = asyncio.Semaphore(max(1, limit))
+    return slots
+
+
+async def _pace(host: str) -> None:
+    """Wait for this request's turn on a host with a minimum interval. The start time is
+    reserved before sleeping, so concurrent callers queue up `interval` apart."""
+    interval = HOST_MIN_INTERVAL.get(host)
+    if not interval:
+        return
+    now = time.monotonic()
+    start = max(now, _LAST_START.get(host, now - interval) + interval)
+    _LAST_START[host] = start
+    if start > now:
+        await asyncio.sleep(start - now)
+
+
+def _record(host: str, elapsed_ms: float, error: bool, retried: bool) -> None:
+    stats = _METRICS.setdefault(host, {
+        "requests": 0, "errors": 0, "retries": 0, "total_ms": 0.0,
+        "samples": deque(maxlen=_LATENCY_SAMPLES),
+    })
+    stats["requests"] += 1
+    stats["errors"] += int(error)
+    stats["retries"] += int(retried)
+    stats["total_ms"] += elapsed_ms
+    stats["samples"].append(elapsed_ms)
+
+
+def host_metrics() -> dict[str, dict]:
+    """Per-host request/error/retry counts and latency (mean, p50, p95 over the last
+    samples, in ms) since process start."""
+    report = {}
+    for host, stats in _METRICS.items():
+        samples = sorted(stats["samples"])
+        pick = lambda q: round(samples[min(len(samples) - 1, int(q * len(samples)))], 1) if samples else 0.0
+        report[host] = {
+            "requests": stats["requests"],
+            "errors": stats["errors"],
+            "retries": stats["retries"],
+            "mean_ms": round(stats["total_ms"] / stats["requests"], 1) if stats["requests"] else 0.0,
+            "p50_ms": pick(0.5),
+            "p95_ms": pick(0.95),
+        }
+    return report
+
+
+def _backoff(attempt: int, response: Optional[httpx.Response]) -> float:
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), _MAX_RETRY_AFTER)
+        except ValueError:
+            pass
+    return 0.2 * (2 ** attempt) + random.uniform(0, 0.1)
+
+
+async def request(method: str, url: str, *, retries: Optional[int] = None, **kwargs: Any) -> httpx.Response:
+    """Send a request through the shared client, within the host's concurrency limit,
+    retrying idempotent requests on transport errors, 429 and 5xx. Raises the last
+    `httpx.HTTPError` if every attempt failed at the transport level."""
+    method = method.upper()
+    host = urlsplit(url).hostname or ""
+    if retries is None:
+        retries = int(_env_number("HTTP_RETRIES", 2))
+    if method not in _IDEMPOTENT:
+        retries = 0
+
+    client = shared_client()
+    attempt = 0
+    while True:
+        response: Optional[httpx.Response] = None
+        error: Optional[httpx.HTTPError] = None
+        async with _host_slots(host):
+            await _pace(host)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+            except httpx.HTTPError as e:
+                error = e
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        failed = error is not None or response.status_code in _RETRY_STATUSES
+        _record(host, elapsed_ms, error=failed, retried=attempt > 0)
+
+        if not failed or attempt >= retries:
+            if error is not None:
+                logger.warning(f"[http] {method} {host} failed after {attempt + 1} attempt(s): {error}")
+                raise error
+            return response
+        delay = _backoff(attempt, response)
+        logger.info(
+            f"[http] {method} {host} "
+            f"{'error ' + type(error).__name__ if error else response.status_code}; "
+            f"retry {attempt + 1}/{retries} in {delay:.2f}s"
+        )
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+async def get(url: str, **kwargs: Any) -> httpx.Response:
+    """GET `url` through the shared client (see `request`)."""
+    return await request("GET", url, **kwargs)
@@ -1,5 +1,4 @@
 from agents import ModelSettings
-from agents.extensions.models.litellm_model import LitellmModel
 import os
 
 LLM_BY_AGENT: dict = {}
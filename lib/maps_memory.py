@@ -0,0 +1,182 @@
+"""Process-wide index of the maps agent's known places (aliases -> addresses).
+
+The maps memory document ({"known_adressess": [{"aliases": [...], "address": ...,
+"preffered_transit_points": [...]}, ...]}) used to be re-read from disk whenever the
+run context was empty — every turn — and walked alias by alias on each lookup. It is
+now loaded once per process into an ``AliasIndex`` keyed by normalized alias (case,
+spacing and Polish diacritics folded: "Uczelnia" == "uczelnia", "Siłownia" ==
+"silownia") and reloaded only when the source changes:
+
+* JSON file (default): ``data/maps_data/maps_memory.json``, reloaded on mtime change;
+* Postgres ``maps_memory`` table (when ``DATABASE_URL`` is set; populated by
+  ``python -m app.db.migrate``): reloaded when the row's ``updated_at`` changes,
+  checked at most every ``MAPS_RELOAD_CHECK_SECONDS`` (default 30).
+
+``MapsMemory.index()`` is a coroutine: the Postgres source queries the async pool,
+and the JSON source's file I/O runs in a worker thread, so a reload never blocks the
+event loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import json
+import logging
+import os
+import re
+import time
+from pathlib import Path
+from typing import Optional
+
+from lib.text_utils import fold_diacritics
+
+logger = logging.getLogger(__name__)
+
+MAPS_PARAMS_PATH = Path("data/maps_data/maps_memory.json")
+
+# Historical spellings of the entries key in the stored document, most specific first.
+_ENTRY_KEYS = ("known_adressess", "known_addresses", "known_adresses")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_alias(name: str) -> str:
+    return _SPACES.sub(" ", fold_diacritics(name or "").strip())
+
+
+def known_entries(data: dict) -> list:
+    """The list of place entries of a maps memory document, tolerating the historical
+    key spellings (or any list value as a last resort)."""
+    if not isinstance(data, dict):
+        return []
+    for key in _ENTRY_KEYS:
+        if isinstance(data.get(key), list):
+            return data[key]
+    for value in data.values():
+        if isinstance(value, list):
+            return value
+    return []
+
+
+class AliasIndex:
+    """Immutable view of one maps memory document."""
+
+    def __init__(self, data: Optional[dict] = None):
+        self.entries: list = known_entries(data or {})
+        self.aliases: list[str] = []
+        self._by_alias: dict[str, dict] = {}
+        for entry in self.entries:
+            for alias in entry.get("aliases", []):
+                self.aliases.append(alias)
+                self._by_alias.setdefault(normalize_alias(alias), entry)
+
+    def entry(self, name: str) -> Optional[dict]:
+        return self._by_alias.get(normalize_alias(name))
+
+    def resolve(self, name: str) -> tuple[str, Optional[str]]:
+        """(real_address, matched_alias) for a known alias; an unknown name passes
+        through unchanged as (name, None)."""
+        if not name:
+            return name, None
+        entry = self.entry(name)
+        if entry is None:
+            return name, None
+        return entry.get("address", name), name
+
+
+class JsonMapsSource:
+    check_interval = 0.0  # a stat() per lookup is cheap
+
+    def __init__(self, path: Path = MAPS_PARAMS_PATH):
+        self.path = Path(path)
+
+    def version(self):
+        try:
+            return self.path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def load(self) -> dict:
+        with open(self.path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+
+def _check_interval() -> float:
+    raw = os.getenv("MAPS_RELOAD_CHECK_SECONDS", "")
+    try:
+        return float(raw) if raw.strip() else 30.0
+    except ValueError:
+        return 30.0
+
+
+def _select_backend():
+    """Postgres when DATABASE_URL is set (checked after .env load), else JSON file."""
+    try:
+        from app.db import connection as dbconn
+        if dbconn.is_configured():
+            from app.db.schema import init_db
+            from app.db.maps_repo import PostgresMapsSource
+            init_db()
+            logger.info("Maps memory backend: Postgres")
+            source = PostgresMapsSource()
+            source.check_interval = _check_interval()
+            return source
+    except Exception as e:  # noqa: BLE001 - never let storage selection crash the app
+        logger.error(f"Postgres maps memory unavailable ({e}); falling back to JSON file")
+    logger.info("Maps memory backend: JSON file")
+    return JsonMapsSource()
+
+
+class MapsMemory:
+    """Holds the current ``AliasIndex`` and swaps it when the source's version changes."""
+
+    def __init__(self, source=None):
+        self._source = source
+        self._index = AliasIndex()
+        self._version = object()  # never equal to a real version: first call loads
+        self._loaded = False
+        self._checked_at = float("-inf")
+        self._refresh: Optional[asyncio.Future] = None
+
+    async def _get_source(self):
+        if self._source is None:
+            self._source = await asyncio.to_thread(_select_backend)
+        return self._source
+
+    @staticmethod
+    async def _call(fn):
+        # The Postgres source's coroutines are awaited; the JSON source runs in a thread.
+        if inspect.iscoroutinefunction(fn):
+            return await fn()
+        return await asyncio.to_thread(fn)
+
+    async def _reload(self) -> None:
+        source = await self._get_source()
+        try:
+            version = await self._call(source.version)
+            if version != self._version:
+                data = await self._call(source.load) if version is not None else {}
+                self._index, self._version = AliasIndex(data), version
+                logger.info(f"Maps memory loaded ({len(self._index.aliases)} aliases)")
+            self._loaded = True
+            self._checked_at = time.monotonic()
+        except Exception as e:  # noqa: BLE001 - keep serving the last good index
+            logger.error(f"Could not load maps memory: {e}")
+
+    async def index(self) -> AliasIndex:
+        """The current index. One check of the source runs at a time: until the first
+        load has succeeded every caller waits for it (rather than resolving against an
+        empty index); afterwards, lookups during a re-check serve the index they have."""
+        refresh = self._refresh
+        if refresh is None or refresh.done():
+            source = self._source
+            if source is not None and time.monotonic() - self._checked_at < source.check_interval:
+                return self._index
+            refresh = self._refresh = asyncio.ensure_future(self._reload())
+        elif self._loaded:
+            return self._index
+        await asyncio.shield(refresh)
+        return self._index
+
+
+# module-wide singleton (backend chosen on first use)
+maps_memory = MapsMemory()
@@ -2,19 +2,26 @@
 General long-term memory store for the ``memory_operator`` agent.
 
 Structured natural-language entries (see ``docs/MEMORY.md``) persisted as JSON at
-``data/memory_data/memory.json``. Small local file, atomic writes, guarded by a
-lock. This module owns storage/CRUD; the agent-facing tools live in ``lib/tools.py``.
+``data/memory_data/memory.json`` plus an append-only journal next to it (see
+``MemoryStore``), or in Postgres when ``DATABASE_URL`` is set. This module owns
+storage/CRUD; the agent-facing tools live in ``lib/tools/memory.py``.
 """
 from __future__ import annotations
 
+import asyncio
+import inspect
 import json
 import logging
+import os
 import threading
+import time
 import uuid
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+from lib.memory_index import MemoryIndex, select_for_prompt
+
 logger = logging.getLogger(__name__)
 
 MEMORY_PATH = Path("data/memory_data/memory.json")
@@ -22,6 +29,21 @@ SUGGESTED_CATEGORIES = ["preferences", "facts", "habits", "interests", "routines
 VALID_SOURCES = ("user", "inferred")
 VALID_CONFIDENCE = ("high", "medium", "low")
 SUMMARY_CAP = 40
+# Per-turn memory profile of the coordinator (see _MemoryProxy.profile): at most
+# this many entries, within this many prompt tokens.
+PROFILE_TOP_K = 12
+PROFILE_TOKEN_BUDGET = 400
+# JSON backend journal: lines before it is folded into the snapshot, and the longest
+# a flushed write waits for its fsync.
+JOURNAL_COMPACT_AFTER = 200
+JOURNAL_FSYNC_INTERVAL = 1.0
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.getenv(name) or default))
+    except ValueError:
+        return default
 
 
 def _now() -> str:
@@ -48,45 +70,209 @@ def summarize(entries: list[dict], cap: int = SUMMARY_CAP) -> str:
 
 
 class MemoryStore:
-    def __init__(self, path: Path = MEMORY_PATH):
+    """JSON-file backend: entries held in memory, mutations appended to a journal.
+
+    ``memory.json`` is the compacted snapshot ({"entries": [...]}, still the easy-to-
+    eyeball copy and the migration source); ``memory.journal.jsonl`` next to it gets
+    one line per mutation ({"op": "put", "entry": {...}} or {"op": "delete", "id": ...}).
+    A write is an O(1) append instead of a rewrite of the whole file: each line is
+    flushed at once, fsynced at most every ``fsync_interval`` seconds (a timer syncs
+    the tail of a burst). Once the journal holds ``compact_after`` lines it is folded
+    into a fresh snapshot and truncated. Replaying the journal is idempotent, so a
+    crash between those two steps is harmless.
+
+    Reads are served from memory; the files are re-read only when their mtime/size
+    changes behind our back (a hand edit, another process)."""
+
+    def __init__(self, path: Path = MEMORY_PATH, compact_after: int = JOURNAL_COMPACT_AFTER,
+                 fsync_interval: float = JOURNAL_FSYNC_INTERVAL):
         self.path = Path(path)
-        self._lock = threading.Lock()
+        self.journal_path = self.path.with_suffix(".journal.jsonl")
+        self.compact_after = compact_after
+        self.fsync_interval = fsync_interval
+        self._lock = threading.RLock()
+        self._entries: dict[str, dict] = {}
+        self._by_text: dict[tuple[str, str], str] = {}  # (category, folded text) -> id
+        self._journal_lines = 0
+        self._version: Optional[tuple] = None
+        self._journal = None
+        self._last_fsync = 0.0
+        self._fsync_timer: Optional[threading.Timer] = None
 
     # -- persistence ----------------------------------------------------------
-    def _load(self) -> dict:
+    @staticmethod
+    def _stat(path: Path) -> Optional[tuple]:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _disk_version(self) -> tuple:
+        return self._stat(self.path), self._stat(self.journal_path)
+
+    def _read_snapshot(self) -> list[dict]:
         if not self.path.exists():
-            return {"entries": []}
+            return []
         try:
             with open(self.path, encoding="utf-8") as f:
                 data = json.load(f)
         except (json.JSONDecodeError, OSError) as e:
             logger.error(f"memory: could not read {self.path}: {e}")
-            return {"entries": []}
+            return []
         if not isinstance(data, dict) or not isinstance(data.get("entries"), list):
             logger.error(f"memory: unexpected shape in {self.path}; ignoring")
-            return {"entries": []}
-        return data
+            return []
+        return data["entries"]
+
+    def _replay_journal(self) -> int:
+        if not self.journal_path.exists():
+            return 0
+        lines = 0
+        with open(self.journal_path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                lines += 1
+                try:
+                    record = json.loads(line)
+                    if record["op"] == "put":
+                        self._put(record["entry"])
+                    elif record["op"] == "delete":
+                        self._drop(record["id"])
+                except (json.JSONDecodeError, KeyError, TypeError) as e:
+                    # a torn last line after a crash; everything before it is intact
+                    logger.error(f"memory: skipping bad journal line in {self.journal_path}: {e}")
+        return lines
+
+    def _refresh(self) -> None:
+        """(Re)load snapshot + journal if the files changed since we last saw them."""
+        version = self._disk_version()
+        if version == self._version:
+            return
+        self._entries, self._by_text = {}, {}
+        for entry in self._read_snapshot():
+            if isinstance(entry, dict) and entry.get("id"):
+                self._put(entry)
+        self._journal_lines = self._replay_journal()
+        self._version = version
+
+    def _journal_replaced(self) -> bool:
+        """Whether the open journal handle no longer is the file at journal_path (another
+        process compacted: unlinked it, maybe started a new one). Appends to it would
+        go to an orphaned inode and be lost."""
+        try:
+            return os.stat(self.journal_path).st_ino != os.fstat(self._journal.fileno()).st_ino
+        except FileNotFoundError:
+            return True
+
+    def _append(self, record: dict) -> None:
+        if self._journal is not None and self._journal_replaced():
+            self.close()
+        if self._journal is None:
+            self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+            if self._journal.tell() and not self._ends_with_newline():
+                self._journal.write("\n")  # terminate a torn line so the next one parses
+        self._journal.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._journal.flush()
+        self._journal_lines += 1
+        if self._journal_lines >= self.compact_after:
+            self.compact()
+            return
+        now = time.monotonic()
+        if now - self._last_fsync >= self.fsync_interval:
+            self._fsync()
+        elif self._fsync_timer is None:
+            self._fsync_timer = threading.Timer(self.fsync_interval, self._fsync)
+            self._fsync_timer.daemon = True
+            self._fsync_timer.start()
+        self._version = self._disk_version()
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.journal_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _fsync(self) -> None:
+        with self._lock:
+            self._fsync_timer = None
+            if self._journal is not None and not self._journal.closed:
+                os.fsync(self._journal.fileno())
+            self._last_fsync = time.monotonic()
 
-    def _save(self, data: dict) -> None:
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        tmp = self.path.with_suffix(".json.tmp")
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        tmp.replace(self.path)  # atomic swap
+    def compact(self) -> None:
+        """Fold the journal into a fresh snapshot and truncate it."""
+        with self._lock:
+            self._refresh()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".json.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"entries": list(self._entries.values())}, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            tmp.replace(self.path)  # atomic swap
+            self.close()
+            self.journal_path.unlink(missing_ok=True)
+            self._journal_lines = 0
+            self._version = self._disk_version()
+            logger.info(f"memory: journal compacted into {self.path} ({len(self._entries)} entries)")
+
+    def close(self) -> None:
+        """Sync and close the journal (it is reopened by the next write)."""
+        with self._lock:
+            if self._fsync_timer is not None:
+                self._fsync_timer.cancel()
+                self._fsync_timer = None
+            if self._journal is not None:
+                self._journal.flush()
+                os.fsync(self._journal.fileno())
+                self._journal.close()
+                self._journal = None
+
+    # -- in-memory state ------------------------------------------------------
+    @staticmethod
+    def _text_key(category: str, text: str) -> tuple[str, str]:
+        return category, text.strip().lower()
+
+    def _put(self, entry: dict) -> None:
+        old = self._entries.get(entry["id"])
+        if old is not None:
+            self._by_text.pop(self._text_key(old.get("category", ""), old.get("text", "")), None)
+        self._entries[entry["id"]] = entry
+        self._by_text[self._text_key(entry.get("category", ""), entry.get("text", ""))] = entry["id"]
+
+    def _drop(self, entry_id: str) -> Optional[dict]:
+        old = self._entries.pop(entry_id, None)
+        if old is not None:
+            key = self._text_key(old.get("category", ""), old.get("text", ""))
+            if self._by_text.get(key) == entry_id:
+                del self._by_text[key]
+        return old
 
     # -- reads ----------------------------------------------------------------
     def all(self) -> list[dict]:
-        return self._load()["entries"]
+        with self._lock:
+            self._refresh()
+            return [dict(e) for e in self._entries.values()]
 
     def by_category(self, category: str) -> list[dict]:
-        return [e for e in self.all() if e.get("category") == category]
+        with self._lock:
+            self._refresh()
+            return [dict(e) for e in self._entries.values() if e.get("category") == category]
 
     def summary(self, cap: int = SUMMARY_CAP) -> str:
         return summarize(self.all(), cap)
 
+    def version(self) -> tuple:
+        """Changes whenever the stored entries may have (a stat of both files)."""
+        return self._disk_version()
+
     # -- writes ---------------------------------------------------------------
     def add(self, text: str, category: str = "preferences",
-            source: str = "user", confidence: str = "high") -> dict:
+            source: str = "user", confidence: str = "high", allow_similar: bool = False) -> dict:
+        # `allow_similar` mirrors the Postgres store's near-duplicate check; this
+        # store dedups exact text only, so there is nothing to override.
         text = (text or "").strip()
         if not text:
             raise ValueError("memory text cannot be empty")
@@ -95,51 +281,50 @@ class MemoryStore:
         confidence = confidence if confidence in VALID_CONFIDENCE else "high"
         now = _now()
         with self._lock:
-            data = self._load()
-            for e in data["entries"]:  # exact-text dedup within a category
-                if e.get("category") == category and e.get("text", "").strip().lower() == text.lower():
-                    e.update(updated_at=now, source=source, confidence=confidence)
-                    self._save(data)
-                    return e
-            entry = {
-                "id": "mem_" + uuid.uuid4().hex[:8],
-                "text": text,
-                "category": category,
-                "source": source,
-                "confidence": confidence,
-                "created_at": now,
-                "updated_at": now,
-            }
-            data["entries"].append(entry)
-            self._save(data)
-            return entry
+            self._refresh()
+            existing = self._by_text.get(self._text_key(category, text))
+            if existing is not None:  # exact-text dedup within a category
+                entry = {**self._entries[existing], "updated_at": now,
+                         "source": source, "confidence": confidence}
+            else:
+                entry = {
+                    "id": "mem_" + uuid.uuid4().hex[:8],
+                    "text": text,
+                    "category": category,
+                    "source": source,
+                    "confidence": confidence,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            self._put(entry)
+            self._append({"op": "put", "entry": entry})
+            return dict(entry)
 
     def update(self, entry_id: str, text: Optional[str] = None,
                category: Optional[str] = None, confidence: Optional[str] = None) -> Optional[dict]:
         with self._lock:
-            data = self._load()
-            for e in data["entries"]:
-                if e["id"] == entry_id:
-                    if text is not None:
-                        e["text"] = text.strip()
-                    if category is not None:
-                        e["category"] = category.strip()
-                    if confidence in VALID_CONFIDENCE:
-                        e["confidence"] = confidence
-                    e["updated_at"] = _now()
-                    self._save(data)
-                    return e
-        return None
+            self._refresh()
+            if entry_id not in self._entries:
+                return None
+            entry = dict(self._entries[entry_id])
+            if text is not None:
+                entry["text"] = text.strip()
+            if category is not None:
+                entry["category"] = category.strip()
+            if confidence in VALID_CONFIDENCE:
+                entry["confidence"] = confidence
+            entry["updated_at"] = _now()
+            self._put(entry)
+            self._append({"op": "put", "entry": entry})
+            return dict(entry)
 
     def delete(self, entry_id: str) -> bool:
         with self._lock:
-            data = self._load()
-            remaining = [e for e in data["entries"] if e.get("id") != entry_id]
-            if len(remaining) != len(data["entries"]):
-                data["entries"] = remaining
-                self._save(data)
-                return True
-        return False
+            self._refresh()
+            if self._drop(entry_id) is None:
+                return False
+            self._append({"op": "delete", "id": entry_id})
+            return True
 
 
 def _select_backend():
@@ -160,34 +345,107 @@ def _select_backend():
 
 
 class _MemoryProxy:
-    """Delegates to the backend chosen lazily on first use, so DATABASE_URL from
-    .env (loaded after import) is respected. Keeps the ``memory`` singleton's API."""
+    """Async facade over the backend chosen lazily on first use, so DATABASE_URL from
+    .env (loaded after import) is respected. The Postgres store's coroutines are
+    awaited; the JSON store's file I/O runs in a worker thread. Either way the event
+    loop is never blocked on storage.
+
+    ``summary()`` and the entries behind ``profile()`` are memoized. The memo is keyed
+    on this proxy's write ``revision`` plus the backend's ``version()``: the JSON
+    files' stat, or the Postgres table's row count and latest ``updated_at``. That is
+    one cheap check per turn, so a write by another process (a second worker, the
+    REPL, the scheduler) shows up on the next turn without re-reading the store."""
 
     def __init__(self):
         self._impl = None
+        self.revision = 0
+        self._summary: Optional[tuple] = None  # (state, cap, text)
+        self._index: Optional[tuple] = None  # (state, MemoryIndex)
 
-    def _store(self):
+    async def _backend(self):
         if self._impl is None:
-            self._impl = _select_backend()
+            self._impl = await asyncio.to_thread(_select_backend)
         return self._impl
 
-    def all(self) -> list[dict]:
-        return self._store().all()
-
-    def by_category(self, category: str) -> list[dict]:
-        return self._store().by_category(category)
-
-    def summary(self, cap: int = SUMMARY_CAP) -> str:
-        return self._store().summary(cap)
-
-    def add(self, *args, **kwargs) -> dict:
-        return self._store().add(*args, **kwargs)
+    async def _call(self, method: str, *args, **kwargs):
+        fn = getattr(await self._backend(), method)
+        if inspect.iscoroutinefunction(fn):
+            return await fn(*args, **kwargs)
+        return await asyncio.to_thread(fn, *args, **kwargs)
+
+    async def _state(self) -> tuple:
+        """What the memos are keyed on (see the class docstring)."""
+        revision = self.revision
+        if not hasattr(await self._backend(), "version"):
+            return revision, None
+        return revision, await self._call("version")
+
+    async def all(self) -> list[dict]:
+        return await self._call("all")
+
+    async def by_category(self, category: str) -> list[dict]:
+        return await self._call("by_category", category)
+
+    async def summary(self, cap: int = SUMMARY_CAP) -> str:
+        state = await self._state()
+        cached = self._summary
+        if cached is not None and cached[:2] == (state, cap):
+            return cached[2]
+        text = await self._call("summary", cap)
+        self._summary = (state, cap, text)
+        return text
+
+    async def _current_index(self) -> MemoryIndex:
+        state = await self._state()
+        cached = self._index
+        if cached is not None and cached[0] == state:
+            return cached[1]
+        index = MemoryIndex(await self.all())
+        self._index = (state, index)
+        return index
+
+    async def search(self, query: str, limit: int = 10, category: Optional[str] = None) -> list[dict]:
+        """Entries relevant to `query`, best first, each with its `score`. A backend
+        that searches natively (Postgres full text + trigrams) answers it without
+        loading every entry; otherwise the local BM25 index does."""
+        if hasattr(await self._backend(), "search"):
+            return await self._call("search", query, limit, category)
+        return (await self._current_index()).search(query, limit, category)
+
+    async def profile(self, query: str = "", k: Optional[int] = None,
+                      budget_tokens: Optional[int] = None) -> str:
+        """Digest of the entries relevant to `query` (the current user message) for
+        prompt injection: the top-`k` matches of ``search()`` (so the same ranking as
+        ``get_memory`` on either backend), topped up with the most recent entries,
+        within `budget_tokens` (env MEMORY_PROFILE_TOP_K / MEMORY_PROFILE_TOKEN_BUDGET,
+        default 12 / 400)."""
+        k = _env_int("MEMORY_PROFILE_TOP_K", PROFILE_TOP_K) if k is None else k
+        if budget_tokens is None:
+            budget_tokens = _env_int("MEMORY_PROFILE_TOKEN_BUDGET", PROFILE_TOKEN_BUDGET)
+        entries = (await self._current_index()).entries
+        if not entries:
+            return ""
+        ranked = await self.search(query, limit=k) if query and query.strip() else []
+        chosen = select_for_prompt(ranked, entries, k, budget_tokens)
+        return summarize(chosen, cap=len(chosen))
+
+    async def add(self, *args, **kwargs) -> dict:
+        try:
+            return await self._call("add", *args, **kwargs)
+        finally:
+            self.revision += 1
 
-    def update(self, *args, **kwargs):
-        return self._store().update(*args, **kwargs)
+    async def update(self, *args, **kwargs):
+        try:
+            return await self._call("update", *args, **kwargs)
+        finally:
+            self.revision += 1
 
-    def delete(self, *args, **kwargs) -> bool:
-        return self._store().delete(*args, **kwargs)
+    async def delete(self, *args, **kwargs) -> bool:
+        try:
+            return await self._call("delete", *args, **kwargs)
+        finally:
+            self.revision += 1
 
 
 # module-wide singleton (backend chosen on first use)
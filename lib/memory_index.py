@@ -0,0 +1,110 @@
+"""Local relevance ranking of long-term memory entries (BM25).
+
+The coordinator's memory profile used to be the first ``SUMMARY_CAP`` entries in
+insertion order, whatever the user asked. ``MemoryIndex`` ranks entries against a
+query instead, so ``get_memory`` can answer "what do I know about X" and a turn gets
+only the few facts that bear on its message (``select_for_prompt``). The Postgres
+backend ranks in SQL instead, over the same ``terms()``.
+
+Everything is in-process and dependency-free — a few hundred short entries make a
+BM25 pass a sub-millisecond affair, so no NumPy or embedding service is needed.
+Polish inflection is handled crudely but effectively: tokens are diacritic-folded and
+cut to their first ``STEM_CHARS`` characters, shorter ones lose their last letter
+("spotkania", "spotkaniu" -> "spotka"; "kawę", "kawy", "kawa" -> "kaw").
+"""
+from __future__ import annotations
+
+import math
+from collections import Counter
+from typing import Optional
+
+from lib.text_utils import fold_tokens
+
+STEM_CHARS = 6
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Words that carry no retrieval signal in the user's messages (diacritic-folded).
+_STOPWORDS = frozenset({
+    "a", "i", "o", "w", "z", "u", "na", "do", "od", "po", "za", "ze", "we", "co", "czy",
+    "jak", "jest", "sa", "to", "ten", "ta", "te", "mi", "mnie", "moj", "moja", "moje",
+    "sie", "nie", "tak", "dla", "przy", "oraz", "ale", "jaki", "jaka", "jakie",
+    "the", "an", "and", "or", "of", "in", "on", "at", "for", "is", "are", "be",
+    "my", "me", "you", "what", "how", "does", "user", "users",
+})
+
+
+def _stem(token: str) -> str:
+    return token[:min(STEM_CHARS, max(3, len(token) - 1))]
+
+
+def terms(text: str) -> list[str]:
+    """Index terms of `text`: folded word tokens minus stopwords, crudely stemmed."""
+    return [_stem(t) for t in fold_tokens(text) if len(t) > 1 and t not in _STOPWORDS]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count of `text` (~4 characters per token)."""
+    return (len(text) + 3) // 4
+
+
+class MemoryIndex:
+    """BM25 index over memory entries (their text and category)."""
+
+    def __init__(self, entries: list[dict], k1: float = BM25_K1, b: float = BM25_B):
+        self.entries = entries
+        self.k1, self.b = k1, b
+        self._docs = [Counter(terms(f"{e.get('text', '')} {e.get('category', '')}")) for e in entries]
+        lengths = [sum(doc.values()) for doc in self._docs]
+        self._lengths = lengths
+        self._avg_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+        df: Counter = Counter()
+        for doc in self._docs:
+            df.update(doc.keys())
+        n = len(entries)
+        self._idf = {t: math.log(1 + (n - f + 0.5) / (f + 0.5)) for t, f in df.items()}
+
+    def scores(self, query: str) -> list[float]:
+        """BM25 score of every entry for `query` (0.0 when no term matches)."""
+        wanted = [t for t in dict.fromkeys(terms(query)) if t in self._idf]
+        out = []
+        for doc, length in zip(self._docs, self._lengths):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * length / (self._avg_length or 1))
+            for t in wanted:
+                tf = doc.get(t)
+                if tf:
+                    score += self._idf[t] * tf * (self.k1 + 1) / (tf + norm)
+            out.append(score)
+        return out
+
+    def search(self, query: str, limit: int = 10, category: Optional[str] = None) -> list[dict]:
+        """Entries matching `query`, best first (newer first among equal scores),
+        at most `limit`; optionally only those in `category`."""
+        ranked = [
+            (score, e) for score, e in zip(self.scores(query), self.entries)
+            if score > 0 and (category is None or e.get("category") == category)
+        ]
+        ranked.sort(key=lambda se: (se[0], se[1].get("updated_at") or ""), reverse=True)
+        return [dict(e, score=round(score, 3)) for score, e in ranked[:limit]]
+
+
+def select_for_prompt(ranked: list[dict], entries: list[dict], k: int,
+                      budget_tokens: int) -> list[dict]:
+    """Entries to inject into a prompt: the `ranked` search matches first, then the
+    most recently updated of `entries` to fill up to `k`, skipping any entry whose
+    line would take the digest past `budget_tokens`."""
+    seen = {e["id"] for e in ranked}
+    recent = sorted(
+        (e for e in entries if e.get("id") not in seen),
+        key=lambda e: e.get("updated_at") or "", reverse=True,
+    )
+    chosen, used = [], 0
+    for e in ranked + recent:
+        if len(chosen) >= k:
+            break
+        cost = estimate_tokens(f"  - {e.get('text', '')} (inferred)")
+        if used + cost > budget_tokens:
+            continue  # a long entry does not crowd out shorter ones below it
+        chosen.append(e)
+        used += cost
+    return chosen
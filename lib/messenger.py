@@ -16,6 +16,8 @@ import os
 
 import httpx
 
+from lib import http_client
+
 logger = logging.getLogger(__name__)
 
 GRAPH_API_VERSION = "v22.0"
@@ -24,6 +26,12 @@ SEND_API_URL = f"https://graph.facebook.com/{GRAPH_API_VERSION}/me/messages"
 # Messenger caps a single text message at 2000 chars; longer replies are chunked.
 _MAX_MESSAGE_CHARS = 2000
 
+# Streaming replies are flushed at paragraph breaks; a single paragraph growing past
+# this many chars is flushed at its last sentence end instead, so a long answer still
+# arrives progressively without turning every sentence into its own bubble.
+_STREAM_FLUSH_CHARS = 300
+_SENTENCE_ENDS = (". ", "! ", "? ", "… ", ".\n", "!\n", "?\n")
+
 
 def verify_signature(app_secret: str, payload: bytes, header: str | None) -> bool:
     """Validate the `X-Hub-Signature-256` header against the raw request body.
@@ -87,6 +95,42 @@ def _chunks(text: str, size: int = _MAX_MESSAGE_CHARS):
         yield text[i : i + size]
 
 
+def split_flushable(buffer: str, min_chars: int = _STREAM_FLUSH_CHARS) -> tuple[str, str]:
+    """Split a streaming reply buffer into `(ready, remainder)`.
+
+    `ready` ends at the last paragraph break (blank line) in the buffer; if there is
+    none but the buffer has reached `min_chars`, it ends at the last sentence end.
+    Otherwise nothing is ready yet and the whole buffer is the remainder."""
+    cut = buffer.rfind("\n\n")
+    if cut != -1:
+        return buffer[: cut + 2], buffer[cut + 2 :]
+    if len(buffer) >= min_chars:
+        cut = max(buffer.rfind(end) for end in _SENTENCE_ENDS)
+        if cut != -1:
+            return buffer[: cut + 2], buffer[cut + 2 :]
+    return "", buffer
+
+
+async def send_sender_action(
+    page_access_token: str, recipient_id: str, action: str = "typing_on"
+) -> None:
+    """Show a sender action (`typing_on` / `typing_off` / `mark_seen`) to the user.
+
+    Used to show the typing indicator as soon as a turn starts and again between
+    streamed paragraphs, so it goes through the shared keep-alive client
+    (`lib.http_client`) rather than a new connection each time. Best-effort: errors
+    are logged and swallowed, like `send_message`."""
+    payload = {"recipient": {"id": recipient_id}, "sender_action": action}
+    try:
+        resp = await http_client.request(
+            "POST", SEND_API_URL, params={"access_token": page_access_token}, json=payload
+        )
+        if resp.status_code >= 400:
+            logger.warning("Sender action %s failed %s: %s", action, resp.status_code, resp.text[:200])
+    except httpx.HTTPError as exc:
+        logger.warning("Sender action %s request failed: %s", action, exc)
+
+
 async def send_message(
     page_access_token: str,
     recipient_id: str,
@@ -98,7 +142,9 @@ async def send_message(
 
     Long replies are split into <=2000-char chunks sent in order. Network/API
     errors are logged and swallowed so a delivery failure never crashes the caller
-    (for the webhook the inbound event was already acknowledged with 200).
+    (for the webhook the inbound event was already acknowledged with 200). Requests go
+    through the shared keep-alive client (`lib.http_client`): a streamed reply sends
+    one message per paragraph.
 
     Args:
         messaging_type: "RESPONSE" for a normal reply inside the 24h window, or
@@ -112,41 +158,42 @@ async def send_message(
     a scheduler push best-effort without ever raising.
     """
     params = {"access_token": page_access_token}
-    async with httpx.AsyncClient(timeout=15) as client:
-        for chunk in _chunks(text):
-            payload = {
-                "recipient": {"id": recipient_id},
-                "messaging_type": messaging_type,
-                "message": {"text": chunk},
-            }
-            if messaging_type == "MESSAGE_TAG" and tag:
-                payload["tag"] = tag
-            try:
-                resp = await client.post(SEND_API_URL, params=params, json=payload)
-                if resp.status_code >= 400:
-                    logger.error(
-                        "Send API error %s: %s", resp.status_code, resp.text[:500]
+    for chunk in _chunks(text):
+        payload = {
+            "recipient": {"id": recipient_id},
+            "messaging_type": messaging_type,
+            "message": {"text": chunk},
+        }
+        if messaging_type == "MESSAGE_TAG" and tag:
+            payload["tag"] = tag
+        try:
+            resp = await http_client.request("POST", SEND_API_URL, params=params, json=payload)
+            if resp.status_code >= 400:
+                logger.error(
+                    "Send API error %s: %s", resp.status_code, resp.text[:500]
+                )
+                if messaging_type == "MESSAGE_TAG":
+                    logger.warning(
+                        "Tagged send rejected; retrying as RESPONSE (works only if "
+                        "the 24h window is open). If proactive pushes keep failing, "
+                        "message the bot once to reopen the window, or enable the "
+                        "HUMAN_AGENT tag in the Meta panel."
                     )
-                    if messaging_type == "MESSAGE_TAG":
-                        logger.warning(
-                            "Tagged send rejected; retrying as RESPONSE (works only if "
-                            "the 24h window is open). If proactive pushes keep failing, "
-                            "message the bot once to reopen the window, or enable the "
-                            "HUMAN_AGENT tag in the Meta panel."
+                    retry = {
+                        "recipient": {"id": recipient_id},
+                        "messaging_type": "RESPONSE",
+                        "message": {"text": chunk},
+                    }
+                    try:
+                        r2 = await http_client.request(
+                            "POST", SEND_API_URL, params=params, json=retry
                         )
-                        retry = {
-                            "recipient": {"id": recipient_id},
-                            "messaging_type": "RESPONSE",
-                            "message": {"text": chunk},
-                        }
-                        try:
-                            r2 = await client.post(SEND_API_URL, params=params, json=retry)
-                            if r2.status_code >= 400:
-                                logger.error(
-                                    "Send API RESPONSE fallback also failed %s: %s",
-                                    r2.status_code, r2.text[:500],
-                                )
-                        except httpx.HTTPError as exc:
-                            logger.error("Send API fallback request failed: %s", exc)
-            except httpx.HTTPError as exc:
-                logger.error("Send API request failed: %s", exc)
+                        if r2.status_code >= 400:
+                            logger.error(
+                                "Send API RESPONSE fallback also failed %s: %s",
+                                r2.status_code, r2.text[:500],
+                            )
+                    except httpx.HTTPError as exc:
+                        logger.error("Send API fallback request failed: %s", exc)
+        except httpx.HTTPError as exc:
+            logger.error("Send API request failed: %s", exc)
@@ -0,0 +1,130 @@
+"""Stock/ETF/index quotes from Yahoo Finance's chart endpoint, fetched concurrently.
+
+``get_quotes(cache, symbols)`` answers a multi-symbol question ("jak stoją PKO, PZU i
+WIG20") in one tool call: the symbols are fetched concurrently through
+``lib.http_client`` (Yahoo is limited to a few parallel requests, see
+``HOST_CONCURRENCY``) and returned as one compact table, a row per symbol.
+
+Each quote is cached in Ctx.cache under ``quote:<SYMBOL>`` for ``QUOTE_TTL_OPEN``
+seconds while its exchange is in its regular session, and until the next session
+opens otherwise (from Yahoo's ``currentTradingPeriod``; at most ``QUOTE_TTL_MAX``).
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from lib import http_client
+
+logger = logging.getLogger(__name__)
+
+YAHOO_CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+YAHOO_HEADERS = {"User-Agent": "Jarvis (personal assistant)"}
+QUOTE_TTL_OPEN = 45
+QUOTE_TTL_MAX = 3 * 86400
+MAX_SYMBOLS = 10
+
+QUOTE_COLUMNS = [
+    "symbol", "price", "change_percent", "previous_close", "day_low", "day_high",
+    "volume", "currency", "exchange", "quote_time",
+]
+
+
+def quote_ttl(meta: dict, now: Optional[float] = None) -> int:
+    """Seconds a quote stays fresh: short during the regular session, until the next
+    weekday open outside it."""
+    now = time.time() if now is None else now
+    regular = (meta.get("currentTradingPeriod") or {}).get("regular") or {}
+    start, end = regular.get("start"), regular.get("end")
+    if not start or not end or start <= now < end:
+        return QUOTE_TTL_OPEN
+    if now < start:
+        return int(min(max(start - now, QUOTE_TTL_OPEN), QUOTE_TTL_MAX))
+
+    offset = meta.get("gmtoffset") or 0
+    next_open = start + 86400
+    while next_open <= now or datetime.fromtimestamp(next_open + offset, timezone.utc).weekday() >= 5:
+        next_open += 86400
+    return int(min(next_open - now, QUOTE_TTL_MAX))
+
+
+def _row(meta: dict, symbol: str) -> dict:
+    price = meta.get("regularMarketPrice")
+    previous = meta.get("chartPreviousClose") or meta.get("previousClose")
+    quote_time = meta.get("regularMarketTime")
+    return {
+        "symbol": meta.get("symbol", symbol),
+        "price": price,
+        "change_percent": round((price / previous - 1) * 100, 2) if price and previous else None,
+        "previous_close": previous,
+        "day_low": meta.get("regularMarketDayLow"),
+        "day_high": meta.get("regularMarketDayHigh"),
+        "volume": meta.get("regularMarketVolume"),
+        "currency": meta.get("currency"),
+        "exchange": meta.get("exchangeName"),
+        "quote_time": datetime.fromtimestamp(quote_time).isoformat() if quote_time else None,
+    }
+
+
+async def fetch_quote(symbol: str) -> tuple[Optional[dict], Optional[str], int]:
+    """(row, error, ttl) for one symbol straight from Yahoo."""
+    try:
+        response = await http_client.get(
+            YAHOO_CHART_URL.format(symbol=symbol), headers=YAHOO_HEADERS,
+            params={"interval": "1d", "range": "1d"}, timeout=10,
+        )
+        # Yahoo returns a JSON error body (with HTTP 404) for unknown symbols,
+        # so we parse the body before deciding it is a hard failure.
+        data = response.json()
+    except Exception as e:
+        logger.error(f"Couldnt get quote for {symbol}: {e}")
+        return None, f"Couldnt get a quote: {e}", 0
+
+    chart = data.get("chart", {})
+    if chart.get("error") or not chart.get("result"):
+        return None, "Unknown or unsupported symbol", 0
+    meta = chart["result"][0].get("meta", {})
+    return _row(meta, symbol), None, quote_ttl(meta)
+
+
+async def _cached_quote(cache, symbol: str) -> tuple[Optional[dict], Optional[str]]:
+    key = f"quote:{symbol}"
+    try:
+        stored = await cache.get_from_cache(key)
+    except Exception as e:
+        logger.warning(f"Quote cache lookup failed: {e}")
+        stored = None
+    if stored is not None:
+        return json.loads(stored), None
+
+    row, error, ttl = await fetch_quote(symbol)
+    if row is not None:
+        try:
+            await cache.save_to_cache(key, json.dumps(row), ttl=ttl)
+        except Exception as e:
+            logger.warning(f"Could not store quote for {symbol}: {e}")
+    return row, error
+
+
+async def get_quotes(cache, symbols: list[str]) -> dict:
+    """One table ({"columns", "rows"}) for up to MAX_SYMBOLS symbols, plus an
+    "errors" map for symbols that could not be quoted."""
+    wanted = list(dict.fromkeys(s.strip().upper() for s in symbols if s and s.strip()))
+    results = await asyncio.gather(*(_cached_quote(cache, s) for s in wanted[:MAX_SYMBOLS]))
+
+    table = {"columns": QUOTE_COLUMNS, "rows": [], "source": "Yahoo Finance"}
+    errors = {}
+    for symbol, (row, error) in zip(wanted, results):
+        if row is not None:
+            table["rows"].append([row[c] for c in QUOTE_COLUMNS])
+        else:
+            errors[symbol] = error
+    for symbol in wanted[MAX_SYMBOLS:]:
+        errors[symbol] = f"Skipped: at most {MAX_SYMBOLS} symbols per call"
+    if errors:
+        table["errors"] = errors
+    return table
@@ -0,0 +1,195 @@
+"""Deterministic fast-path pre-router.
+
+Every user turn normally starts on the coordinator, which runs on the reasoning model
+(see ``lib/llm.py``), just to decide which subagent to call. For clearly single-domain
+messages ("zgaś światło w salonie", "jaka jutro pogoda") that decision is obvious, so
+``lib.engine`` asks this pre-router first: when it names one subagent, the turn starts
+directly on that subagent (which then hands off to the composer) and the reasoning
+call is skipped. Anything ambiguous — no domain, several domains, a long multi-part
+request — returns ``None`` and goes through the full coordinator as before.
+
+The router is pluggable: ``set_router`` swaps in any object with a
+``classify(text) -> Optional[str]`` method. Routing decisions are logged, and
+``routing_stats()`` reports hit rates (how many reasoning-model calls were saved).
+Master switch: ``FAST_PATH_ENABLED`` (enabled by default).
+"""
+from __future__ import annotations
+
+import logging
+import os
+from typing import Optional, Protocol
+
+from lib.text_utils import fold_tokens
+
+logger = logging.getLogger(__name__)
+
+# Word stems per subagent, matched against the start of each (diacritic-folded,
+# lower-cased) word. Keep them specific: a stem shared by two domains makes every
+# message containing it ambiguous, which is safe (coordinator) but saves nothing.
+ROUTE_STEMS: dict[str, tuple[str, ...]] = {
+    "iot_operator": ("swiatl", "swiatel", "zarowk", "oswietl", "zgas",
+                     "przyciem", "rozjasn", "lights"),
+    "weather_agent": ("pogod", "prognoz", "deszcz", "snieg", "parasol",
+                      "upal", "weather", "forecast"),
+    "finance_agent": ("walut", "dolar", "gield", "notowan", "wig20", "exchange", "stock"),
+    "maps_agent": ("dojad", "dojech", "dojsc", "dojazd", "tras", "autobus", "tramwaj",
+                   "korki", "nawigac", "route"),
+    "news_agent": ("news", "aktualnosc", "wydarzeni", "wiadomosci"),
+    "fpl_agent": ("fpl", "fantasy", "gameweek"),
+    "memory_operator": ("zapamietaj", "pamietasz"),
+    "scheduler_agent": ("przypomnieni", "zaplanuj", "harmonogram"),
+}
+
+# Whole words only: as prefixes these catch unrelated words ("euro" -> "Europy",
+# "metro" -> "metrów", "zapal" -> "zapalenie", "mroz" -> "mrożonki").
+ROUTE_WORDS: dict[str, tuple[str, ...]] = {
+    "iot_operator": ("zapal", "zapalic", "zapalisz"),
+    "weather_agent": ("mroz", "mrozu", "mrozy", "mrozno"),
+    "finance_agent": ("euro", "eur"),
+    "maps_agent": ("metro", "metrem", "metrze"),
+}
+
+# Stems that name a domain but are just as common outside it ("kurs angielskiego",
+# "akcja filmu", "Frankfurt", "temperatura wrzenia", "lampa naftowa", "przypomnij mi
+# kto..."). They count as a domain match, yet route a message only together with a
+# second cue: another of the domain's stems or words, or one of its ROUTE_CUES.
+ROUTE_WEAK_STEMS: dict[str, tuple[str, ...]] = {
+    "iot_operator": ("lamp",),
+    "weather_agent": ("temperatur",),
+    "finance_agent": ("kurs", "frank", "funt", "akcj"),
+    "scheduler_agent": ("przypomnij",),
+}
+
+# Context that confirms a weak stem (an action verb, a currency, a time) but is not
+# a domain match by itself: "jutro" alone says nothing about the weather.
+ROUTE_CUES: dict[str, tuple[str, ...]] = {
+    "iot_operator": ("wlacz", "wylacz", "ustaw", "jasnos", "kolor"),
+    "weather_agent": ("jutro", "dzis", "dzisiaj", "weekend", "stopni", "dworze", "zewnatrz"),
+    "finance_agent": ("zlot", "pln", "wymian", "wymien", "notowa"),
+    "scheduler_agent": ("jutro", "pojutrze", "dzis", "dzisiaj", "rano", "wieczor",
+                        "godzin", "minut", "codzien", "poniedzial", "wtor", "srod",
+                        "czwart", "piat", "sobot", "niedziel"),
+}
+
+# Whole words that hint at a domain but are common outside it ("premier Tusk",
+# "codziennie biegam"): they never route a message on their own, yet still count
+# as a domain, so a message pairing one with another domain's stem stays ambiguous.
+ROUTE_HINTS: dict[str, tuple[str, ...]] = {
+    "fpl_agent": ("premier",),
+    "scheduler_agent": ("codziennie",),
+}
+
+# Longer messages tend to be multi-part requests even when only one domain's stems
+# show up; leave those to the coordinator.
+MAX_FAST_PATH_WORDS = 20
+
+
+class Router(Protocol):
+    def classify(self, text: str) -> Optional[str]: ...
+
+
+class KeywordRouter:
+    """Route to the single subagent whose stems or words appear in the message, if
+    exactly one domain matches, at least one match is not a mere hint and a weak
+    stem is backed by a second cue."""
+
+    def __init__(self, stems: dict[str, tuple[str, ...]] = ROUTE_STEMS,
+                 max_words: int = MAX_FAST_PATH_WORDS,
+                 words: dict[str, tuple[str, ...]] = ROUTE_WORDS,
+                 hints: dict[str, tuple[str, ...]] = ROUTE_HINTS,
+                 weak: dict[str, tuple[str, ...]] = ROUTE_WEAK_STEMS,
+                 cues: dict[str, tuple[str, ...]] = ROUTE_CUES):
+        self.stems = stems
+        self.words = words
+        self.hints = hints
+        self.weak = weak
+        self.cues = cues
+        self.max_words = max_words
+
+    @staticmethod
+    def _prefixed(tokens: list[str], stems: tuple[str, ...]) -> set[str]:
+        return {stem for stem in stems if any(tok.startswith(stem) for tok in tokens)}
+
+    def _strong(self, tokens: list[str]) -> set[str]:
+        hits = {agent for agent, stems in self.stems.items() if self._prefixed(tokens, stems)}
+        return hits | {agent for agent, words in self.words.items() if set(words) & set(tokens)}
+
+    def matches(self, text: str) -> set[str]:
+        """Domains with a routing match (a stem, weak stem or whole word), hints excluded."""
+        tokens = fold_tokens(text)
+        weak = {agent for agent, stems in self.weak.items() if self._prefixed(tokens, stems)}
+        return self._strong(tokens) | weak
+
+    def hinted(self, text: str) -> set[str]:
+        tokens = set(fold_tokens(text))
+        return {agent for agent, words in self.hints.items() if set(words) & tokens}
+
+    def confirmed(self, agent: str, text: str) -> bool:
+        """Whether `agent`'s match is more than a single weak stem: a regular stem or
+        word, two distinct weak stems ("kurs franka"), or a weak stem plus a cue."""
+        tokens = fold_tokens(text)
+        if agent in self._strong(tokens):
+            return True
+        weak = self._prefixed(tokens, self.weak.get(agent, ()))
+        return len(weak) >= 2 or bool(weak and self._prefixed(tokens, self.cues.get(agent, ())))
+
+    def classify(self, text: str) -> Optional[str]:
+        if len(fold_tokens(text)) > self.max_words:
+            return None
+        hits = self.matches(text)
+        if len(hits) != 1 or not self.hinted(text) <= hits:
+            return None
+        agent = next(iter(hits))
+        return agent if self.confirmed(agent, text) else None
+
+
+_ROUTER: dict = {"router": KeywordRouter()}
+_STATS: dict = {"turns": 0, "fast_path": 0, "by_agent": {}}
+
+
+def set_router(router: Router) -> None:
+    """Replace the pre-router (e.g. with a different rule set or a classifier)."""
+    _ROUTER["router"] = router
+
+
+def fast_path_enabled() -> bool:
+    """Master switch (env FAST_PATH_ENABLED); enabled unless set to a falsy value."""
+    raw = os.getenv("FAST_PATH_ENABLED")
+    if raw is None or raw.strip() == "":
+        return True
+    return raw.strip().lower() not in ("0", "false", "no", "off")
+
+
+def pre_route(text: str, available: set[str]) -> Optional[str]:
+    """Return the subagent to start the turn on, or None for the full coordinator.
+
+    `available` is the set of currently enabled subagents; a route to anything else
+    falls back to the coordinator. Every decision is logged and counted."""
+    if not fast_path_enabled():
+        return None
+    target = _ROUTER["router"].classify(text)
+    if target not in available:
+        target = None
+    _STATS["turns"] += 1
+    if target:
+        _STATS["fast_path"] += 1
+        _STATS["by_agent"][target] = _STATS["by_agent"].get(target, 0) + 1
+    logger.info(
+        "[route] %s (fast-path hit rate %d/%d)",
+        f"fast-path -> {target}" if target else "coordinator",
+        _STATS["fast_path"], _STATS["turns"],
+    )
+    return target
+
+
+def routing_stats() -> dict:
+    """Counters since process start: turns routed, fast-path hits (= reasoning-model
+    coordinator calls saved), the hit rate and hits per subagent."""
+    turns, hits = _STATS["turns"], _STATS["fast_path"]
+    return {
+        "turns": turns,
+        "fast_path": hits,
+        "coordinator": turns - hits,
+        "hit_rate": round(hits / turns, 3) if turns else 0.0,
+        "by_agent": dict(_STATS["by_agent"]),
+    }
@@ -1,7 +1,69 @@
 from agents import RunConfig
 from agents.models.openai_provider import OpenAIProvider
+from openai import AsyncOpenAI
+import importlib.util
+import httpx
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
+# One process-wide provider (and the AsyncOpenAI/httpx client behind it) shared by
+# every run — the engine's user turns and the scheduler's system turns alike. A fresh
+# provider per turn meant a cold connection pool and new TLS handshakes before every
+# coordinator/subagent model call; a warm keep-alive pool cuts time-to-first-token.
+_PROVIDER: dict = {"provider": None, "http_client": None}
+
+
+def _env_number(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    try:
+        return float(raw) if raw and raw.strip() else default
+    except ValueError:
+        return default
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    """Keep-alive httpx pool for the model API, tunable via env:
+    OPENAI_MAX_CONNECTIONS (default 20), OPENAI_MAX_KEEPALIVE_CONNECTIONS (default 10)
+    and OPENAI_KEEPALIVE_EXPIRY seconds (default 120). HTTP/2 is used when the optional
+    `h2` package is installed, so parallel subagent calls multiplex one connection."""
+    limits = httpx.Limits(
+        max_connections=int(_env_number("OPENAI_MAX_CONNECTIONS", 20)),
+        max_keepalive_connections=int(_env_number("OPENAI_MAX_KEEPALIVE_CONNECTIONS", 10)),
+        keepalive_expiry=_env_number("OPENAI_KEEPALIVE_EXPIRY", 120),
+    )
+    # Model calls (especially reasoning ones) can run long; only connecting is kept short.
+    timeout = httpx.Timeout(600.0, connect=10.0)
+    return httpx.AsyncClient(limits=limits, timeout=timeout, http2=_http2_available())
+
+
+def shared_provider() -> OpenAIProvider:
+    """The process-wide OpenAIProvider, created on first use (after .env is loaded)."""
+    if _PROVIDER["provider"] is None:
+        # use_responses=True keeps every agent on the OpenAI Responses API, which
+        # conversation continuity depends on (previous_response_id in lib/engine.py).
+        http_client = _build_http_client()
+        client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), http_client=http_client)
+        _PROVIDER["provider"] = OpenAIProvider(openai_client=client, use_responses=True)
+        _PROVIDER["http_client"] = http_client
+        logger.info("Shared OpenAI provider created (http2=%s)", _http2_available())
+    return _PROVIDER["provider"]
+
+
+async def close_shared_provider() -> None:
+    """Close the shared HTTP pool (on service shutdown). Safe to call when unused."""
+    http_client = _PROVIDER["http_client"]
+    _PROVIDER["provider"] = None
+    _PROVIDER["http_client"] = None
+    if http_client is not None:
+        await http_client.aclose()
+
+
 class Config():
 
     @classmethod
@@ -14,10 +76,5 @@ class Config():
         # models, so we leave RunConfig.model unset and let the provider resolve
         # the string model names each agent carries (from lib/llm.py).
         #
-        # use_responses=True keeps every agent on the OpenAI Responses API, which
-        # conversation continuity depends on (previous_response_id in lib/engine.py).
-        provider = OpenAIProvider(
-            api_key=os.getenv("OPENAI_API_KEY"),
-            use_responses=True,
-        )
-        return RunConfig(model_provider=provider)
+        # Each run gets its own RunConfig; the provider behind it is shared.
+        return RunConfig(model_provider=shared_provider())
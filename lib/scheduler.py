@@ -9,7 +9,7 @@ system-originated turn — and pushes the reply to the job's channel. See
 Storage mirrors ``lib/memory.py``: an on-disk JSON store by default, swapped for a
 Postgres backend (``app/db/scheduler_repo.py``) when ``DATABASE_URL`` is set. This
 module owns storage/CRUD and the schedule computation; the agent-facing tools live
-in ``lib/tools.py``.
+in ``lib/tools/scheduler.py``.
 
 Times are stored as timezone-aware ISO-8601 strings in the scheduler timezone
 (``SCHEDULER_TIMEZONE``, default Europe/Warsaw), so both backends round-trip the
@@ -17,6 +17,8 @@ same shape.
 """
 from __future__ import annotations
 
+import asyncio
+import inspect
 import json
 import logging
 import os
@@ -283,42 +285,48 @@ def _select_backend():
 
 
 class _JobStoreProxy:
-    """Delegates to the backend chosen lazily on first use (so .env is respected)."""
+    """Async facade over the backend chosen lazily on first use (so .env is
+    respected), or over `impl` when given. Postgres coroutines are awaited; the JSON
+    store's file I/O runs in a worker thread, so the runner's tick never blocks the
+    event loop."""
 
-    def __init__(self):
-        self._impl = None
+    def __init__(self, impl=None):
+        self._impl = impl
 
-    def _store(self):
+    async def _call(self, method: str, *args, **kwargs):
         if self._impl is None:
-            self._impl = _select_backend()
-        return self._impl
+            self._impl = await asyncio.to_thread(_select_backend)
+        fn = getattr(self._impl, method)
+        if inspect.iscoroutinefunction(fn):
+            return await fn(*args, **kwargs)
+        return await asyncio.to_thread(fn, *args, **kwargs)
 
-    def all(self) -> list[dict]:
-        return self._store().all()
+    async def all(self) -> list[dict]:
+        return await self._call("all")
 
-    def active(self) -> list[dict]:
-        return self._store().active()
+    async def active(self) -> list[dict]:
+        return await self._call("active")
 
-    def for_conversation(self, conversation_id: str) -> list[dict]:
-        return self._store().for_conversation(conversation_id)
+    async def for_conversation(self, conversation_id: str) -> list[dict]:
+        return await self._call("for_conversation", conversation_id)
 
-    def due(self, now: datetime) -> list[dict]:
-        return self._store().due(now)
+    async def due(self, now: datetime) -> list[dict]:
+        return await self._call("due", now)
 
-    def get(self, job_id: str) -> Optional[dict]:
-        return self._store().get(job_id)
+    async def get(self, job_id: str) -> Optional[dict]:
+        return await self._call("get", job_id)
 
-    def add(self, job: dict) -> dict:
-        return self._store().add(job)
+    async def add(self, job: dict) -> dict:
+        return await self._call("add", job)
 
-    def save(self, job: dict) -> dict:
-        return self._store().save(job)
+    async def save(self, job: dict) -> dict:
+        return await self._call("save", job)
 
-    def update(self, job_id: str, **fields):
-        return self._store().update(job_id, **fields)
+    async def update(self, job_id: str, **fields):
+        return await self._call("update", job_id, **fields)
 
-    def delete(self, job_id: str) -> bool:
-        return self._store().delete(job_id)
+    async def delete(self, job_id: str) -> bool:
+        return await self._call("delete", job_id)
 
 
 # module-wide singleton (backend chosen on first use)
@@ -6,7 +6,9 @@ job's prompt back into the very same ``lib.engine.handle_message`` a user turn u
 but with ``origin="system"`` — then pushes the reply to the job's channel.
 
 It runs in-process inside the long-running webhook service (started from
-``app/webhook.py`` ``lifespan``). Everything here is best-effort: a failing job, a
+``app/webhook.py`` ``lifespan``) and submits through the webhook's
+``lib.dispatcher.TurnDispatcher``, so a job never races a user turn of the same
+conversation. Everything here is best-effort: a failing job, a
 delivery error, or a bad tick is logged and swallowed so the loop never dies and the
 service is never taken down by scheduling.
 """
@@ -18,8 +20,8 @@ import os
 from datetime import datetime
 from typing import Awaitable, Callable, Optional
 
-from lib.cache import Cache, Ctx
-from lib.engine import handle_message
+from lib.cache import Cache
+from lib.dispatcher import TurnDispatcher
 from lib.messenger import send_message
 from lib.scheduler import (
     describe_schedule,
@@ -52,15 +54,13 @@ def tick_seconds() -> int:
 
 # -- invocation: run a job's prompt as a system-originated turn ----------------
 
-def _make_default_invoke(cache: Cache) -> Callable[[dict], Awaitable[str]]:
-    """Build the default invoker. A fresh Ctx per run (sharing the Redis cache) keeps
-    the loop from clobbering the webhook's shared ctx.conversation_id."""
+def _make_default_invoke(dispatcher: TurnDispatcher) -> Callable[[dict], Awaitable[str]]:
+    """Build the default invoker. Jobs go through the same dispatcher as user turns, so
+    a job firing while the user is mid-conversation queues behind that turn instead of
+    forking the conversation; the dispatcher gives each run a fresh Ctx."""
 
     async def _invoke(job: dict) -> str:
-        ctx = Ctx(cache=cache)
-        return await handle_message(
-            job["conversation_id"], job["prompt"], ctx, origin="system"
-        )
+        return await dispatcher.run(job["conversation_id"], job["prompt"], origin="system")
 
     return _invoke
 
@@ -114,16 +114,17 @@ async def _run_job(store, invoke, deliver, job: dict, now: datetime) -> None:
     else:
         job["next_run_at"] = nxt.isoformat()
         logger.info("Scheduled job %s re-armed for %s", job["id"], job["next_run_at"])
-    store.save(job)
+    await store.save(job)
 
 
 async def tick_once(store, invoke, deliver, now: Optional[datetime] = None) -> int:
     """Fire every job due at ``now`` (sequentially, to keep conversation continuity).
 
-    Returns the number of jobs fired. Injectable ``invoke``/``deliver`` make this
-    unit-testable without network or the model."""
+    `store` is the async job store (``lib.scheduler.store``). Returns the number of
+    jobs fired. Injectable ``invoke``/``deliver`` make this unit-testable without
+    network or the model."""
     now = now or now_tz()
-    due = store.due(now)
+    due = await store.due(now)
     for job in due:
         await _run_job(store, invoke, deliver, job, now)
     return len(due)
@@ -135,11 +136,15 @@ async def run_scheduler_loop(
     deliver: Optional[Callable[[dict, str], Awaitable[None]]] = None,
     seconds: Optional[int] = None,
     cache: Optional[Cache] = None,
+    dispatcher: Optional[TurnDispatcher] = None,
 ) -> None:
-    """Run the scheduler forever: every `seconds`, fire due jobs. Never raises."""
+    """Run the scheduler forever: every `seconds`, fire due jobs. Never raises.
+
+    Pass the webhook's `dispatcher` so jobs and user turns share per-conversation
+    ordering; without one, a private dispatcher over `cache` is used."""
     store = store or default_store
-    cache = cache or Cache()
-    invoke = invoke or _make_default_invoke(cache)
+    dispatcher = dispatcher or TurnDispatcher(cache=cache or Cache())
+    invoke = invoke or _make_default_invoke(dispatcher)
     deliver = deliver or default_deliver
     seconds = seconds or tick_seconds()
     logger.info("Scheduler loop started (tick=%ss)", seconds)
@@ -13,13 +13,15 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
-from typing import Any, Callable, List, Literal
+from typing import TYPE_CHECKING, Any, Callable, List, Literal
 
 from pydantic import BaseModel, Field, ConfigDict
-from tinytuya import BulbDevice
 
 from lib.tuya_link import manager, HARD_TIMEOUT, MAX_ATTEMPTS, DEFAULT_VERSION
 
+if TYPE_CHECKING:
+    from tinytuya import BulbDevice
+
 logger = logging.getLogger(__name__)
 
 
@@ -114,7 +116,7 @@ class SmartDevice(BaseModel):
         }
 
     # ------------------------------------------------------------------ #
-    # public operations (interface consumed by lib/tools.py)
+    # public operations (interface consumed by lib/tools/iot.py)
     # ------------------------------------------------------------------ #
     def _translate_status(self, state: Any) -> dict:
         if not isinstance(state, dict) or "Error" in state or "dps" not in state:
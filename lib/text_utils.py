@@ -0,0 +1,21 @@
+"""Small text-normalization helpers shared by the lookup/routing code."""
+from __future__ import annotations
+
+import re
+import unicodedata
+
+# Polish letters that do not decompose under NFKD (ł) are mapped explicitly; the rest
+# lose their combining marks below.
+_EXPLICIT_FOLDS = str.maketrans({"ł": "l", "Ł": "L"})
+_WORD = re.compile(r"\w+")
+
+
+def fold_diacritics(text: str) -> str:
+    """Lower-case `text` and strip diacritics ('Zgaś Światło' -> 'zgas swiatlo')."""
+    decomposed = unicodedata.normalize("NFKD", (text or "").translate(_EXPLICIT_FOLDS))
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def fold_tokens(text: str) -> list[str]:
+    """Folded word tokens of `text` (punctuation dropped)."""
+    return _WORD.findall(fold_diacritics(text))
@@ -0,0 +1,160 @@
+"""Result cache for tools that call external APIs.
+
+``@cached_tool`` sits between ``@function_tool`` and the tool function:
+
+    @tool_ownership("weather_agent")
+    @function_tool
+    @cached_tool(ttl=600)
+    async def current_weather(ctx: RunContextWrapper[Ctx], city: str = "Warsaw"):
+
+Results are stored in ``Ctx.cache`` (Redis, with the in-process L1 in front) under
+``tool:<tool name>:<hash of the normalized arguments>``, so the same question asked
+twice in a turn, by two conversations, or by the daily scheduled brief is answered
+once per TTL. (Exchange rates and quotes have their own caches: lib/fx.py,
+lib/quotes.py.)
+
+* Arguments are bound against the signature with defaults applied (an omitted city
+  and the default "Warsaw" share an entry), and strings are stripped, case-folded and
+  diacritic-folded ("Kraków" == "krakow"); ``normalize`` overrides this per argument.
+* Error results (a dict with an "Error"/"error"/"exception" key, or a
+  "partial_error" key for a result missing the part whose call failed) are cached
+  too, but only for ``error_ttl`` seconds, so a failing API is not hammered yet
+  recovers fast.
+* Only JSON-serialisable results are stored (a hit returns the decoded JSON, so
+  anything else would come back as a different type); others are logged and passed
+  through uncached.
+* Concurrent identical calls in this process share one execution (single flight).
+* ``when(ctx)`` returning False bypasses the cache for that call (for tools whose
+  result also depends on per-turn state).
+* ``tool_cache_stats()`` reports hits, misses and coalesced calls per tool.
+
+Master switch: ``TOOL_CACHE_ENABLED`` (enabled by default).
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+from typing import Any, Callable, Optional
+
+from agents import RunContextWrapper
+
+from lib.text_utils import fold_diacritics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ERROR_TTL = 30
+
+_ERROR_KEYS = ("Error", "error", "exception", "partial_error")
+
+_INFLIGHT: dict[str, asyncio.Future] = {}
+_STATS: dict[str, dict[str, int]] = {}
+
+
+def tool_cache_enabled() -> bool:
+    """Master switch (env TOOL_CACHE_ENABLED); enabled unless set to a falsy value."""
+    raw = os.getenv("TOOL_CACHE_ENABLED")
+    if raw is None or raw.strip() == "":
+        return True
+    return raw.strip().lower() not in ("0", "false", "no", "off")
+
+
+def normalize_text(value: Any) -> Any:
+    """Default argument normalization: strip, case-fold and drop diacritics of strings."""
+    if isinstance(value, str):
+        return fold_diacritics(value.strip()).casefold()
+    return value
+
+
+def is_error_result(result: Any) -> bool:
+    return isinstance(result, dict) and any(key in result for key in _ERROR_KEYS)
+
+
+def _count(tool: str, field: str) -> None:
+    stats = _STATS.setdefault(tool, {"hits": 0, "misses": 0, "coalesced": 0})
+    stats[field] += 1
+
+
+def tool_cache_stats() -> dict[str, dict]:
+    """Per-tool hits, misses, coalesced (single-flight) calls and hit rate since process start."""
+    report = {}
+    for tool, stats in _STATS.items():
+        lookups = stats["hits"] + stats["misses"]
+        report[tool] = {**stats, "hit_rate": round(stats["hits"] / lookups, 3) if lookups else 0.0}
+    return report
+
+
+def cached_tool(ttl: int,
+                error_ttl: int = DEFAULT_ERROR_TTL,
+                normalize: Optional[dict[str, Callable[[Any], Any]]] = None,
+                when: Optional[Callable[[RunContextWrapper], bool]] = None):
+    """Cache a tool's results for `ttl` seconds (errors for `error_ttl`), keyed on the
+    tool name and its normalized arguments. See the module docstring."""
+    normalize = normalize or {}
+
+    def wrapper(func):
+        signature = inspect.signature(func)
+        ctx_param = next(iter(signature.parameters))
+        name = func.__name__
+
+        def cache_key(args, kwargs) -> str:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key_args = {
+                param: normalize.get(param, normalize_text)(value)
+                for param, value in bound.arguments.items()
+                if param != ctx_param
+            }
+            digest = hashlib.sha1(
+                json.dumps(key_args, sort_keys=True, default=str).encode()
+            ).hexdigest()[:16]
+            return f"tool:{name}:{digest}"
+
+        async def call_and_store(ctx: RunContextWrapper, key: str, args, kwargs):
+            result = await func(*args, **kwargs)
+            try:
+                stored = json.dumps(result, ensure_ascii=False)
+            except (TypeError, ValueError) as e:
+                logger.warning(f"[tool-cache] not caching {name}: result is not JSON ({e})")
+                return result
+            try:
+                await ctx.context.cache.save_to_cache(
+                    key, stored, ttl=error_ttl if is_error_result(result) else ttl,
+                )
+            except Exception as e:
+                logger.warning(f"[tool-cache] could not store {name}: {e}")
+            return result
+
+        @functools.wraps(func)
+        async def cached(ctx: RunContextWrapper, *args, **kwargs):
+            if not tool_cache_enabled() or (when is not None and not when(ctx)):
+                return await func(ctx, *args, **kwargs)
+            key = cache_key((ctx, *args), kwargs)
+
+            try:
+                stored = await ctx.context.cache.get_from_cache(key)
+            except Exception as e:
+                logger.warning(f"[tool-cache] lookup failed for {name}: {e}")
+                stored = None
+            if stored is not None:
+                _count(name, "hits")
+                logger.info(f"[tool-cache] hit {name}")
+                return json.loads(stored)
+
+            inflight = _INFLIGHT.get(key)
+            if inflight is not None:
+                _count(name, "coalesced")
+                return await asyncio.shield(inflight)
+
+            _count(name, "misses")
+            task = asyncio.ensure_future(call_and_store(ctx, key, (ctx, *args), kwargs))
+            _INFLIGHT[key] = task
+            task.add_done_callback(lambda _: _INFLIGHT.pop(key, None))
+            return await asyncio.shield(task)
+
+        return cached
+    return wrapper
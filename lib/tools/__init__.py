@@ -0,0 +1,24 @@
+"""Agent-facing tools, one module per domain.
+
+Importing the package registers every tool in ``TOOLS_BY_AGENT`` (``lib.agents``
+builds the agents from it). Third-party SDKs that only some tools need —
+googlemaps, tavily, NumPy/Open-Meteo, tinytuya — are imported when such a tool
+first runs, not here, to keep process start-up fast (see scripts/importtime.py).
+"""
+from lib.tools.registry import TOOLS_BY_AGENT, tool_ownership
+from lib.tools.iot import (
+    get_devices_state, get_one_device_status, turn_on_devices, turn_off_devices,
+    change_lighting_mode, change_color, change_light_temperature,
+)
+from lib.tools.maps import get_maps_memory, get_route_details
+from lib.tools.finance import get_exchange_rate, get_exchange_rate_change, get_stock_quotes
+from lib.tools.weather import current_weather, get_current_date_and_time, weather_forecast
+from lib.tools.news import search_news
+from lib.tools.memory import get_memory, save_memory, update_memory, delete_memory
+from lib.tools.fpl import (
+    get_fpl_fixtures, get_pl_teams, get_my_fpl_squad, get_my_fpl_leagues,
+    get_fpl_league_standings, get_fpl_live, who_owns_player_in_league, get_league_ownership,
+)
+from lib.tools.scheduler import (
+    create_scheduled_job, list_scheduled_jobs, delete_scheduled_job, update_scheduled_job,
+)
@@ -0,0 +1,184 @@
+"""Tools of the finance_agent: ECB exchange rates and stock quotes."""
+import logging
+from datetime import date, timedelta
+from typing import Optional
+
+from agents import RunContextWrapper, function_tool
+
+from lib import fx
+from lib.cache import Ctx
+from lib.currencies import currency_code
+from lib.quotes import get_quotes
+from lib.tools.registry import tool_ownership
+
+
+def _resolve_currencies(base_currency: str, foreign_currency: str) -> tuple[str, str, Optional[dict]]:
+    """Map both arguments (ISO codes or common currency names such as "złoty",
+    "dolarów") to ISO 4217 codes; the third item is an error result if one is unknown."""
+    base_code, foreign_code = currency_code(base_currency), currency_code(foreign_currency)
+    if base_code and foreign_code:
+        return base_code, foreign_code, None
+    unknown = base_currency if not base_code else foreign_currency
+    return base_currency, foreign_currency, {
+        "Error" : f"{unknown} is not a valid currency code.",
+        "Tip": "You should rerun this tool with a 3-letter ISO 4217 currency code e.g. us dollar -> USD, euro -> EUR."
+    }
+
+
+def _unpublished_currency(snapshot: dict, *codes: str) -> dict:
+    """Error for the `codes` missing from `snapshot` (the ECB table of one date)."""
+    missing = [code for code in codes if code not in snapshot["rates"]]
+    return {
+        "Error" : f"The ECB reference table of {snapshot['date']} has no rate for {', '.join(missing)}.",
+        "Available currencies" : sorted(snapshot["rates"])
+    }
+
+
+# Both exchange-rate tools compute cross rates from the day's ECB table (lib/fx.py),
+# fetched once per publication, so they are not wrapped in the tool cache.
+@tool_ownership("finance_agent")
+@function_tool
+async def get_exchange_rate(ctx: RunContextWrapper[Ctx],
+                            foreign_currency: str,
+                            base_currency: str = "PLN") -> dict:
+    f"""
+    Description:
+        This tool is used to obtain the current exchange rate between a given foreign and
+        the base currency.
+
+    Parameters:
+    ctx : RunContextWrapper[Ctx]
+        Context in which the tool operates
+
+    foreign_currency: str
+        Currency code of the currency that is to be checked against the base currency.
+        Important: currency code **must** be a 3-letter code that is compatible with 
+        ISO 4217 standard e.g. us dollar -> USD, euro -> EUR etc.
+
+    base_currency: str
+        Currency code of the base currency in the exchange rate. Unless specified clearly
+        in the user's query this should always remain "PLN" by default.
+
+    Output:
+        JSON object with the current exchange rate of the foreign_currency and base currency
+    """
+
+    logging.info(f"Getting exchange data for {base_currency} and {foreign_currency}")
+
+    base_currency, foreign_currency, error = _resolve_currencies(base_currency, foreign_currency)
+    if error:
+        return error
+
+    try:
+        snapshot = await fx.latest_snapshot()
+        exchange_rate = fx.cross_rate(snapshot, base_currency, foreign_currency)
+    except fx.FxError as e:
+        logging.error(f"Could not get ECB rates [base: {base_currency}, to: {foreign_currency}]")
+        return {
+            "message" : "Could not get exchange rates from Frankfurter API",
+            "error" : str(e)
+        }
+    except KeyError:
+        return _unpublished_currency(snapshot, base_currency, foreign_currency)
+
+    return {
+        "message" : f"{base_currency}/{foreign_currency} exchange rate is {exchange_rate}",
+        "date" : snapshot["date"]
+    }
+
+
+@tool_ownership("finance_agent")
+@function_tool
+async def get_exchange_rate_change(ctx: RunContextWrapper[Ctx],
+                                   foreign_currency: str,
+                                   base_currency: str = "PLN",
+                                   days: int = 7) -> dict:
+    """
+    Description:
+        This tool compares the current exchange rate between a given foreign and the base
+        currency with the rate from a number of days ago (e.g. "how did the euro change
+        this week" -> days=7, "this month" -> days=30).
+
+    Parameters:
+    ctx : RunContextWrapper[Ctx]
+        Context in which the tool operates
+
+    foreign_currency: str
+        3-letter ISO 4217 code of the currency checked against the base currency
+        (common names such as "euro" or "dolar" are accepted too).
+
+    base_currency: str
+        3-letter ISO 4217 code of the base currency. Unless specified clearly in the
+        user's query this should always remain "PLN" by default.
+
+    days: int = 7
+        How many days back the compared rate is from (1-3650).
+
+    Output:
+        JSON object with both rates, their ECB dates and the absolute and percentage change
+    """
+    base_currency, foreign_currency, error = _resolve_currencies(base_currency, foreign_currency)
+    if error:
+        return error
+    days = min(max(int(days), 1), 3650)
+
+    logging.info(f"Comparing {base_currency}/{foreign_currency} with {days} days ago")
+    try:
+        current = await fx.latest_snapshot()
+        past = await fx.snapshot_on(date.fromisoformat(current["date"]) - timedelta(days=days))
+    except fx.FxError as e:
+        return {
+            "message" : "Could not get exchange rates from Frankfurter API",
+            "error" : str(e)
+        }
+    # A currency can be in today's table but not in the past one (or vice versa), so
+    # each lookup reports the table it is missing from.
+    try:
+        now_rate = fx.cross_rate(current, base_currency, foreign_currency)
+    except KeyError:
+        return _unpublished_currency(current, base_currency, foreign_currency)
+    try:
+        then_rate = fx.cross_rate(past, base_currency, foreign_currency)
+    except KeyError:
+        return _unpublished_currency(past, base_currency, foreign_currency)
+
+    return {
+        "pair" : f"{base_currency}/{foreign_currency}",
+        "current" : {"date": current["date"], "rate": now_rate},
+        "previous" : {"date": past["date"], "rate": then_rate},
+        "change" : now_rate - then_rate,
+        "change_percent" : round((now_rate / then_rate - 1) * 100, 3)
+    }
+
+# Quotes are cached per symbol with a market-hours TTL inside lib/quotes.py.
+@tool_ownership("finance_agent")
+@function_tool
+async def get_stock_quotes(ctx: RunContextWrapper[Ctx], symbols: list[str]) -> dict:
+    """
+    Description:
+        This tool returns the latest market quotes (current price, change vs previous
+        close, day low/high and volume) for one or more stocks, ETFs or indices, using
+        the free Yahoo Finance data source. It covers the Polish stock market (GPW) as
+        well as global markets. Ask for all instruments of a question in ONE call.
+
+    Parameters:
+    ctx : RunContextWrapper[Ctx]
+        Context in which the tool operates
+
+    symbols: list[str]
+        The Yahoo Finance tickers of the instruments (at most 10).
+        - Polish (GPW) stocks: the ticker with a '.WA' suffix, e.g. 'PKO.WA',
+          'KGH.WA', 'CDR.WA', 'PKN.WA'.
+        - Non-Polish stocks: the plain ticker, e.g. 'AAPL', 'MSFT'.
+        - Indices: prefix with '^', e.g. '^GSPC' (S&P 500), '^WIG20' (WIG20).
+        Symbols are case-insensitive.
+
+    Output:
+        JSON table: "columns" names the fields of each entry in "rows" (one row per
+        symbol). Symbols that could not be quoted are listed under "errors".
+    """
+    logging.info(f"Getting stock quotes for {symbols}")
+    result = await get_quotes(ctx.context.cache, symbols)
+    if result.get("errors"):
+        result["tip"] = "For GPW stocks add the '.WA' suffix (e.g. 'PKO.WA'). For indices prefix with '^' (e.g. '^WIG20')."
+    return result
@@ -0,0 +1,152 @@
+"""Tools of the maps_agent: known places and Google Directions routes."""
+import logging
+from datetime import datetime
+from typing import Literal, Optional, Union
+
+from agents import RunContextWrapper, function_tool
+
+from lib.cache import Ctx
+from lib.maps_memory import AliasIndex, maps_memory
+from lib.tools.registry import tool_ownership
+from lib.tools_utils import get_directions, normalize_departure_time
+
+
+# The model works with place ALIASES only (Home, work, University, ...). The mapping
+# of an alias to its real street address is resolved on the server side inside
+# get_route_details, so the user's actual home/work addresses are never handed to the
+# LLM as a browsable address book.
+
+async def _alias_index(ctx: RunContextWrapper[Ctx]) -> AliasIndex:
+    """The process-wide alias index (lib/maps_memory.py), unless the run context
+    carries its own maps memory document."""
+    data = getattr(ctx.context, "known_adresses", None)
+    if data:
+        return AliasIndex(data)
+    return await maps_memory.index()
+
+
+async def _known_entries(ctx: RunContextWrapper[Ctx]) -> list:
+    return (await _alias_index(ctx)).entries
+
+
+async def _resolve_place(ctx: RunContextWrapper[Ctx], name: str):
+    """Map a place name to (real_address, matched_alias). A known alias resolves to
+    its stored address (server-side); an unknown name passes through unchanged."""
+    return (await _alias_index(ctx)).resolve(name)
+
+
+@tool_ownership("maps_agent")
+@function_tool
+async def get_maps_memory(ctx: RunContextWrapper[Ctx]) -> dict:
+    """
+    Description:
+    This tool lists the user's known/favourite places by their ALIAS (e.g. 'Home',
+    'work', 'University'). Use these aliases as origin/destination in get_route_details
+    — the real street address behind an alias is resolved automatically and is not
+    needed (and not shown) here.
+    """
+    logging.info("Listing known place aliases")
+    return {
+        "known_place_aliases": list((await _alias_index(ctx)).aliases),
+        "note": "Refer to these places by alias; their actual addresses are resolved automatically.",
+    }
+
+@tool_ownership("maps_agent")
+@function_tool
+async def get_route_details(ctx: RunContextWrapper[Ctx],
+                            origin: str,
+                            destination: str,
+                            transport_mode: Literal["driving", "walking", "bicycling", "transit"] = "transit",
+                            transit_mode: Optional[Literal["bus", "subway", "tram", None]] = None,
+                            departure_time: Optional[Union[str, datetime]] = "now",
+                            #arrival_time: Optional[str] = None,
+                            show_alternatives: Optional[bool] = True
+                            ) -> dict:
+    """
+    Description:
+    This tool is used to calculate the route between origin and destination based on the user's preferred
+    mode of transport (such as car, transit, etc.) and return the most optimal route to the user.
+    Unless specified otherwise one should always assume that both origin and destination are in Warsaw, Poland.
+
+    Parameters:
+    ctx : RunContextWrapper[Ctx]
+        Context in which the tool operates
+    
+    origin: str
+        The starting point of the journey. This can be an alias of a known place
+        (from get_maps_memory, e.g. 'Home'), a specific bus/metro/train stop, or a
+        landmark. Known aliases are resolved to their real address automatically.
+
+    destination: str
+        The end of the journey. This can be an alias of a known place (from
+        get_maps_memory, e.g. 'work'), a specific bus/metro/train stop, or a landmark.
+        Known aliases are resolved to their real address automatically.
+
+    transport_mode: Literal["driving", "walking", "bicycling", "transit"] = 'transit'
+        User's preffered mode of communication such as 'car', 'transit' etc.
+        Note: should remain with defalut value 'transit' unless user specifies otherwise
+
+    transit_mode: Optional[Literal["bus", "subway", "tram", None]] = None
+        Limits the public transit options to only one specified mode. When left with default value of None
+        the route may consist of any combination of public transport modes such as buses, trams, subways etc.
+        If a given mode is specified the route will be limited to only one mode of public transport.
+        Note: this parameter can only be provided if transport_mode = 'transit'. Otherwise it should remain None
+
+    departure_time: Optional[Union[str, datetime]] = "now"
+        Time at which user wishes to leave. By default is set to 'now'.
+
+    show_alternatives: Optional[bool] = True
+        This parameter controls whether the navigation API returns only one most optimal route
+        or multiple options.
+        When True only one route is returned, otherwise multiple options
+        Note: it sholud remain True unless user specifies otherwise
+
+    Output:
+        This function returns a json file with all of the steps of the most optimal route from origin to destination
+        along with all transfers if necessary. Should an error occurr this function will return a json with the
+        proper error message.
+    
+    Note:
+        The user is a fast-walker therefore you should assume that all distances that require traveling on foot will
+        be covered in 1.25x faster than the navigation data suggests.
+    """
+
+    if transport_mode != "transit" and transit_mode is not None:
+        transit_mode = None
+
+    # Resolve known-place aliases to real addresses server-side; keep the alias so we
+    # can relabel the endpoints in the response and avoid returning the address.
+    origin_address, origin_alias = await _resolve_place(ctx, origin)
+    destination_address, destination_alias = await _resolve_place(ctx, destination)
+
+    # Google accepts only "now" or an int Unix timestamp here; a raw model-supplied
+    # time string (ISO, "8:00", …) otherwise 400s. Normalize before the call.
+    departure_time = normalize_departure_time(departure_time)
+
+    logging.info("Starting route planning")
+
+    try:
+        result = await get_directions(
+            ctx.context.cache,
+            origin=origin_address,
+            destination=destination_address,
+            mode=transport_mode,
+            transit_mode=transit_mode,
+            departure_time=departure_time,
+            alternatives=show_alternatives
+        )
+    except Exception as e:
+        logging.error("Error while getting routes from Google", exc_info=True)
+        return {
+            "Message" : "Error while getting routes from Google",
+            "Error": str(e)
+        }
+
+    # Relabel endpoints back to the alias so the user's real addresses are not exposed.
+    for leg in result:
+        if origin_alias:
+            leg["start_address"] = origin_alias
+        if destination_alias:
+            leg["end_address"] = destination_alias
+
+    return result
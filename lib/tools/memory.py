@@ -0,0 +1,162 @@
+"""Tools of the memory_operator agent: the user's long-term memory."""
+import logging
+from typing import Literal, Optional
+
+from agents import RunContextWrapper, function_tool
+
+from lib.cache import Ctx
+from lib.final_reply import mark_final
+from lib.memory import memory
+from lib.tools.registry import tool_ownership
+
+
+@tool_ownership("memory_operator")
+@function_tool
+async def get_memory(ctx: RunContextWrapper[Ctx], category: Optional[str] = None,
+                     query: Optional[str] = None, limit: int = 10) -> dict:
+    """
+    Description:
+        Retrieve the user's stored long-term memory (durable preferences, facts,
+        habits, interests, routines). Use this to personalize answers and to avoid
+        re-asking things the user already told you. Prefer passing a query: it
+        returns only the entries relevant to it, best first.
+
+    Parameters:
+    ctx : RunContextWrapper[Ctx]
+        Context in which the tool operates
+
+    category: Optional[str]
+        If given, return only entries in this category (e.g. 'preferences',
+        'facts', 'habits', 'interests', 'routines'). If omitted, return everything.
+
+    query: Optional[str]
+        Words describing what you are looking for (e.g. 'coffee', 'trasa do pracy').
+        Entries are ranked by relevance and each carries a 'score'; entries that do
+        not match are left out.
+
+    limit: int = 10
+        With a query, the maximum number of entries returned.
+
+    Output:
+        JSON object with the matching memory entries and their count.
+    """
+    logging.info(f"Reading long-term memory (category={category or 'all'}, query={query!r})")
+    if query and query.strip():
+        entries = await memory.search(query, limit=max(1, limit), category=category)
+    else:
+        entries = await memory.by_category(category) if category else await memory.all()
+    return {"entries": entries, "count": len(entries)}
+
+@tool_ownership("memory_operator")
+@function_tool
+async def save_memory(ctx: RunContextWrapper[Ctx],
+                      text: str,
+                      category: str = "preferences",
+                      source: Literal["user", "inferred"] = "user",
+                      confidence: Literal["high", "medium", "low"] = "high",
+                      allow_similar: bool = False) -> dict:
+    """
+    Description:
+        Store a new durable memory about the user. Use it when the user states a
+        lasting preference or fact, or when you reliably infer one. Write a concise,
+        self-contained statement in natural language. Do NOT store transient or
+        one-off details.
+
+    Parameters:
+    ctx : RunContextWrapper[Ctx]
+        Context in which the tool operates
+
+    text: str
+        The memory to store, as a single self-contained natural-language sentence.
+
+    category: str = "preferences"
+        Grouping label. Suggested: 'preferences', 'facts', 'habits', 'interests',
+        'routines'.
+
+    source: Literal["user", "inferred"] = "user"
+        'user' when the user stated it explicitly; 'inferred' when you concluded it.
+
+    confidence: Literal["high", "medium", "low"] = "high"
+        How sure you are of this memory.
+
+    allow_similar: bool = False
+        Save even if a very similar entry already exists. Set it only after a
+        'possible_duplicate' answer, when the new text is a genuinely different fact.
+
+    Output:
+        JSON object with the saved entry (including its generated id), or — when a
+        very similar entry already exists — that entry under 'possible_duplicate' and
+        nothing saved: use update_memory on it if the new text revises it, or call
+        save_memory again with allow_similar=true if it is a different fact.
+    """
+    logging.info(f"Saving long-term memory (category={category}, source={source})")
+    try:
+        entry = await memory.add(text, category=category, source=source, confidence=confidence,
+                                 allow_similar=allow_similar)
+    except ValueError as e:
+        return {"Error": str(e)}
+    if "possible_duplicate" in entry:
+        return {
+            "possible_duplicate": entry["possible_duplicate"],
+            "note": "Not saved: a very similar memory exists. Update it with update_memory if the "
+                    "new text revises it, or save again with allow_similar=true if it is a different fact.",
+        }
+    return mark_final({"saved": entry}, "memory_saved")
+
+@tool_ownership("memory_operator")
+@function_tool
+async def update_memory(ctx: RunContextWrapper[Ctx],
+                        entry_id: str,
+                        text: Optional[str] = None,
+                        category: Optional[str] = None,
+                        confidence: Optional[Literal["high", "medium", "low"]] = None) -> dict:
+    """
+    Description:
+        Correct or refine an existing memory entry, identified by its id (from
+        get_memory). Only the provided fields are changed.
+
+    Parameters:
+    ctx : RunContextWrapper[Ctx]
+        Context in which the tool operates
+
+    entry_id: str
+        The id of the entry to update (e.g. 'mem_1a2b3c4d').
+
+    text: Optional[str]
+        New text, if changing it.
+
+    category: Optional[str]
+        New category, if changing it.
+
+    confidence: Optional[Literal["high", "medium", "low"]]
+        New confidence, if changing it.
+
+    Output:
+        JSON object with the updated entry, or an error if the id was not found.
+    """
+    logging.info(f"Updating long-term memory {entry_id}")
+    entry = await memory.update(entry_id, text=text, category=category, confidence=confidence)
+    return {"updated": entry} if entry else {"Error": f"No memory entry with id '{entry_id}'"}
+
+@tool_ownership("memory_operator")
+@function_tool
+async def delete_memory(ctx: RunContextWrapper[Ctx], entry_id: str) -> dict:
+    """
+    Description:
+        Permanently remove a memory entry by its id (from get_memory). Use when a
+        memory is wrong or no longer relevant.
+
+    Parameters:
+    ctx : RunContextWrapper[Ctx]
+        Context in which the tool operates
+
+    entry_id: str
+        The id of the entry to delete (e.g. 'mem_1a2b3c4d').
+
+    Output:
+        JSON object confirming deletion, or an error if the id was not found.
+    """
+    logging.info(f"Deleting long-term memory {entry_id}")
+    if not await memory.delete(entry_id):
+        return {"Error": f"No memory entry with id '{entry_id}'"}
+    return mark_final({"deleted": entry_id}, "memory_deleted")
@@ -0,0 +1,48 @@
+"""Tools of the news_agent: Tavily news search."""
+import logging
+from typing import Literal
+
+from agents import RunContextWrapper, function_tool
+
+from lib.cache import Ctx
+from lib.tool_cache import cached_tool, normalize_text
+from lib.tools.registry import tool_ownership
+from lib.tools_utils import tavily_news_search
+
+
+@tool_ownership("news_agent")
+@function_tool
+@cached_tool(ttl=900, normalize={"query": lambda q: " ".join(normalize_text(q).split())})
+async def search_news(ctx: RunContextWrapper[Ctx],
+                               query: str,
+                               topic: Literal["news", "finance"],
+                               search_depth: Literal["basic", "advanced"] = "advanced"
+                               ) -> dict:
+    """
+    Description:
+        This tool is used to crawl through varius reputable news sources in search for current and historical events to
+        find an answer to the user's query.
+    
+    Parameters:
+    ctx : RunContextWrapper[Ctx]
+        Context in which the tool operates
+
+    query: str
+        Defines the matter or event that interests the user. Should be structured in natural language
+        and reflect exactly what the user wants to know.
+        For better search results this parameter
+        **must** be written entirely in english as it's the most optimal language for the search engine
+
+    topic: Literal["news", "finance"]
+        Controls what is the general topic of the user's query. All political, sports, history-related etc. queries should be designated as 'news'
+        wheras all stock market, commodities, currencies, cryptocurrencies related queries etc. should be treated as 'finance'
+
+    search_depth: Literal["basic", "advanced"] = "advanced"
+        The level of detail that should be extracted by the search engine.
+        Value 'basic' should be used when user requests a quick and short summary - should only
+        be used when user clearly asks for a short anwser.
+        Value 'advanced' is the default value which provides more details.
+    """
+    logging.info(f"Starting news search with query {query} at {search_depth} depth")
+    # Both searches (general + reputable source) run concurrently, URLs de-duplicated.
+    return await tavily_news_search(query, topic, search_depth)
@@ -0,0 +1,15 @@
+"""Which agent owns which tool. Each domain module registers its tools here with
+``@tool_ownership("<agent name>")``; ``lib.agents`` builds every agent from
+``TOOLS_BY_AGENT``."""
+
+TOOLS_BY_AGENT: dict[str: list[str]] = {}
+
+
+def tool_ownership(agent_name: str):
+    def wrapper(function_tool):
+        if agent_name in TOOLS_BY_AGENT:
+            TOOLS_BY_AGENT[agent_name].append(function_tool)
+        else:
+            TOOLS_BY_AGENT[agent_name] = [function_tool]
+        return function_tool
+    return wrapper
@@ -0,0 +1,196 @@
+"""Tools of the weather_agent: current conditions (OpenWeather) and forecasts
+(Open-Meteo), both over the shared ``lib.http_client``. The NumPy-based forecast
+code loads on first use."""
+import logging
+import os
+from datetime import datetime, timezone
+from typing import Literal, Optional
+
+import httpx
+from agents import RunContextWrapper, function_tool
+
+from lib import http_client
+from lib.cache import Ctx
+from lib.geocode import geocode
+from lib.tool_cache import cached_tool
+from lib.tools.registry import tool_ownership
+
+logger = logging.getLogger(__name__)
+
+OPENWEATHER_URL = "https://api.openweathermap.org/data/2.5/weather"
+
+
+@tool_ownership("weather_agent")
+@function_tool
+@cached_tool(ttl=600)
+async def current_weather(ctx: RunContextWrapper[Ctx], city: str = "Warsaw") -> dict:
+    """
+    Description:
+        This tool is used to get the current weather conditions in a specified city.
+
+    Parameters:
+    ctx : RunContextWrapper[Ctx]
+        Context in which the tool operates
+
+    city: str = "Warsaw"
+        Name of the city where the weather conditions are to be checked.
+        Unless specified otherwise by the user the default city is Warsaw.
+        Return the city name in nominative form (base form) — do not inflect or decline it.
+
+    Output:
+        JSON object with current weather conditions in a specified place.
+    """
+
+    logging.info(f"Getting weather at {city}")
+
+    try:
+        response = await http_client.get(OPENWEATHER_URL, params={
+            "q": city, "appid": os.getenv("OPENWEATHER_API_KEY", ""), "units": "metric",
+        })
+    except httpx.HTTPError as e:
+        logging.error(f"Couldnt get weather at {city}")
+        return {"message": f"Couldnt get weather at {city}", "error": str(e)}
+    if response.status_code != 200:
+        logging.error(f"Couldnt get weather at {city}: {response.status_code} {response.text[:200]}")
+        return {"message": f"Couldnt get weather at {city}",
+                "error": f"OpenWeather returned {response.status_code}: {response.text[:200]}"}
+
+    return _observation_summary(response.json())
+
+
+def _iso_utc(timestamp: Optional[int]) -> Optional[str]:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat() if timestamp else None
+
+
+def _observation_summary(data: dict) -> dict:
+    """Plain view of an OpenWeather current-weather response (requested in metric
+    units): temperatures in °C, wind in m/s, rain and snow in mm per 1h/3h, times in
+    ISO 8601 UTC."""
+    main, sys = data.get("main", {}), data.get("sys", {})
+    conditions = data.get("weather") or [{}]
+    name, country = data.get("name"), sys.get("country")
+    return {
+        "place": f"{name}, {country}" if country else name,
+        "time": _iso_utc(data.get("dt")),
+        "status": conditions[0].get("description"),
+        "temperature_c": main.get("temp"),
+        "feels_like_c": main.get("feels_like"),
+        "humidity_pct": main.get("humidity"),
+        "pressure_hpa": main.get("pressure"),
+        "wind": data.get("wind"),
+        "clouds_pct": data.get("clouds", {}).get("all"),
+        "rain": data.get("rain") or None,
+        "snow": data.get("snow") or None,
+        "sunrise": _iso_utc(sys.get("sunrise")),
+        "sunset": _iso_utc(sys.get("sunset")),
+    }
+
+@tool_ownership("weather_agent")
+@function_tool
+async def get_current_date_and_time(ctx: RunContextWrapper[Ctx]) -> dict:
+    """
+    Description:
+        This tool is used to obtain today's date and current time. It is neccessary
+        to use it before getting the weather forecasts otherwise agent will not be
+        able to process user's request properly when it comes to dates and time.
+
+    Output:
+        JSON object with the current local date, time, weekday and ISO 8601 timestamp.
+    """
+    now = datetime.now()
+    logger.info("Providing current date and time")
+    now_params = {
+        "date": now.strftime("%Y-%m-%d"),
+        "time": now.strftime("%H:%M:%S"),
+        "weekday": now.strftime("%A"),
+        "iso": now.isoformat(),
+    }
+    # Stored on the context so weather_forecast can enforce that this ran first.
+    ctx.context.time_date_now = now_params
+    return now_params
+
+# Not cached until the turn knows the date: the "run get_current_date_and_time first"
+# reply depends on the turn, not on the arguments.
+@tool_ownership("weather_agent")
+@function_tool
+@cached_tool(ttl=1800, when=lambda ctx: bool(ctx.context.time_date_now))
+async def weather_forecast(ctx: RunContextWrapper[Ctx],
+                           forecast_days: Literal["1", "3", "7"],
+                           forecast_type: Literal["hourly", "daily"],
+                           city: str = "Warsaw",
+                           detail: Literal["brief", "normal", "full"] = "normal"
+                           ) -> dict:
+    """
+    Important: 
+
+    Description:
+        This tool is used to check a current weather forecast in a given location.
+        It can be either a short-term (min 3 hours) or a long-term (max 5 days) forecast
+        with different granularity (3h or daily intervals).
+
+    Parameters:
+    ctx : RunContextWrapper[Ctx]
+        Context in which the tool operates
+ 
+    forecast_days: Literal["1", "3", "7"]
+        How long into the future should the forecast reach measured in days.
+
+    forecast_type: Literal["hourly", "daily"]
+        Time intervals in which the forecast will be divided. When asking for a short-term forecast
+        more granular data obtained with 'hourly' may be more optimal wheras for long-term forecast
+        it usually is better to provide 'daily' intervals.
+
+    city: str = "Warsaw"
+        Name of the city where the weather conditions are to be checked.
+        Unless specified otherwise by the user the default city is Warsaw. The city name should be in polish.
+        Return the city name in nominative form (base form) — do not inflect or decline it.
+
+    detail: Literal["brief", "normal", "full"] = "normal"
+        How much of the forecast to return. "brief" - one row per day; "normal" - one row per
+        part of day (night/morning/afternoon/evening) with rain windows; "full" - every hour.
+        Use "full" only when the user asks about specific hours.
+
+    Output:
+        JSON object with the weather forecast made according to specifications.
+        Forecast tables are columnar: "columns" names the fields of each entry in "rows".
+    """
+    if not ctx.context.time_date_now:
+        return {
+            "Message": "You don't know the current date, weekday and time - the forecast could be inaccurate.",
+            "Tip": "Run the get_current_date_and_time tool first, then call this tool again.",
+        }
+
+    multiple_results = False
+    try:
+        output = await geocode(city)
+        logging.info("Geolocation obtained")
+    except httpx.HTTPError as e:
+        logging.error(f"Couldnt geolocate {city} - issue with API")
+        return {"message" : f"Couldnt geolocate this location {city}",
+                "status_code" : str(e)}
+
+    if len(output) > 1:
+        logging.info("Found more than one geolocation")
+        multiple_results = True
+        if len(output) > 3:
+            logging.info("Found more than three geolocations")
+            output = output[:3]
+
+    logging.info(f"Getting {forecast_type} in {forecast_days} intervals")
+    from lib.forecast import compact_forecast, get_forecasts  # deferred: NumPy / Open-Meteo SDK
+
+    forecasts = await get_forecasts(output, forecast_days, forecast_type)
+    forecasts = [compact_forecast(f, forecast_type, detail) for f in forecasts]
+
+    result = {
+        "Message" : f"Successfully obtained weather forecasts for {city}",
+        "Forecast" : forecasts
+    }
+
+    if multiple_results:
+        location_names = ",".join([l["name"] for l in output])
+        result["Note"] = f"Multiple geolocations have been found for {city}.\
+            If they are not actually the same city listed out multiple times inform the user about this.\
+                Location names: {location_names}"
+
+    return result
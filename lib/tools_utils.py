@@ -1,16 +1,19 @@
 import json
 import asyncio
+import hashlib
 import os
 import time
-import openmeteo_requests
-import requests
-import requests_cache
-from retry_requests import retry
-from typing import Literal, Optional, Union
-from datetime import timedelta, datetime
+from typing import TYPE_CHECKING, Literal, Optional, Union
+from datetime import datetime
 from zoneinfo import ZoneInfo
 import logging
-import pycountry
+from urllib.parse import urlsplit
+from lib import http_client
+from lib.currencies import is_currency_code
+
+if TYPE_CHECKING:
+    import googlemaps
+    from tavily import AsyncTavilyClient
 
 logger = logging.getLogger(__name__)
 
@@ -114,70 +117,201 @@ async def simplify_directions_response(data):
 
     return routes_summary
 
-async def get_forecast(params: dict,
-                       forecast_days: Literal["1", "3", "7"],
-                       forecast_type: Literal["hourly", "daily"]
-                       ) -> dict:
-    
-    cache_session = requests_cache.CachedSession('.cache', expire_after = 3600)
-    retry_session = retry(cache_session, retries = 5, backoff_factor = 0.2)
-    openmeteo = openmeteo_requests.Client(session = retry_session)
-
-    forecast_url = "https://api.open-meteo.com/v1/forecast"
-
-    if forecast_type == "daily":
-        type_params = ["temperature_2m_max", "temperature_2m_min", "weather_code", "sunrise", "sunset", "uv_index_max", "rain_sum", "snowfall_sum"]
-    else:
-        type_params = ["temperature_2m", "apparent_temperature", "weather_code", "precipitation"]
-
-    request_params = {
-        "latitude": params["lat"],
-        "longitude": params["long"],
-        forecast_type: type_params,
-        "forecast_days": forecast_days
-    }
+# ------- routes (Google Directions) -------
+#
+# One googlemaps.Client per process (its requests session keeps connections alive);
+# its blocking directions() call runs in a worker thread so the event loop keeps
+# serving other conversations. Simplified routes are cached in Ctx.cache under
+# route:<hash of (resolved origin, resolved destination, mode, transit mode,
+# alternatives, departure bucket)>, where the departure time ("now" or a timestamp)
+# is floored to ROUTE_CACHE_BUCKET_MINUTES (default 10). Repeat questions about the
+# same trip (the owner's daily commute) within a bucket reuse the answer. Addresses
+# only ever appear hashed in the key. Disable with ROUTE_CACHE_ENABLED=false.
+
+_GMAPS: dict = {"client": None}
+_ROUTE_STATS = {"hits": 0, "misses": 0}
+
+
+def shared_gmaps_client() -> "googlemaps.Client":
+    if _GMAPS["client"] is None:
+        import googlemaps  # deferred: only route questions need it
+        _GMAPS["client"] = googlemaps.Client(os.getenv("GOOGLE_MAPS_API_KEY"))
+    return _GMAPS["client"]
+
+
+def close_gmaps_client() -> None:
+    client = _GMAPS["client"]
+    _GMAPS["client"] = None
+    if client is not None:
+        client.session.close()
 
+
+def _route_cache_enabled() -> bool:
+    raw = os.getenv("ROUTE_CACHE_ENABLED")
+    if raw is None or raw.strip() == "":
+        return True
+    return raw.strip().lower() not in ("0", "false", "no", "off")
+
+
+def route_bucket_seconds() -> int:
+    raw = os.getenv("ROUTE_CACHE_BUCKET_MINUTES", "")
     try:
-        response = openmeteo.weather_api(url=forecast_url, params=request_params)
-        response = response[0]
-    except Exception as e:
-        logging.error("Error while getting the forecast")
-        return []
+        minutes = int(raw) if raw.strip() else 10
+    except ValueError:
+        minutes = 10
+    return max(1, minutes) * 60
+
+
+def route_cache_key(origin: str, destination: str, mode: str, transit_mode: Optional[str],
+                    departure_time: Union[str, int], alternatives: bool,
+                    now: Optional[float] = None) -> str:
+    """Cache key for a directions request; `departure_time` is "now" or a Unix timestamp
+    (see `normalize_departure_time`) and is floored to the bucket."""
+    bucket = route_bucket_seconds()
+    when = time.time() if now is None else now
+    departure = when if departure_time == "now" else int(departure_time)
+    parts = [
+        " ".join(origin.casefold().split()), " ".join(destination.casefold().split()),
+        mode, transit_mode or "", str(bool(alternatives)), str(int(departure // bucket)),
+    ]
+    digest = hashlib.sha1("\x1f".join(parts).encode()).hexdigest()[:16]
+    return f"route:{digest}"
+
+
+def route_cache_stats() -> dict:
+    """Route cache hits, misses and hit rate since process start."""
+    lookups = _ROUTE_STATS["hits"] + _ROUTE_STATS["misses"]
+    return {**_ROUTE_STATS, "hit_rate": round(_ROUTE_STATS["hits"] / lookups, 3) if lookups else 0.0}
+
+
+async def get_directions(cache, origin: str, destination: str, mode: str,
+                         transit_mode: Optional[str], departure_time: Union[str, int],
+                         alternatives: bool) -> list:
+    """Simplified routes (see `simplify_directions_response`) for resolved addresses,
+    served from the route cache when the same trip was asked in this departure bucket.
+    Google errors propagate and are not cached."""
+    key = None
+    if _route_cache_enabled():
+        key = route_cache_key(origin, destination, mode, transit_mode, departure_time, alternatives)
+        try:
+            stored = await cache.get_from_cache(key)
+        except Exception as e:
+            logger.warning("Route cache lookup failed: %s", e)
+            stored = None
+        if stored is not None:
+            _ROUTE_STATS["hits"] += 1
+            logger.info("[route-cache] hit (hit rate %.0f%%)", 100 * route_cache_stats()["hit_rate"])
+            return json.loads(stored)
+        _ROUTE_STATS["misses"] += 1
+
+    directions = await asyncio.to_thread(
+        shared_gmaps_client().directions,
+        origin=origin,
+        destination=destination,
+        mode=mode,
+        transit_mode=transit_mode,
+        departure_time=departure_time,
+        alternatives=alternatives,
+    )
+    result = await simplify_directions_response(directions)
+
+    if key is not None:
+        try:
+            await cache.save_to_cache(key, json.dumps(result, ensure_ascii=False), ttl=route_bucket_seconds())
+        except Exception as e:
+            logger.warning("Could not store route: %s", e)
+    return result
 
-    data = response.Daily() if forecast_type == "daily" else response.Hourly()
-
-    result = {}
-    for i, variable in enumerate(type_params):
-        value = data.Variables(i).ValuesAsNumpy()
-        if hasattr(value, "tolist"):
-            result[variable] = value.tolist()
-        else:
-            result[variable] = [value] 
-
-    start_time = datetime.fromtimestamp(data.Time())
-    end_time = datetime.fromtimestamp(data.TimeEnd())
-    interval = timedelta(seconds=data.Interval())
-
-    timestamps = []
-    current = start_time
-    while current < end_time:
-        timestamps.append(current.isoformat())
-        current += interval
-
-    result["time"] = timestamps
-
-    result["meta"] = {
-        "lat": response.Latitude(),
-        "long": response.Longitude(),
-        "elevation": response.Elevation(),
-        "utc_offset": response.UtcOffsetSeconds()
-    }
 
-    logging.info("Forecasts obtained successfully")
+# ------- news search (Tavily) -------
+#
+# Each news question runs two Tavily searches: a general one and one restricted to a
+# reputable source (reuters.com for news, bloomberg.com for finance). They run
+# concurrently on one long-lived AsyncTavilyClient (its own keep-alive pool; it sets
+# Tavily auth headers on its client, so it does not share lib.http_client's), and the
+# general results drop any article the reputable search already returned.
+
+_TAVILY: dict = {"client": None}
+
+
+def shared_tavily_client() -> "AsyncTavilyClient":
+    if _TAVILY["client"] is None:
+        from tavily import AsyncTavilyClient  # deferred: only news questions need it
+        _TAVILY["client"] = AsyncTavilyClient(api_key=os.getenv("TAVILY_API_KEY"))
+    return _TAVILY["client"]
+
+
+async def close_tavily_client() -> None:
+    client = _TAVILY["client"]
+    _TAVILY["client"] = None
+    if client is not None:
+        await client.close()
+
 
+def normalize_url(url: str) -> str:
+    """Canonical form of an article URL for de-duplication (scheme, 'www.', fragment
+    and trailing slash ignored; host case-folded)."""
+    parts = urlsplit((url or "").strip())
+    host = parts.netloc.lower().removeprefix("www.")
+    return f"{host}{parts.path.rstrip('/')}" + (f"?{parts.query}" if parts.query else "")
+
+
+def dedupe_results(response: dict, seen: set[str]) -> dict:
+    """Copy of a Tavily response without results whose URL is already in `seen`
+    (which is updated with the URLs kept)."""
+    kept = []
+    for item in response.get("results") or []:
+        key = normalize_url(item.get("url", ""))
+        if key and key in seen:
+            continue
+        seen.add(key)
+        kept.append(item)
+    return {**response, "results": kept}
+
+
+async def tavily_news_search(query: str,
+                             topic: Literal["news", "finance"],
+                             search_depth: Literal["basic", "advanced"]) -> dict:
+    """Run the general and the reputable-source search concurrently and merge them.
+    One failing search still returns the other, flagged with a top-level
+    "partial_error" (so the tool cache keeps it only for its error TTL); if both
+    fail, an error dict."""
+    client = shared_tavily_client()
+    general, reputable = await asyncio.gather(
+        client.search(query=query, include_answer="advanced", search_depth=search_depth, topic=topic),
+        client.search(
+            query=query,
+            include_answer="advanced",
+            search_depth=search_depth,
+            topic="news",
+            include_domains=["reuters.com"] if topic == "news" else ["bloomberg.com"],
+        ),
+        return_exceptions=True,
+    )
+    if isinstance(general, BaseException) and isinstance(reputable, BaseException):
+        logger.error("Both news searches failed (%s; %s)", general, reputable)
+        return {"Message": "News search failed", "Error": str(general)}
+
+    seen: set[str] = set()
+
+    def merged(response, label: str) -> dict:
+        if isinstance(response, BaseException):
+            logger.warning("%s news search failed: %s", label, response)
+            return {"Error": str(response)}
+        return dedupe_results(response, seen)
+
+    # The reputable source wins duplicates, so it is de-duplicated first.
+    reputable_out = merged(reputable, "Reputable-source")
+    result = {"general_search": merged(general, "General"), "reputable source": reputable_out}
+    failed = [label for label, r in (("general_search", general), ("reputable source", reputable))
+              if isinstance(r, BaseException)]
+    if failed:
+        result["partial_error"] = f"{failed[0]} failed; results are incomplete"
     return result
+
+
 def validate_currency_code(code: str) -> bool:
-    return pycountry.currencies.get(alpha_3 = code) is not None
+    return is_currency_code(code)
 
 
 # ------- Fantasy Premier League (unofficial API) helpers -------
@@ -214,19 +348,15 @@ def _fpl_db_ttl() -> int:
 
 async def fetch_fpl(path: str) -> Union[dict, list]:
     """GET a JSON document from the FPL API. `path` is relative to FPL_BASE
-    (e.g. 'fixtures/?event=2'). Runs the blocking request off the event loop so
+    (e.g. 'fixtures/?event=2'). Goes through the shared async HTTP client, so
     concurrent FPL tool calls don't serialize. Raises on HTTP errors."""
     url = f"{FPL_BASE}/{path.lstrip('/')}"
-
-    def _do():
-        resp = requests.get(url, headers=FPL_HEADERS, timeout=15)
-        resp.raise_for_status()
-        return resp.json()
-
-    return await asyncio.to_thread(_do)
+    resp = await http_client.get(url, headers=FPL_HEADERS, timeout=15)
+    resp.raise_for_status()
+    return resp.json()
 
 
-def _load_bootstrap_from_db(max_age: int) -> Optional[dict]:
+async def _load_bootstrap_from_db(max_age: int) -> Optional[dict]:
     """Read a fresh-enough bootstrap snapshot from Postgres, or None. Best-effort:
     any error (no DB configured, connection/schema issue) falls back to the API."""
     try:
@@ -234,20 +364,20 @@ def _load_bootstrap_from_db(max_age: int) -> Optional[dict]:
         if not dbconn.is_configured():
             return None
         from app.db.fpl_repo import get_cached_bootstrap
-        return get_cached_bootstrap(max_age)
+        return await get_cached_bootstrap(max_age)
     except Exception as e:  # pragma: no cover - defensive; DB is optional
         logger.warning("FPL bootstrap DB cache read failed (%s); using API", e)
         return None
 
 
-def _save_bootstrap_to_db(data: dict) -> None:
+async def _save_bootstrap_to_db(data: dict) -> None:
     """Write the fresh bootstrap snapshot to Postgres. Best-effort (optional DB)."""
     try:
         from app.db import connection as dbconn
         if not dbconn.is_configured():
             return
         from app.db.fpl_repo import save_bootstrap
-        save_bootstrap(data)
+        await save_bootstrap(data)
     except Exception as e:  # pragma: no cover - defensive; DB is optional
         logger.warning("FPL bootstrap DB cache write failed (%s)", e)
 
@@ -264,14 +394,14 @@ async def fetch_fpl_bootstrap(force: bool = False) -> dict:
         return cache["data"]
 
     if not force:
-        cached = await asyncio.to_thread(_load_bootstrap_from_db, _fpl_db_ttl())
+        cached = await _load_bootstrap_from_db(_fpl_db_ttl())
         if cached is not None:
             cache["data"], cache["fetched_at"] = cached, now
             return cached
 
     data = await fetch_fpl("bootstrap-static/")
     cache["data"], cache["fetched_at"] = data, now
-    await asyncio.to_thread(_save_bootstrap_to_db, data)
+    await _save_bootstrap_to_db(data)
     return data
 
 
@@ -18,9 +18,11 @@ import threading
 import time
 import logging
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import tinytuya
 
-import tinytuya
 
 logger = logging.getLogger(__name__)
 
@@ -107,6 +109,8 @@ class TuyaConnectionManager:
             return conn
 
     def _build_bulb(self, dev_id: str, ip: str, local_key: str, version: float) -> tinytuya.BulbDevice:
+        import tinytuya  # deferred (heavy); loaded with the first device connection
+
         bulb = tinytuya.BulbDevice(dev_id=dev_id, address=ip, local_key=local_key, version=version)
         bulb.set_socketTimeout(SOCKET_TIMEOUT)
         bulb.set_socketRetryLimit(RETRY_LIMIT)
@@ -148,6 +152,8 @@ class TuyaConnectionManager:
 
             logger.info(f"Running LAN discovery scan{f' ({reason})' if reason else ''}")
             try:
+                import tinytuya
+
                 found = tinytuya.deviceScan(False, timeout)
             except Exception as e:  # noqa: BLE001
                 logger.error(f"deviceScan failed: {e}")
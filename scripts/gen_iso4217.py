@@ -0,0 +1,34 @@
+"""Dev helper: regenerate lib/iso4217_codes.py from pycountry's ISO 4217 database.
+
+The app validates currency codes against that frozen table instead of importing
+pycountry (which loads its whole database) at startup. Rerun after bumping pycountry:
+
+    poetry run python scripts/gen_iso4217.py
+"""
+
+from importlib.metadata import version
+from pathlib import Path
+
+import pycountry
+
+TARGET = Path(__file__).resolve().parents[1] / "lib" / "iso4217_codes.py"
+
+
+def main() -> int:
+    codes = sorted(c.alpha_3 for c in pycountry.currencies)
+    lines = [
+        '"""ISO 4217 currency codes. Generated by scripts/gen_iso4217.py from pycountry',
+        f'{version("pycountry")} — do not edit by hand."""',
+        "",
+        "CURRENCY_CODES = frozenset({",
+    ]
+    for i in range(0, len(codes), 12):
+        lines.append("    " + " ".join(f'"{c}",' for c in codes[i:i + 12]))
+    lines.append("})")
+    TARGET.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    print(f"Wrote {len(codes)} codes to {TARGET}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,87 @@
+"""Dev helper: start-up import cost of the service entry points, with a budget.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter for each
+entry point (``app.webhook`` — the FastAPI service — and ``app.main`` — the REPL),
+keeps the best of ``--runs`` runs, and prints the total plus the heaviest imports.
+Exits 1 when a total exceeds the budget (``--budget-ms``, or env
+``IMPORT_BUDGET_MS``; default 5000), so it can gate CI; tests/test_importtime.py
+runs the same check when ``IMPORT_BUDGET_MS`` is set.
+
+Usage:
+    poetry run python scripts/importtime.py
+    poetry run python scripts/importtime.py --runs 5 --top 15 --budget-ms 3000
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+ENTRY_POINTS = ("app.webhook", "app.main")
+DEFAULT_BUDGET_MS = 5000
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """(module, depth, cumulative µs) for every line of ``-X importtime`` output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), depth, int(cumulative)))
+    return rows
+
+
+def measure(module: str) -> list[tuple[str, int, int]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def total_ms(rows: list[tuple[str, int, int]], module: str) -> float:
+    return next(us for name, depth, us in reversed(rows) if name == module and depth == 0) / 1000
+
+
+def best_run(module: str, runs: int) -> tuple[float, list[tuple[str, int, int]]]:
+    measured = [measure(module) for _ in range(max(1, runs))]
+    rows = min(measured, key=lambda r: total_ms(r, module))
+    return total_ms(rows, module), rows
+
+
+def budget_from_env() -> float:
+    raw = os.getenv("IMPORT_BUDGET_MS", "")
+    try:
+        return float(raw) if raw.strip() else DEFAULT_BUDGET_MS
+    except ValueError:
+        return DEFAULT_BUDGET_MS
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="runs per entry point; the fastest counts")
+    parser.add_argument("--top", type=int, default=10, help="heaviest imports to list")
+    parser.add_argument("--budget-ms", type=float, default=None, help="fail above this total")
+    args = parser.parse_args()
+    budget = args.budget_ms if args.budget_ms is not None else budget_from_env()
+
+    over = False
+    for module in ENTRY_POINTS:
+        total, rows = best_run(module, args.runs)
+        status = "OK" if total <= budget else "OVER BUDGET"
+        over |= total > budget
+        print(f"{module}: {total:.0f} ms (budget {budget:.0f} ms) {status}")
+        heaviest = sorted((r for r in rows if 1 <= r[1] <= 2), key=lambda r: -r[2])[:args.top]
+        for name, _, us in heaviest:
+            print(f"    {us / 1000:8.1f} ms  {name}")
+    return 1 if over else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,4 +1,6 @@
 """Tests for env-controlled subagent enable/disable and coordinator wiring."""
+import asyncio
+
 import lib.agents as agents
 
 
@@ -49,10 +51,63 @@ def test_coordinator_hands_off_to_composer(monkeypatch):
     assert "composer" not in {getattr(t, "name", "") for t in coord.tools}
 
 
+def _system_prompt(agent) -> str:
+    return asyncio.run(agent.get_system_prompt(None))
+
+
 def test_every_agent_gets_environment_preamble(monkeypatch):
     monkeypatch.setenv("OPENAI_DEFAULT_MODEL", "gpt-4.1-mini")
     for factory in (agents.create_composer_agent, agents.create_weather_agent, agents.create_coordinator_agent):
         agent = factory()
-        assert isinstance(agent.instructions, str)
-        assert "Environment context" in agent.instructions
-        assert "Base currency: PLN" in agent.instructions
+        # injected as dynamic instructions, evaluated per run
+        assert callable(agent.instructions)
+        prompt = _system_prompt(agent)
+        assert "Environment context" in prompt
+        assert "Base currency: PLN" in prompt
+
+
+def test_coordinator_memory_profile_is_read_per_run(monkeypatch):
+    monkeypatch.setenv("OPENAI_DEFAULT_MODEL", "gpt-4.1-mini")
+    monkeypatch.delenv("AGENT_MEMORY_OPERATOR_ENABLED", raising=False)
+    profile = {"text": "[facts]\n  - Lives in Warsaw"}
+    seen = []
+
+    async def fake_profile(message="", *args, **kwargs):
+        seen.append(message)
+        return profile["text"]
+
+    monkeypatch.setattr(agents.memory, "profile", fake_profile)
+    coord = agents.create_coordinator_agent()
+    assert "Lives in Warsaw" in _system_prompt(coord)
+    profile["text"] = "[facts]\n  - Lives in Krakow"
+    assert "Lives in Krakow" in _system_prompt(coord)  # no rebuild needed
+
+    # ranked against the turn's message
+    from types import SimpleNamespace
+    from lib.cache import Ctx
+    ctx = Ctx()
+    ctx.user_message = "jaka pogoda w Krakowie?"
+    asyncio.run(coord.get_system_prompt(SimpleNamespace(context=ctx)))
+    assert seen[-1] == "jaka pogoda w Krakowie?"
+
+
+def test_agent_graph_is_reused_until_flags_change(monkeypatch):
+    monkeypatch.setenv("OPENAI_DEFAULT_MODEL", "gpt-4.1-mini")
+    monkeypatch.delenv("AGENT_NEWS_AGENT_ENABLED", raising=False)
+    monkeypatch.setattr(agents, "_GRAPH", {"key": None, "coordinator": None, "fast_path": {}})
+    first = agents.get_coordinator_agent()
+    assert agents.get_coordinator_agent() is first
+    monkeypatch.setenv("AGENT_NEWS_AGENT_ENABLED", "false")
+    rebuilt = agents.get_coordinator_agent()
+    assert rebuilt is not first
+    assert "news_agent" not in {getattr(t, "name", "") for t in rebuilt.tools}
+
+
+def test_fast_path_agent_hands_off_to_composer(monkeypatch):
+    monkeypatch.setenv("OPENAI_DEFAULT_MODEL", "gpt-4.1-mini")
+    monkeypatch.setattr(agents, "_GRAPH", {"key": None, "coordinator": None, "fast_path": {}})
+    agent = agents.get_fast_path_agent("weather_agent")
+    assert agent.name == "weather_agent"
+    assert [h.name for h in agent.handoffs] == ["composer"]
+    assert "hand off to the 'composer'" in _system_prompt(agent)
+    assert agents.get_fast_path_agent("weather_agent") is agent
@@ -0,0 +1,180 @@
+"""Tests for Cache TTL enforcement and namespaces (Redis is faked)."""
+import asyncio
+
+from lib.cache import Cache, LocalCache, Namespace
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data, self.ttls, self.calls = {}, {}, []
+        self.subscribers = {}
+
+    async def set(self, key, val, ex=None):
+        self.calls.append(("set", key, ex))
+        self.data[key] = val
+        self.ttls[key] = ex if ex else -1
+
+    async def get(self, key):
+        self.calls.append(("get", key))
+        return self.data.get(key)
+
+    async def getex(self, key, ex=None):
+        self.calls.append(("getex", key, ex))
+        if key in self.data:
+            self.ttls[key] = ex
+        return self.data.get(key)
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+    async def expire(self, key, ttl):
+        self.ttls[key] = ttl
+
+    async def scan_iter(self, match="*", count=None):
+        for key in list(self.data):
+            if key.startswith(match.rstrip("*")):
+                yield key
+
+    async def publish(self, channel, message):
+        self.calls.append(("publish", channel, message))
+        for queue in self.subscribers.get(channel, []):
+            queue.put_nowait({"type": "message", "data": message})
+
+    def pipeline(self, transaction=False):
+        return _FakePipeline(self)
+
+    def pubsub(self):
+        return _FakePubSub(self)
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis, self.ops = redis, []
+
+    def memory_usage(self, key):
+        self.ops.append(len(str(self.redis.data[key])) + 50)
+
+    def ttl(self, key):
+        self.ops.append(self.redis.ttls[key])
+
+    def expire(self, key, ttl):
+        self.ops.append(self.redis.expire(key, ttl))
+
+    def set(self, key, val, ex=None):
+        self.ops.append(self.redis.set(key, val, ex))
+
+    def delete(self, key):
+        self.ops.append(self.redis.delete(key))
+
+    def publish(self, channel, message):
+        self.ops.append(self.redis.publish(channel, message))
+
+    async def execute(self):
+        return [await op if asyncio.iscoroutine(op) else op for op in self.ops]
+
+
+class _FakePubSub:
+    def __init__(self, redis):
+        self.redis, self.queue = redis, asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.redis.subscribers.setdefault(channel, []).append(self.queue)
+
+    async def listen(self):
+        while True:
+            yield await self.queue.get()
+
+    async def aclose(self):
+        pass
+
+
+def _cache(monkeypatch, redis=None, **kwargs):
+    monkeypatch.delenv("CACHE_TTL_PREVIOUS_RESPONSE_ID", raising=False)
+    monkeypatch.setenv("CACHE_L1_ENABLED", "off")
+    cache = Cache(**kwargs)
+    cache.redis_cache = redis or _FakeRedis()
+    return cache
+
+
+def test_writes_expire_with_the_namespace_ttl(monkeypatch):
+    cache = _cache(monkeypatch, ttl=60, prefix="")
+    asyncio.run(cache.save_to_cache("previous_response_id:repl", "resp_1"))
+    asyncio.run(cache.save_to_cache("other:key", "x"))
+    asyncio.run(cache.save_to_cache("other:key2", "x", ttl=5))
+    assert cache.redis_cache.calls == [
+        ("set", "previous_response_id:repl", 3600 * 24 * 5),
+        ("set", "other:key", 60),
+        ("set", "other:key2", 5),
+    ]
+    monkeypatch.setenv("CACHE_TTL_PREVIOUS_RESPONSE_ID", "120")
+    assert cache.ttl_for("previous_response_id:repl") == 120
+
+
+def test_conversation_reads_slide_the_expiry(monkeypatch):
+    cache = _cache(monkeypatch, prefix="jarvis:",
+                   namespaces={"previous_response_id": Namespace(ttl=100, sliding=True)})
+    asyncio.run(cache.save_to_cache("previous_response_id:repl", "resp_1"))
+    assert asyncio.run(cache.get_from_cache("previous_response_id:repl")) == "resp_1"
+    assert asyncio.run(cache.get_from_cache("plain:key")) is None
+    assert cache.redis_cache.calls[1:] == [
+        ("getex", "jarvis:previous_response_id:repl", 100),
+        ("get", "jarvis:plain:key"),
+    ]
+
+
+def test_namespace_report_counts_and_fixes_keys_without_expiry(monkeypatch):
+    cache = _cache(monkeypatch, prefix="")
+    redis = cache.redis_cache
+    redis.data.update({"previous_response_id:a": "r", "previous_response_id:b": "r",
+                       "loose": "x", "unregistered:k": "x"})
+    redis.ttls.update({"previous_response_id:a": -1, "previous_response_id:b": 50,
+                       "loose": -1, "unregistered:k": -1})
+
+    report = asyncio.run(cache.namespace_report(apply_ttl=True))
+    assert report["previous_response_id"] == {"keys": 2, "bytes": 102, "no_expiry": 1}
+    assert report["(none)"] == {"keys": 1, "bytes": 51, "no_expiry": 1}
+    assert report["unregistered"]["no_expiry"] == 1
+    assert redis.ttls["previous_response_id:a"] == 3600 * 24 * 5
+    # Only registered namespaces get a TTL; other keys are reported, not touched.
+    assert redis.ttls["loose"] == -1 and redis.ttls["unregistered:k"] == -1
+
+
+def test_local_cache_is_a_bounded_lru_with_expiry(monkeypatch):
+    now = {"t": 0.0}
+    monkeypatch.setattr("lib.cache.time.monotonic", lambda: now["t"])
+    lru = LocalCache(max_entries=2, ttl=10)
+    lru.set("a", "1")
+    lru.set("b", "2")
+    assert lru.get("a") == "1"      # a is now most recent
+    lru.set("c", "3")                # evicts b
+    assert lru.get("b") is None
+    lru.set("short", "x", ttl=1)
+    now["t"] = 5
+    assert lru.get("short") is None and lru.get("c") == "3"
+    assert (lru.hits, lru.misses) == (2, 2)
+
+
+def test_l1_serves_hot_keys_and_peers_invalidate_over_pubsub(monkeypatch):
+    redis = _FakeRedis()
+
+    async def scenario():
+        a = _cache(monkeypatch, redis=redis, prefix="", local=LocalCache())
+        b = _cache(monkeypatch, redis=redis, prefix="", local=LocalCache())
+        await a.save_to_cache("previous_response_id:x", "resp_1")
+        await asyncio.sleep(0)  # let both listeners subscribe
+        assert await b.get_from_cache("previous_response_id:x") == "resp_1"  # Redis, fills b's L1
+        reads = len([c for c in redis.calls if c[0] == "getex"])
+        assert await b.get_from_cache("previous_response_id:x") == "resp_1"  # L1
+        assert len([c for c in redis.calls if c[0] == "getex"]) == reads
+
+        await a.save_to_cache("previous_response_id:x", "resp_2")
+        await asyncio.sleep(0)  # deliver the invalidation
+        assert await b.get_from_cache("previous_response_id:x") == "resp_2"
+        stats = b.stats()
+        await a.close()
+        await b.close()
+        return stats
+
+    redis.aclose = lambda: asyncio.sleep(0)
+    stats = asyncio.run(scenario())
+    assert stats["l1_hits"] == 1 and stats["redis_hits"] == 2
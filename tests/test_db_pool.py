@@ -0,0 +1,103 @@
+"""Tests for the Postgres pool layer (app/db/connection.py) and the async repos."""
+import asyncio
+import contextlib
+import logging
+from datetime import datetime, timezone
+
+import pytest
+
+from app.db import connection as dbconn
+from app.db import scheduler_repo
+
+
+def test_pool_settings_defaults_and_env(monkeypatch):
+    for name in ("DB_POOL_MIN_SIZE", "DB_POOL_MAX_SIZE", "DB_POOL_TIMEOUT_SECONDS", "DB_STATEMENT_TIMEOUT_MS"):
+        monkeypatch.delenv(name, raising=False)
+    assert dbconn.pool_settings() == {
+        "min_size": 1, "max_size": 5, "timeout": 10.0, "statement_timeout_ms": 5000,
+    }
+    monkeypatch.setenv("DB_POOL_MIN_SIZE", "4")
+    monkeypatch.setenv("DB_POOL_MAX_SIZE", "2")  # never below min_size
+    monkeypatch.setenv("DB_STATEMENT_TIMEOUT_MS", "not a number")
+    settings = dbconn.pool_settings()
+    assert (settings["min_size"], settings["max_size"]) == (4, 4)
+    assert settings["statement_timeout_ms"] == 5000
+
+
+def test_sync_pool_is_built_once_with_health_check(monkeypatch):
+    built = []
+
+    class FakePool:
+        check_connection = object()
+
+        def __init__(self, **kwargs):
+            self.kwargs = kwargs
+            built.append(self)
+
+        def open(self):
+            self.opened = True
+
+    monkeypatch.setenv("DATABASE_URL", "postgresql://jarvis@localhost/jarvis")
+    monkeypatch.setattr(dbconn, "ConnectionPool", FakePool)
+    monkeypatch.setattr(dbconn, "_POOL", None)
+    pool = dbconn._sync_pool()
+    assert dbconn._sync_pool() is pool and len(built) == 1
+    assert pool.opened and pool.kwargs["check"] is FakePool.check_connection
+    assert pool.kwargs["kwargs"]["cursor_factory"] is dbconn._TimedCursor
+    assert pool.kwargs["conninfo"] == "postgresql://jarvis@localhost/jarvis"
+
+
+def test_connection_requires_database_url(monkeypatch):
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    monkeypatch.setattr(dbconn, "_POOL", None)
+    with pytest.raises(RuntimeError):
+        with dbconn.connection():
+            pass
+
+
+def test_query_stats_aggregate_per_statement_and_log_slow(monkeypatch, caplog):
+    dbconn.reset_query_stats()
+    monkeypatch.setenv("DB_SLOW_QUERY_MS", "100")
+    dbconn.record_query("SELECT 1\n   FROM  t", 0.010)
+    dbconn.record_query("", 0.001)  # pool health check: not a statement
+    with caplog.at_level(logging.WARNING, logger="app.db.connection"):
+        dbconn.record_query("SELECT 1 FROM t", 0.250)
+    assert list(dbconn.query_stats()) == ["SELECT 1 FROM t"]
+    stats = dbconn.query_stats()["SELECT 1 FROM t"]
+    assert stats == {"count": 2, "avg_ms": 130.0, "max_ms": 250.0, "total_ms": 260.0}
+    assert "slow query" in caplog.text
+    dbconn.reset_query_stats()
+
+
+class _FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.rowcount = len(rows)
+
+    async def fetchall(self):
+        return self.rows
+
+    async def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+
+def test_scheduler_repo_due_runs_on_the_async_pool(monkeypatch):
+    now = datetime(2026, 10, 18, 8, 0, tzinfo=timezone.utc)
+    row = ("job_1", "brief", "log", None, "repl", "cron", "0 8 * * *", None,
+           now, None, None, 0, None, "active", now)
+    executed = []
+
+    class FakeConn:
+        async def execute(self, query, params=None):
+            executed.append((query, params))
+            return _FakeCursor([row])
+
+    @contextlib.asynccontextmanager
+    async def fake_connection():
+        yield FakeConn()
+
+    monkeypatch.setattr(scheduler_repo, "async_connection", fake_connection)
+    due = asyncio.run(scheduler_repo.PostgresJobStore().due(now))
+    assert [j["id"] for j in due] == ["job_1"]
+    assert due[0]["next_run_at"] == now.isoformat()
+    assert "next_run_at <= %s" in executed[0][0] and executed[0][1] == (now,)
@@ -3,7 +3,7 @@ and that name-based device resolution works."""
 import types
 
 from lib.smart_device import SmartDevice
-from lib import tools
+from lib.tools import iot
 
 
 def _device(name="Telewizor"):
@@ -36,20 +36,20 @@ def _ctx(devices):
 def test_resolve_devices_exact_and_case_insensitive():
     reg = {"Telewizor": _device("Telewizor"), "Łóżko": _device("Łóżko")}
     ctx = _ctx(reg)
-    found, unknown = tools._resolve_devices(ctx, ["Telewizor", "łóżko"])
+    found, unknown = iot._resolve_devices(ctx, ["Telewizor", "łóżko"])
     assert [d.name for d in found] == ["Telewizor", "Łóżko"]
     assert unknown == []
 
 
 def test_resolve_devices_reports_unknown():
     ctx = _ctx({"Telewizor": _device("Telewizor")})
-    found, unknown = tools._resolve_devices(ctx, ["Telewizor", "Ghost"])
+    found, unknown = iot._resolve_devices(ctx, ["Telewizor", "Ghost"])
     assert [d.name for d in found] == ["Telewizor"]
     assert unknown == ["Ghost"]
 
 
 def test_resolve_devices_empty_registry():
     ctx = _ctx({})
-    found, unknown = tools._resolve_devices(ctx, ["Telewizor"])
+    found, unknown = iot._resolve_devices(ctx, ["Telewizor"])
     assert found == []
     assert unknown == ["Telewizor"]
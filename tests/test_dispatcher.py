@@ -0,0 +1,115 @@
+"""Tests for the turn dispatcher: per-conversation order, cross-conversation
+parallelism, isolated per-turn contexts. The engine is replaced by a fake handler."""
+import asyncio
+
+import pytest
+
+from lib.dispatcher import TurnDispatcher
+
+
+class _FakeCache:
+    pass
+
+
+def _dispatcher(handler, max_concurrency=8):
+    return TurnDispatcher(cache=_FakeCache(), max_concurrency=max_concurrency, handler=handler)
+
+
+def test_same_conversation_turns_run_in_order_one_at_a_time():
+    log, running = [], {"now": 0, "max": 0}
+
+    async def handler(cid, text, ctx, hooks, origin="user"):
+        running["now"] += 1
+        running["max"] = max(running["max"], running["now"])
+        log.append(("start", text))
+        await asyncio.sleep(0.01)
+        log.append(("end", text))
+        running["now"] -= 1
+        return text.upper()
+
+    async def main():
+        d = _dispatcher(handler)
+        futures = [d.submit("messenger:1", t) for t in ("a", "b", "c")]
+        return await asyncio.gather(*futures)
+
+    assert asyncio.run(main()) == ["A", "B", "C"]
+    assert running["max"] == 1
+    assert log == [("start", "a"), ("end", "a"), ("start", "b"), ("end", "b"), ("start", "c"), ("end", "c")]
+
+
+def test_different_conversations_run_in_parallel_up_to_the_limit():
+    running = {"now": 0, "max": 0}
+
+    async def handler(cid, text, ctx, hooks, origin="user"):
+        running["now"] += 1
+        running["max"] = max(running["max"], running["now"])
+        await asyncio.sleep(0.01)
+        running["now"] -= 1
+        return cid
+
+    async def main():
+        d = _dispatcher(handler, max_concurrency=2)
+        return await asyncio.gather(*(d.run(f"messenger:{i}", "hi") for i in range(5)))
+
+    assert asyncio.run(main()) == [f"messenger:{i}" for i in range(5)]
+    assert running["max"] == 2
+
+
+def test_each_turn_gets_its_own_ctx_and_hooks_sharing_the_cache():
+    seen, seen_hooks = [], []
+
+    async def handler(cid, text, ctx, hooks, origin="user"):
+        ctx.conversation_id = cid
+        await asyncio.sleep(0)
+        seen.append(ctx)
+        seen_hooks.append(hooks)
+        return ""
+
+    async def main():
+        d = _dispatcher(handler)
+        await asyncio.gather(d.run("a", "x"), d.run("b", "y"), d.run("a", "z"))
+        return d
+
+    d = asyncio.run(main())
+    assert len({id(c) for c in seen}) == 3
+    assert len({id(h) for h in seen_hooks}) == 3 and None not in seen_hooks
+    assert all(c.cache is d.cache for c in seen)
+    assert d.pending() == {}
+
+
+def test_failure_is_delivered_to_its_caller_and_the_queue_keeps_going():
+    async def handler(cid, text, ctx, hooks, origin="user"):
+        if text == "boom":
+            raise RuntimeError("model down")
+        return f"{origin}:{text}"
+
+    async def main():
+        d = _dispatcher(handler)
+        bad = d.submit("c", "boom")
+        good = d.submit("c", "ok", origin="system")
+        with pytest.raises(RuntimeError):
+            await bad
+        return await good
+
+    assert asyncio.run(main()) == "system:ok"
+
+
+def test_streaming_turn_forwards_fragments_and_resolves_to_the_whole_reply():
+    async def stream_handler(cid, text, ctx, hooks, origin="user"):
+        for part in ("Dzień ", "dobry"):
+            yield part
+
+    async def handler(*args, **kwargs):
+        raise AssertionError("non-streaming handler must not be used")
+
+    received = []
+
+    async def on_text(fragment):
+        received.append(fragment)
+
+    async def main():
+        d = TurnDispatcher(cache=_FakeCache(), handler=handler, stream_handler=stream_handler)
+        return await d.run("messenger:1", "hej", on_text=on_text)
+
+    assert asyncio.run(main()) == "Dzień dobry"
+    assert received == ["Dzień ", "dobry"]
@@ -0,0 +1,158 @@
+"""Tests for the engine's streaming turn (no model: Runner.run_streamed is faked)."""
+import asyncio
+import types
+
+from openai.types.responses import ResponseTextDeltaEvent
+
+from lib import engine
+
+
+class _MemCache:
+    def __init__(self):
+        self.data = {}
+
+    async def get_from_cache(self, key):
+        return self.data.get(key)
+
+    async def save_to_cache(self, key, val):
+        self.data[key] = val
+
+    async def delete_from_cache(self, key):
+        self.data.pop(key, None)
+
+
+def _delta(text):
+    return types.SimpleNamespace(
+        type="raw_response_event",
+        data=ResponseTextDeltaEvent(content_index=0, delta=text, item_id="i", logprobs=[],
+                                    output_index=0, sequence_number=0, type="response.output_text.delta"),
+    )
+
+
+def _switch(name):
+    return types.SimpleNamespace(type="agent_updated_stream_event",
+                                 new_agent=types.SimpleNamespace(name=name))
+
+
+class _FakeStream:
+    def __init__(self, events, final_output):
+        self._events = events
+        self.final_output = final_output
+        self.last_response_id = "resp_2"
+
+    async def stream_events(self):
+        for e in self._events:
+            yield e
+
+
+def _run(monkeypatch, events, final_output):
+    calls = {}
+
+    def run_streamed(agent, **kwargs):
+        calls.update(kwargs)
+        return _FakeStream(events, final_output)
+
+    monkeypatch.setattr(engine.Runner, "run_streamed", run_streamed)
+    monkeypatch.setattr(engine, "get_coordinator_agent", lambda: types.SimpleNamespace(name="coordinator"))
+    monkeypatch.setattr(engine.Config, "create_config", classmethod(lambda cls: None))
+    ctx = types.SimpleNamespace(cache=_MemCache(), conversation_id=None, final_replies=set())
+    ctx.cache.data["previous_response_id:repl"] = "resp_1"
+
+    async def collect():
+        return [c async for c in engine.stream_message("repl", "hej", ctx)]
+
+    return asyncio.run(collect()), ctx, calls
+
+
+def test_stream_yields_only_composer_text_and_persists_continuity(monkeypatch):
+    events = [_delta("thinking out loud"), _switch("composer"), _delta("Cześć"), _delta("!")]
+    chunks, ctx, calls = _run(monkeypatch, events, "Cześć!")
+    assert chunks == ["Cześć", "!"]
+    assert calls["previous_response_id"] == "resp_1"
+    assert ctx.cache.data["previous_response_id:repl"] == "resp_2"
+    assert ctx.conversation_id == "repl"
+
+
+def test_stream_falls_back_to_final_output_without_composer(monkeypatch):
+    chunks, _, _ = _run(monkeypatch, [_delta("direct answer")], "direct answer")
+    assert chunks == ["direct answer"]
+
+
+def test_single_domain_turn_starts_on_fast_path_agent(monkeypatch):
+    started = {}
+
+    async def run(agent, **kwargs):
+        started["agent"] = agent.name
+        return types.SimpleNamespace(final_output="ok", last_response_id="resp_2")
+
+    monkeypatch.delenv("FAST_PATH_ENABLED", raising=False)
+    monkeypatch.setattr(engine.Runner, "run", run)
+    monkeypatch.setattr(engine, "get_coordinator_agent", lambda: types.SimpleNamespace(name="coordinator"))
+    monkeypatch.setattr(engine, "get_fast_path_agent", lambda name: types.SimpleNamespace(name=name))
+    monkeypatch.setattr(engine, "enabled_subagents", lambda: {"weather_agent"})
+    monkeypatch.setattr(engine.Config, "create_config", classmethod(lambda cls: None))
+    ctx = types.SimpleNamespace(cache=_MemCache(), conversation_id=None, final_replies=set())
+
+    asyncio.run(engine.handle_message("repl", "jaka jutro pogoda?", ctx))
+    assert started["agent"] == "weather_agent"
+    asyncio.run(engine.handle_message("repl", "jaka jutro pogoda?", ctx, origin="system"))
+    assert started["agent"] == "coordinator"
+
+
+def test_templated_reply_replays_unanswered_tool_outputs_next_turn(monkeypatch):
+    inputs = []
+    output = types.SimpleNamespace(
+        type="tool_call_output_item",
+        raw_item={"type": "function_call_output", "call_id": "c1", "output": "{}"},
+        to_input_item=lambda: {"type": "function_call_output", "call_id": "c1", "output": "{}"},
+    )
+    response = types.SimpleNamespace(output=[types.SimpleNamespace(type="function_call", call_id="c1")])
+
+    async def run(agent, **kwargs):
+        inputs.append(kwargs["input"])
+        ctx = kwargs["context"]
+        if len(inputs) == 1:
+            ctx.final_replies.add("Gotowe.")
+            return types.SimpleNamespace(final_output="Gotowe.", last_response_id="resp_1",
+                                         raw_responses=[response], new_items=[output])
+        return types.SimpleNamespace(final_output="Hej", last_response_id="resp_2",
+                                     raw_responses=[], new_items=[])
+
+    monkeypatch.setattr(engine.Runner, "run", run)
+    monkeypatch.setattr(engine, "get_coordinator_agent", lambda: types.SimpleNamespace(name="coordinator"))
+    monkeypatch.setattr(engine.Config, "create_config", classmethod(lambda cls: None))
+    cache = _MemCache()
+
+    def turn(text):
+        ctx = types.SimpleNamespace(cache=cache, conversation_id=None, final_replies=set())
+        return asyncio.run(engine.handle_message("repl", text, ctx))
+
+    assert turn("hej") == "Gotowe."
+    turn("dzięki")
+    assert inputs[1] == [
+        {"type": "function_call_output", "call_id": "c1", "output": "{}"},
+        {"role": "assistant", "content": "Gotowe."},
+        {"role": "user", "content": "dzięki"},
+    ]
+    assert "pending_input:repl" not in cache.data
+
+
+def test_reused_ctx_starts_each_turn_with_fresh_composer_skip_state(monkeypatch):
+    from lib.cache import Ctx
+    seen = []
+
+    async def run(agent, **kwargs):
+        ctx = kwargs["context"]
+        seen.append((dict(ctx.tool_steps), set(ctx.final_replies)))
+        ctx.tool_steps["coordinator"] = ctx.tool_steps.get("coordinator", 0) + 1
+        ctx.final_replies.add("Gotowe.")
+        return types.SimpleNamespace(final_output="Gotowe.", last_response_id="resp_1",
+                                     raw_responses=[], new_items=[])
+
+    monkeypatch.setattr(engine.Runner, "run", run)
+    monkeypatch.setattr(engine, "get_coordinator_agent", lambda: types.SimpleNamespace(name="coordinator"))
+    monkeypatch.setattr(engine.Config, "create_config", classmethod(lambda cls: None))
+    ctx = Ctx(cache=_MemCache())
+    for text in ("hej", "dzięki"):
+        asyncio.run(engine.handle_message("repl", text, ctx))
+    assert seen == [({}, set()), ({}, set())]
@@ -0,0 +1,61 @@
+"""Tests for composer-skip mode (templated final replies)."""
+import asyncio
+import types
+
+from lib import final_reply
+from lib.hooks import LoggingRunHooks
+
+
+def _ctx():
+    return types.SimpleNamespace(final_replies=set(), tool_steps={})
+
+
+def _results(*outputs):
+    return [types.SimpleNamespace(output=o) for o in outputs]
+
+
+def _decide(behavior, ctx, *outputs):
+    return asyncio.run(behavior(types.SimpleNamespace(context=ctx), _results(*outputs)))
+
+
+def test_marked_results_end_the_run_with_the_template(monkeypatch):
+    monkeypatch.delenv("AGENT_IOT_OPERATOR_COMPOSER_SKIP", raising=False)
+    ctx = _ctx()
+    done = final_reply.mark_final({"states": []}, "devices_off", devices="Lampa")
+    decision = _decide(final_reply.stop_on_final_reply("iot_operator"), ctx, done)
+    assert decision.is_final_output
+    assert decision.final_output == "Gotowe, wyłączyłem: Lampa."
+    assert decision.final_output in ctx.final_replies
+
+
+def test_unmarked_or_mixed_steps_continue(monkeypatch):
+    behavior = final_reply.stop_on_final_reply("iot_operator")
+    done = final_reply.mark_final({}, "memory_deleted")
+    assert not _decide(behavior, _ctx(), {"states": []}).is_final_output
+    assert not _decide(behavior, _ctx(), done, {"Failed": "x"}).is_final_output
+    monkeypatch.setenv("AGENT_IOT_OPERATOR_COMPOSER_SKIP", "off")
+    assert not _decide(behavior, _ctx(), done).is_final_output
+
+
+def test_coordinator_stops_only_on_a_final_first_step():
+    ctx = _ctx()
+    ctx.final_replies.add("Gotowe, zapamiętałem to.")
+    coordinator = final_reply.stop_on_final_reply(first_step_only=True)
+    assert _decide(coordinator, ctx, "Gotowe, zapamiętałem to.").is_final_output
+
+    ctx = _ctx()
+    ctx.final_replies.add("Gotowe, zapamiętałem to.")
+    assert not _decide(coordinator, ctx, "Jutro 20°C").is_final_output
+    # the weather gathered in step one must still reach the composer
+    assert not _decide(coordinator, ctx, "Gotowe, zapamiętałem to.").is_final_output
+
+
+def test_hooks_count_avoided_composer_calls():
+    hooks = LoggingRunHooks()
+    ctx = _ctx()
+    ctx.final_replies.add("Gotowe.")
+    wrapper = types.SimpleNamespace(context=ctx)
+    agent = types.SimpleNamespace(name="coordinator")
+    asyncio.run(hooks.on_agent_end(wrapper, agent, "Gotowe."))
+    asyncio.run(hooks.on_agent_end(wrapper, types.SimpleNamespace(name="composer"), "Inna odpowiedź"))
+    assert hooks.composer_calls_avoided == 1
@@ -0,0 +1,72 @@
+"""Tests for the Open-Meteo forecast fetch and its compaction (no network)."""
+import asyncio
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+
+def test_forecast_timestamps_match_local_iso_series():
+    from lib.forecast import forecast_timestamps
+    start = int(datetime(2026, 10, 18, tzinfo=ZoneInfo("UTC")).timestamp())
+    series = forecast_timestamps(start, start + 3 * 3600, 3600, utc_offset=7200)
+    assert series == ["2026-10-18T02:00:00", "2026-10-18T03:00:00", "2026-10-18T04:00:00"]
+    assert forecast_timestamps(start, start, 3600) == []
+
+
+def test_get_forecasts_sends_all_locations_in_one_request(monkeypatch):
+    import httpx
+    from lib import forecast, http_client
+    requests = []
+
+    def handler(request):
+        requests.append(request.url.params)
+        return httpx.Response(200, content=b"fb")
+    monkeypatch.setitem(http_client._CLIENT, "client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(http_client, "_HOST_SLOTS", {})
+    monkeypatch.setattr(forecast, "_decode_forecasts", lambda content: ["m1", "m2"])
+    monkeypatch.setattr(forecast, "_forecast_result", lambda m, forecast_type, variables: {"msg": m})
+
+    locations = [{"lat": 52.2, "long": 21.0}, {"lat": "50.1", "long": "19.9"}]
+    result = asyncio.run(forecast.get_forecasts(locations, "3", "daily"))
+    assert result == [{"msg": "m1"}, {"msg": "m2"}]
+    assert len(requests) == 1
+    assert requests[0]["latitude"] == "52.2,50.1" and requests[0]["longitude"] == "21.0,19.9"
+    assert requests[0]["format"] == "flatbuffers"
+
+
+def _hourly_forecast(days):
+    from lib.forecast import forecast_timestamps
+    start = int(datetime(2026, 10, 18, tzinfo=ZoneInfo("UTC")).timestamp())
+    hours = 24 * days
+    precipitation = [0.0] * hours
+    precipitation[7:10] = [0.5, 1.0, 0.2]
+    return {
+        "temperature_2m": [float(h % 24) for h in range(hours)],
+        "apparent_temperature": [float(h % 24) - 2 for h in range(hours)],
+        "weather_code": [61.0 if 7 <= h < 10 else 3.0 for h in range(hours)],
+        "precipitation": precipitation,
+        "time": forecast_timestamps(start, start + hours * 3600, 3600),
+        "meta": {"lat": 52.2},
+    }
+
+
+def test_compact_forecast_aggregates_parts_of_day():
+    from lib.forecast import compact_forecast
+    table = compact_forecast(_hourly_forecast(1), "hourly", "normal")
+    assert table["columns"][:5] == ["day", "part", "temp_min", "temp_max", "temp_mean"]
+    assert [row[1] for row in table["rows"]] == ["night", "morning", "afternoon", "evening"]
+    morning = dict(zip(table["columns"], table["rows"][1]))
+    assert (morning["temp_min"], morning["temp_max"], morning["temp_mean"]) == (6.0, 11.0, 8.5)
+    assert morning["precipitation_mm"] == 1.7 and morning["weather_code"] == 61  # 3h vs 3h: more severe wins
+    assert table["rain_windows"] == [{"from": "2026-10-18T07:00", "to": "2026-10-18T09:00", "mm": 1.7}]
+    assert [run["weather_code"] for run in table["weather_code_runs"]] == [3, 61, 3]
+    assert table["meta"] == {"lat": 52.2}
+
+
+def test_compact_forecast_falls_back_to_days_over_budget():
+    import json
+    from lib.forecast import compact_forecast
+    raw = _hourly_forecast(7)
+    table = compact_forecast(raw, "hourly", "normal")
+    assert table["columns"][0:2] == ["day", "temp_min"] and len(table["rows"]) == 7
+    assert len(json.dumps(table)) < len(json.dumps(raw)) / 5
+    assert compact_forecast(raw, "hourly", "full") is raw
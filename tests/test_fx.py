@@ -0,0 +1,74 @@
+"""Tests for the ECB reference-rate snapshots (httpx MockTransport, no network/DB)."""
+import asyncio
+import time
+from datetime import date, datetime
+
+import httpx
+import pytest
+
+from lib import fx, http_client
+
+RATES = {"PLN": 4.25, "USD": 1.10, "GBP": 0.85}
+
+
+@pytest.fixture
+def frankfurter(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        day = request.url.path.rsplit("/", 1)[-1]
+        rates = RATES if day == "latest" else {**RATES, "PLN": 4.30}
+        return httpx.Response(200, json={"amount": 1.0, "base": "EUR",
+                                         "date": "2026-10-16" if day == "latest" else day, "rates": rates})
+    monkeypatch.setitem(http_client._CLIENT, "client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(http_client, "_HOST_SLOTS", {})
+    monkeypatch.setattr(fx, "_LATEST", {"snapshot": None, "valid_until": 0.0})
+    monkeypatch.setattr(fx, "_HISTORY", {})
+    monkeypatch.delenv("DATABASE_URL", raising=False)
+    return calls
+
+
+def test_cross_rates_come_from_one_fetch(frankfurter):
+    snapshot = asyncio.run(fx.latest_snapshot())
+    again = asyncio.run(fx.latest_snapshot())
+    assert again is snapshot and len(frankfurter) == 1
+    assert fx.cross_rate(snapshot, "PLN", "USD") == pytest.approx(4.25 / 1.10)
+    assert fx.cross_rate(snapshot, "GBP", "EUR") == pytest.approx(0.85)
+
+
+def test_lagging_table_is_cached_only_briefly(frankfurter, monkeypatch):
+    # Monday just after publication time, while the source still serves Friday's table.
+    monkeypatch.setattr(fx, "_now", lambda: datetime(2026, 10, 19, 16, 20, tzinfo=fx.ECB_TZ))
+    snapshot = asyncio.run(fx.latest_snapshot())
+    assert snapshot["date"] == "2026-10-16"
+    assert fx._LATEST["valid_until"] <= time.time() + fx.LAGGING_RETRY_SECONDS
+
+    # The current table (Friday's, on Saturday) is kept until the next publication.
+    monkeypatch.setattr(fx, "_LATEST", {"snapshot": None, "valid_until": 0.0})
+    monkeypatch.setattr(fx, "_now", lambda: datetime(2026, 10, 17, 10, 0, tzinfo=fx.ECB_TZ))
+    asyncio.run(fx.latest_snapshot())
+    assert fx._LATEST["valid_until"] == datetime(2026, 10, 19, 16, 15, tzinfo=fx.ECB_TZ).timestamp()
+
+
+def test_snapshot_on_fetches_a_past_day_once(frankfurter):
+    past = asyncio.run(fx.snapshot_on(date(2026, 10, 9)))
+    asyncio.run(fx.snapshot_on(date(2026, 10, 9)))
+    assert past["rates"]["PLN"] == 4.30 and frankfurter == ["/v1/2026-10-09"]
+
+
+def test_publication_schedule_skips_weekends():
+    friday_evening = datetime(2026, 10, 16, 18, 0, tzinfo=fx.ECB_TZ)
+    assert fx.next_publication(friday_evening) == datetime(2026, 10, 19, 16, 15, tzinfo=fx.ECB_TZ)
+    sunday = datetime(2026, 10, 18, 12, 0, tzinfo=fx.ECB_TZ)
+    assert fx.last_publication(sunday).date() == date(2026, 10, 16)
+    assert fx._covers(date(2026, 10, 16), date(2026, 10, 18))
+    assert not fx._covers(date(2026, 10, 15), date(2026, 10, 16))
+
+
+def test_missing_currency_error_names_the_table_and_code():
+    from lib.tools.finance import _unpublished_currency
+    past = {"date": "2026-10-09", "rates": {"EUR": 1.0, "PLN": 4.30}}
+    error = _unpublished_currency(past, "PLN", "ISK")
+    assert error["Error"] == "The ECB reference table of 2026-10-09 has no rate for ISK."
+    assert error["Available currencies"] == ["EUR", "PLN"]
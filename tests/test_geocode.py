@@ -0,0 +1,39 @@
+"""Tests for the geocode gazetteer / cache chain (no network)."""
+import asyncio
+
+import httpx
+import pytest
+
+from lib import geocode, http_client
+
+
+@pytest.fixture
+def json_store(tmp_path, monkeypatch):
+    store = geocode.GeocodeStore(tmp_path / "geocode.json")
+    monkeypatch.setattr(geocode.store, "_impl", store)
+    return store
+
+
+def test_gazetteer_hit_skips_network(json_store, monkeypatch):
+    async def fail(*args, **kwargs):
+        raise AssertionError("network used")
+    monkeypatch.setattr(geocode, "_nominatim", fail)
+
+    assert asyncio.run(geocode.geocode(" krakow "))[0]["name"].startswith("Kraków")
+    assert asyncio.run(geocode.geocode("Warsaw")) == asyncio.run(geocode.geocode("Warszawa"))
+
+
+def test_nominatim_answer_is_stored_and_reused(json_store, monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.params["q"])
+        return httpx.Response(200, json=[{"display_name": "Hel, Polska", "lat": "54.6", "lon": "18.8"}])
+    monkeypatch.setitem(http_client._CLIENT, "client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(http_client, "_HOST_SLOTS", {})
+
+    first = asyncio.run(geocode.geocode("Hel"))
+    second = asyncio.run(geocode.geocode("HEL"))
+    assert first == second == [{"name": "Hel, Polska", "lat": "54.6", "long": "18.8"}]
+    assert calls == ["Hel"]
+    assert geocode.GeocodeStore(json_store.path).get("hel") == first
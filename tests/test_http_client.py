@@ -0,0 +1,110 @@
+"""Tests for the shared async HTTP client (httpx MockTransport, no network)."""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from lib import http_client, tools_utils
+
+
+@pytest.fixture
+def mock_http(monkeypatch):
+    def install(handler):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        monkeypatch.setitem(http_client._CLIENT, "client", client)
+        monkeypatch.setattr(http_client, "_HOST_SLOTS", {})
+        monkeypatch.setattr(http_client, "_METRICS", {})
+        monkeypatch.setattr(http_client, "_LAST_START", {})
+        monkeypatch.setattr(http_client, "_backoff", lambda attempt, response: 0)
+    return install
+
+
+def test_get_retries_transient_statuses_and_records_metrics(mock_http):
+    statuses = iter([503, 429, 200])
+    mock_http(lambda request: httpx.Response(next(statuses), json={"ok": True}))
+
+    response = asyncio.run(http_client.get("https://api.example.com/x", retries=2))
+    assert response.status_code == 200
+    metrics = http_client.host_metrics()["api.example.com"]
+    assert metrics["requests"] == 3 and metrics["retries"] == 2 and metrics["errors"] == 2
+
+
+def test_client_errors_are_returned_not_retried(mock_http):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(404, json={"chart": {"error": "not found"}})
+
+    mock_http(handler)
+    response = asyncio.run(http_client.get("https://query1.example.com/q"))
+    assert response.status_code == 404 and len(calls) == 1
+
+
+def test_transport_errors_raise_after_retries(mock_http):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        raise httpx.ConnectError("down", request=request)
+
+    mock_http(handler)
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(http_client.get("https://down.example.com/", retries=1))
+    assert len(calls) == 2
+
+
+def test_non_idempotent_requests_are_not_retried(mock_http):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    mock_http(handler)
+    asyncio.run(http_client.request("POST", "https://api.example.com/x", retries=3))
+    assert len(calls) == 1
+
+
+def test_host_concurrency_limit(mock_http, monkeypatch):
+    monkeypatch.setitem(http_client.HOST_CONCURRENCY, "slow.example.com", 1)
+    active = {"now": 0, "max": 0}
+
+    async def handler(request):
+        active["now"] += 1
+        active["max"] = max(active["max"], active["now"])
+        await asyncio.sleep(0.01)
+        active["now"] -= 1
+        return httpx.Response(200)
+
+    mock_http(handler)
+
+    async def burst():
+        await asyncio.gather(*(http_client.get("https://slow.example.com/") for _ in range(3)))
+
+    asyncio.run(burst())
+    assert active["max"] == 1
+
+
+def test_fetch_fpl_goes_through_the_shared_client(mock_http):
+    mock_http(lambda request: httpx.Response(200, json=[{"event": 3, "path": request.url.path}]))
+    data = asyncio.run(tools_utils.fetch_fpl("fixtures/?event=3"))
+    assert data == [{"event": 3, "path": "/api/fixtures/"}]
+
+
+def test_rate_limited_host_is_paced(mock_http, monkeypatch):
+    monkeypatch.setitem(http_client.HOST_MIN_INTERVAL, "slow.example.com", 0.05)
+    starts = []
+
+    def handler(request):
+        starts.append(time.monotonic())
+        return httpx.Response(200, json=[])
+    mock_http(handler)
+
+    async def burst():
+        await asyncio.gather(*(http_client.get("https://slow.example.com/q") for _ in range(3)))
+    asyncio.run(burst())
+
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert len(starts) == 3 and all(gap >= 0.045 for gap in gaps)
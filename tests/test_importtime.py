@@ -0,0 +1,54 @@
+"""Tests for the start-up import cost of the service entry points (scripts/importtime.py)."""
+import importlib.util
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# scripts/ is not a package; load the helper from its path instead of via sys.path.
+_spec = importlib.util.spec_from_file_location("importtime", ROOT / "scripts" / "importtime.py")
+importtime = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(importtime)
+
+# Third-party SDKs that only individual tools need; none may load at service start-up.
+HEAVY_SDKS = (
+    "tinytuya", "numpy", "openmeteo_sdk", "pyowm", "googlemaps", "tavily",
+    "litellm", "pycountry", "psycopg",
+)
+
+
+def test_parse_importtime_reads_depth_and_cumulative():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |     _io\n"
+        "import time:        80 |        200 |   encodings\n"
+        "import time:       500 |       5300 | app.webhook\n"
+    )
+    rows = importtime.parse_importtime(stderr)
+    assert rows == [("_io", 2, 120), ("encodings", 1, 200), ("app.webhook", 0, 5300)]
+    assert importtime.total_ms(rows, "app.webhook") == 5.3
+
+
+def test_webhook_start_does_not_import_tool_sdks():
+    probe = (
+        "import sys, app.webhook; "
+        f"print(','.join(m for m in {HEAVY_SDKS!r} if m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout.strip()
+    assert out == ""
+
+
+# Wall-clock timing depends on the machine and its load, so the budget check only
+# runs where a budget is set explicitly (CI); scripts/importtime.py is the gate.
+@pytest.mark.skipif(not os.getenv("IMPORT_BUDGET_MS"), reason="IMPORT_BUDGET_MS not set")
+@pytest.mark.parametrize("module", importtime.ENTRY_POINTS)
+def test_entry_point_import_within_budget(module):
+    total, _ = importtime.best_run(module, runs=2)
+    budget = importtime.budget_from_env()
+    assert total <= budget, f"import {module} took {total:.0f} ms (budget {budget:.0f} ms)"
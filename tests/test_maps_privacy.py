@@ -1,8 +1,9 @@
 """Tests that the maps agent exposes only place aliases to the model, never the
 user's real street addresses, and resolves aliases server-side."""
+import asyncio
 import types
 
-from lib import tools
+from lib.tools import maps
 
 FIXTURE = {
     "known_adressess": [
@@ -16,8 +17,12 @@ def _ctx():
     return types.SimpleNamespace(context=types.SimpleNamespace(known_adresses=dict(FIXTURE)))
 
 
+def _resolve(ctx, name):
+    return asyncio.run(maps._resolve_place(ctx, name))
+
+
 def test_known_entries_alias_list_excludes_addresses():
-    entries = tools._known_entries(_ctx())
+    entries = asyncio.run(maps._known_entries(_ctx()))
     aliases = [a for e in entries for a in e["aliases"]]
     assert set(aliases) == {"Home", "work", "office"}
     # the model-facing view (get_maps_memory) is built from aliases only
@@ -26,24 +31,148 @@ def test_known_entries_alias_list_excludes_addresses():
 
 
 def test_resolve_place_known_alias_returns_address():
-    addr, alias = tools._resolve_place(_ctx(), "Home")
+    addr, alias = _resolve(_ctx(), "Home")
     assert addr == "Sekretna 1"
     assert alias == "Home"
 
 
 def test_resolve_place_is_case_insensitive():
-    addr, alias = tools._resolve_place(_ctx(), "OFFICE")
+    addr, alias = _resolve(_ctx(), "OFFICE")
     assert addr == "Tajna 7"
     assert alias == "OFFICE"  # keeps the caller's term for relabeling the response
 
 
 def test_resolve_place_unknown_passes_through():
-    addr, alias = tools._resolve_place(_ctx(), "Metro Bemowo")
+    addr, alias = _resolve(_ctx(), "Metro Bemowo")
     assert addr == "Metro Bemowo"
     assert alias is None
 
 
 def test_resolve_place_empty_name():
-    addr, alias = tools._resolve_place(_ctx(), "")
+    addr, alias = _resolve(_ctx(), "")
     assert addr == ""
     assert alias is None
+
+
+class _Cache:
+    def __init__(self):
+        self.data = {}
+
+    async def get_from_cache(self, key):
+        return self.data.get(key)
+
+    async def save_to_cache(self, key, value, ttl=None):
+        self.data[key] = value
+
+
+class _Gmaps:
+    def __init__(self):
+        self.calls = 0
+
+    def directions(self, **kwargs):
+        self.calls += 1
+        return [{"legs": [{"start_address": kwargs["origin"], "end_address": kwargs["destination"], "steps": []}]}]
+
+
+def test_route_cache_serves_repeat_trips_within_the_bucket(monkeypatch):
+    import asyncio
+    from lib import tools_utils
+    gmaps, cache = _Gmaps(), _Cache()
+    monkeypatch.setitem(tools_utils._GMAPS, "client", gmaps)
+    monkeypatch.setattr(tools_utils, "_ROUTE_STATS", {"hits": 0, "misses": 0})
+
+    def ask(origin, departure="now"):
+        return asyncio.run(tools_utils.get_directions(cache, origin, "Tajna 7", "transit", None, departure, True))
+
+    first = ask("Sekretna 1")
+    assert ask(" sekretna  1 ") == first
+    assert gmaps.calls == 1
+    ask("Sekretna 1", departure=1_900_000_000)
+    assert gmaps.calls == 2
+    assert tools_utils.route_cache_stats() == {"hits": 1, "misses": 2, "hit_rate": 0.333}
+    assert all("Sekretna" not in key for key in cache.data)
+
+
+def test_route_cache_key_buckets_departure_time(monkeypatch):
+    from lib.tools_utils import route_cache_key
+    monkeypatch.setenv("ROUTE_CACHE_BUCKET_MINUTES", "10")
+    key = lambda t: route_cache_key("a", "b", "transit", None, t, True)
+    assert key(600 * 1000) == key(600 * 1000 + 599) != key(600 * 1001)
+    assert route_cache_key("a", "b", "transit", None, "now", True, now=600 * 1000 + 5) == key(600 * 1000)
+
+
+def test_alias_index_folds_case_and_diacritics():
+    from lib.maps_memory import AliasIndex
+    index = AliasIndex({"known_addresses": [{"aliases": ["Siłownia"], "address": "Ukryta 3"}]})
+    assert index.resolve("  SILOWNIA ") == ("Ukryta 3", "  SILOWNIA ")
+    assert index.aliases == ["Siłownia"]
+
+
+def test_maps_memory_loads_once_and_reloads_on_mtime_change(tmp_path, monkeypatch):
+    import json
+    import os
+    from lib.maps_memory import JsonMapsSource, MapsMemory
+    path = tmp_path / "maps_memory.json"
+    path.write_text(json.dumps(FIXTURE), encoding="utf-8")
+    source = JsonMapsSource(path)
+    loads = []
+    original = source.load
+    monkeypatch.setattr(source, "load", lambda: loads.append(1) or original())
+    memory = MapsMemory(source)
+
+    assert asyncio.run(memory.index()).resolve("home") == ("Sekretna 1", "home")
+    assert asyncio.run(memory.index()).resolve("work")[0] == "Tajna 7"
+    assert len(loads) == 1
+
+    path.write_text(json.dumps({"known_adressess": [{"aliases": ["Home"], "address": "Nowa 2"}]}), encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert asyncio.run(memory.index()).resolve("Home")[0] == "Nowa 2"
+    assert len(loads) == 2
+
+
+def test_concurrent_first_lookups_wait_for_the_initial_load():
+    from lib.maps_memory import MapsMemory
+
+    class SlowSource:
+        check_interval = 30.0
+        loads = 0
+
+        async def version(self):
+            await asyncio.sleep(0.01)
+            return 1
+
+        async def load(self):
+            SlowSource.loads += 1
+            await asyncio.sleep(0.01)
+            return FIXTURE
+
+    memory = MapsMemory(SlowSource())
+
+    async def main():
+        return await asyncio.gather(*(memory.index() for _ in range(5)))
+
+    indexes = asyncio.run(main())
+    assert all(index.resolve("home")[0] == "Sekretna 1" for index in indexes)
+    assert SlowSource.loads == 1
+
+
+def test_failed_first_load_is_retried_on_the_next_lookup():
+    from lib.maps_memory import MapsMemory
+
+    class FlakySource:
+        check_interval = 30.0
+        fail = True
+
+        async def version(self):
+            if FlakySource.fail:
+                raise ConnectionError("database down")
+            return 1
+
+        async def load(self):
+            return FIXTURE
+
+    memory = MapsMemory(FlakySource())
+    assert asyncio.run(memory.index()).resolve("home") == ("home", None)
+    FlakySource.fail = False
+    assert asyncio.run(memory.index()).resolve("home")[0] == "Sekretna 1"
@@ -1,4 +1,6 @@
 """Unit tests for the long-term memory store (lib/memory.py)."""
+import asyncio
+
 from lib.memory import MemoryStore
 
 
@@ -88,3 +90,185 @@ def test_summary_groups_by_category_and_tags_inferred(tmp_path):
     assert "[habits]" in summary
     assert "Prefers transit" in summary
     assert "(inferred)" in summary
+
+
+def test_proxy_summary_is_memoized_until_the_store_changes(monkeypatch, tmp_path):
+    from lib.memory import _MemoryProxy
+    proxy = _MemoryProxy()
+    proxy._impl = _store(tmp_path)
+    asyncio.run(proxy.add("Prefers tea", category="preferences"))
+    assert "Prefers tea" in asyncio.run(proxy.summary())
+    calls = []
+    original = proxy._impl.summary
+    monkeypatch.setattr(proxy._impl, "summary", lambda *a: calls.append(1) or original(*a))
+    asyncio.run(proxy.summary())
+    assert calls == []  # unchanged store: served from the memo
+    # a write by another process (here: another store on the same files) is seen
+    MemoryStore(path=proxy._impl.path).add("Likes jazz", category="interests")
+    assert "Likes jazz" in asyncio.run(proxy.summary())
+    assert "Likes jazz" in asyncio.run(proxy.profile("jazz", k=1, budget_tokens=100))
+
+
+def test_proxy_awaits_async_backends(tmp_path):
+    from lib.memory import _MemoryProxy
+
+    class AsyncBackend:
+        async def all(self):
+            return [{"id": "mem_1", "text": "Lives in Warsaw", "category": "facts"}]
+
+    proxy = _MemoryProxy()
+    proxy._impl = AsyncBackend()
+    assert asyncio.run(proxy.all())[0]["text"] == "Lives in Warsaw"
+
+
+def test_writes_append_to_the_journal_instead_of_rewriting(tmp_path):
+    s = _store(tmp_path)
+    first = s.add("Likes tea", category="preferences")
+    s.update(first["id"], text="Likes green tea")
+    second = s.add("Night owl", category="habits")
+    s.delete(second["id"])
+    assert not s.path.exists()  # no snapshot rewrite before compaction
+    assert len(s.journal_path.read_text(encoding="utf-8").splitlines()) == 4
+    reopened = MemoryStore(path=s.path)
+    assert [e["text"] for e in reopened.all()] == ["Likes green tea"]
+
+
+def test_journal_is_compacted_into_the_snapshot(tmp_path):
+    import json
+    s = MemoryStore(path=tmp_path / "memory.json", compact_after=3)
+    for text in ("a", "b", "c"):
+        s.add(text, category="facts")
+    assert not s.journal_path.exists()
+    snapshot = json.loads(s.path.read_text(encoding="utf-8"))
+    assert [e["text"] for e in snapshot["entries"]] == ["a", "b", "c"]
+    s.add("d", category="facts")
+    assert [e["text"] for e in MemoryStore(path=s.path).all()] == ["a", "b", "c", "d"]
+
+
+def test_external_edit_is_picked_up_and_torn_journal_line_skipped(tmp_path):
+    import json
+    s = _store(tmp_path)
+    s.add("Likes tea", category="preferences")
+    assert len(s.all()) == 1
+    s.close()
+    s.path.write_text(json.dumps({"entries": [
+        {"id": "mem_hand", "text": "Edited by hand", "category": "facts"},
+    ]}), encoding="utf-8")
+    with open(s.journal_path, "a", encoding="utf-8") as f:
+        f.write('{"op": "put", "entry": {"id": "mem_torn"')  # crash mid-write
+    assert sorted(e["text"] for e in s.all()) == ["Edited by hand", "Likes tea"]
+    s.add("After the crash", category="facts")
+    reopened = MemoryStore(path=s.path)
+    assert "After the crash" in [e["text"] for e in reopened.all()]
+
+
+def test_index_ranks_relevant_entries_across_inflections():
+    from lib.memory_index import MemoryIndex
+    entries = [
+        {"id": "mem_1", "text": "Pije kawę bez cukru", "category": "preferences"},
+        {"id": "mem_2", "text": "Mieszka w Warszawie na Mokotowie", "category": "facts"},
+        {"id": "mem_3", "text": "Kibicuje Arsenalowi w Premier League", "category": "interests"},
+    ]
+    index = MemoryIndex(entries)
+    assert [e["id"] for e in index.search("zrób mi kawy")] == ["mem_1"]
+    assert index.search("Arsenal wynik")[0]["id"] == "mem_3"
+    assert index.search("arsenal", category="facts") == []
+    assert index.search("pogoda") == []
+
+
+def test_prompt_selection_prefers_matches_then_recent_within_budget():
+    from lib.memory_index import MemoryIndex, select_for_prompt
+    entries = [
+        {"id": f"mem_{i}", "text": f"Filler fact number {i}", "category": "facts",
+         "updated_at": f"2026-01-{i + 1:02d}T00:00:00"}
+        for i in range(20)
+    ]
+    entries.append({"id": "mem_tea", "text": "Prefers green tea", "category": "preferences",
+                    "updated_at": "2025-01-01T00:00:00"})
+    index = MemoryIndex(entries)
+    chosen = select_for_prompt(index.search("make me some tea", limit=3), entries, k=3,
+                               budget_tokens=1000)
+    assert [e["id"] for e in chosen] == ["mem_tea", "mem_19", "mem_18"]
+    # the token budget caps the digest before k does
+    assert len(select_for_prompt([], entries, k=20, budget_tokens=18)) == 2
+
+
+def test_proxy_search_and_profile_rank_against_the_message(tmp_path):
+    from lib.memory import _MemoryProxy
+
+    proxy = _MemoryProxy()
+    proxy._impl = _store(tmp_path)
+    asyncio.run(proxy.add("Prefers green tea", category="preferences"))
+    asyncio.run(proxy.add("Fast walker", category="habits"))
+    found = asyncio.run(proxy.search("tea please"))
+    assert [e["text"] for e in found] == ["Prefers green tea"] and found[0]["score"] > 0
+    digest = asyncio.run(proxy.profile("tea please", k=1, budget_tokens=100))
+    assert "green tea" in digest and "Fast walker" not in digest
+    asyncio.run(proxy.add("Walks the dog every morning", category="routines"))
+    assert "dog" in asyncio.run(proxy.profile("dog", k=1, budget_tokens=100))  # index follows writes
+
+
+def test_postgres_tsquery_uses_the_index_terms():
+    from app.db.memory_repo import tsquery
+    assert tsquery("Zrób mi kawę, kawy!") == "zro:* | kaw:*"
+    assert tsquery("jak to") == ""
+
+
+def test_proxy_search_prefers_a_native_backend_search(tmp_path):
+    from lib.memory import _MemoryProxy
+
+    class SearchingBackend:
+        async def search(self, query, limit=10, category=None):
+            return [{"id": "mem_1", "text": f"hit for {query}", "score": 1.0}]
+
+        async def all(self):
+            raise AssertionError("search must not load every entry")
+
+    proxy = _MemoryProxy()
+    proxy._impl = SearchingBackend()
+    assert asyncio.run(proxy.search("tea"))[0]["text"] == "hit for tea"
+
+
+def test_json_store_accepts_allow_similar(tmp_path):
+    s = _store(tmp_path)
+    s.add("Lubię kawę z mlekiem", category="preferences")
+    s.add("Nie lubię kawy z mlekiem", category="preferences", allow_similar=True)
+    assert len(s.all()) == 2
+
+
+def test_profile_ranks_with_the_backend_search(tmp_path):
+    from lib.memory import _MemoryProxy
+
+    class SearchingBackend:
+        def __init__(self):
+            self.entries = [
+                {"id": "mem_1", "text": "Prefers green tea", "category": "preferences", "updated_at": "1"},
+                {"id": "mem_2", "text": "Fast walker", "category": "habits", "updated_at": "2"},
+            ]
+
+        async def all(self):
+            return list(self.entries)
+
+        async def version(self):
+            return len(self.entries)
+
+        async def search(self, query, limit=10, category=None):
+            return [dict(self.entries[0], score=1.0)] if "tea" in query else []
+
+    proxy = _MemoryProxy()
+    proxy._impl = SearchingBackend()
+    digest = asyncio.run(proxy.profile("tea please", k=1, budget_tokens=100))
+    assert "green tea" in digest and "Fast walker" not in digest
+    proxy._impl.entries.append({"id": "mem_3", "text": "Night owl", "category": "habits", "updated_at": "3"})
+    assert "Night owl" in asyncio.run(proxy.profile("", k=1, budget_tokens=100))  # version moved
+
+
+def test_append_after_another_process_compacted_is_not_lost(tmp_path):
+    a = _store(tmp_path)
+    b = _store(tmp_path)
+    a.add("Likes tea", category="preferences")  # a now holds the journal open
+    b.add("Night owl", category="habits")
+    b.compact()  # unlinks the journal a is holding
+    a.add("Fast walker", category="habits")
+    texts = sorted(e["text"] for e in MemoryStore(path=a.path).all())
+    assert texts == ["Fast walker", "Likes tea", "Night owl"]
@@ -0,0 +1,96 @@
+"""Tests for the Postgres memory store's search and near-duplicate check
+(app/db/memory_repo.py) against a real database.
+
+Skipped unless TEST_DATABASE_URL points at a scratch Postgres (the tests write rows in
+a throwaway category and delete them afterwards); the trigram cases also need the
+pg_trgm extension.
+"""
+import asyncio
+import os
+import uuid
+
+import pytest
+
+from app.db import connection as dbconn
+
+TEST_URL = os.getenv("TEST_DATABASE_URL")
+pytestmark = pytest.mark.skipif(not TEST_URL, reason="TEST_DATABASE_URL not set")
+
+
+@pytest.fixture
+def run(monkeypatch):
+    """Run `test(store, category)` on one event loop against the test database."""
+    monkeypatch.setenv("DATABASE_URL", TEST_URL)
+    from app.db.memory_repo import PostgresMemoryStore
+    from app.db.schema import init_db
+    init_db()
+    category = "test_" + uuid.uuid4().hex[:8]
+
+    def runner(test):
+        async def main():
+            try:
+                return await test(PostgresMemoryStore(), category)
+            finally:
+                async with dbconn.async_connection() as conn:
+                    await conn.execute("DELETE FROM memory_entries WHERE category = %s", (category,))
+                await dbconn.close_pools()
+        return asyncio.run(main())
+    return runner
+
+
+def _has_trgm() -> bool:
+    async def check():
+        try:
+            from app.db.memory_repo import PostgresMemoryStore
+            async with dbconn.async_connection() as conn:
+                return await PostgresMemoryStore()._has_trgm(conn)
+        finally:
+            await dbconn.close_pools()
+    return asyncio.run(check())
+
+
+def test_full_text_search_matches_inflected_forms(run):
+    async def test(store, category):
+        await store.add("Pije kawę bez cukru", category=category)
+        await store.add("Mieszka w Warszawie", category=category)
+        found = await store.search("zrób mi kawy", category=category)
+        assert [e["text"] for e in found] == ["Pije kawę bez cukru"] and found[0]["score"] > 0
+        assert await store.search("kawy", category=category + "_other") == []
+    run(test)
+
+
+def test_exact_duplicate_refreshes_the_entry(run):
+    async def test(store, category):
+        first = await store.add("Fast walker", category=category)
+        again = await store.add("fast walker", category=category)
+        assert again["id"] == first["id"]
+        assert len(await store.by_category(category)) == 1
+    run(test)
+
+
+def test_similar_text_is_reported_not_overwritten(run):
+    if not _has_trgm():
+        pytest.skip("pg_trgm not installed")
+
+    async def test(store, category):
+        first = await store.add("Lubię kawę z mlekiem", category=category)
+        result = await store.add("Nie lubię kawy z mlekiem", category=category)
+        assert result["possible_duplicate"]["id"] == first["id"]
+        assert result["possible_duplicate"]["similarity"] >= 0.7
+        assert [e["text"] for e in await store.by_category(category)] == ["Lubię kawę z mlekiem"]
+
+        saved = await store.add("Nie lubię kawy z mlekiem", category=category, allow_similar=True)
+        assert saved["id"] != first["id"]
+        assert len(await store.by_category(category)) == 2
+    run(test)
+
+
+def test_trigram_search_tolerates_typos(run):
+    if not _has_trgm():
+        pytest.skip("pg_trgm not installed")
+
+    async def test(store, category):
+        await store.add("Kibicuje Arsenalowi", category=category)
+        found = await store.search("arsenlowi", category=category)  # no full-text match
+        assert [e["text"] for e in found] == ["Kibicuje Arsenalowi"]
+    run(test)
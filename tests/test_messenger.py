@@ -0,0 +1,49 @@
+"""Tests for the Messenger adapter's pure helpers (no network)."""
+from lib.messenger import split_flushable
+
+
+def test_split_flushable_cuts_at_last_paragraph_break():
+    ready, rest = split_flushable("Pierwszy akapit.\n\nDrugi.\n\nTrzeci w tok")
+    assert ready == "Pierwszy akapit.\n\nDrugi.\n\n"
+    assert rest == "Trzeci w tok"
+
+
+def test_split_flushable_holds_short_text_without_paragraph_break():
+    assert split_flushable("Krótko. I dalej") == ("", "Krótko. I dalej")
+
+
+def test_split_flushable_cuts_long_paragraph_at_sentence_end():
+    text = "a" * 20 + ". " + "b" * 20 + "! reszta"
+    ready, rest = split_flushable(text, min_chars=30)
+    assert ready == "a" * 20 + ". " + "b" * 20 + "! "
+    assert rest == "reszta"
+    assert ready + rest == text
+
+
+def test_sends_go_through_the_shared_client(monkeypatch):
+    import asyncio
+
+    import httpx
+
+    from lib import http_client
+    from lib.messenger import send_message, send_sender_action
+
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"recipient_id": "42"})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setitem(http_client._CLIENT, "client", client)
+    monkeypatch.setattr(http_client, "_HOST_SLOTS", {})
+    monkeypatch.setattr(http_client, "_METRICS", {})
+
+    async def main():
+        await send_sender_action("token", "42", "typing_on")
+        await send_message("token", "42", "x" * 2500)
+
+    asyncio.run(main())
+    assert [r.method for r in requests] == ["POST"] * 3
+    assert b'"sender_action":"typing_on"' in requests[0].content.replace(b" ", b"")
+    assert http_client._CLIENT["client"] is client
@@ -0,0 +1,65 @@
+"""Tests for the batched Yahoo Finance quotes (httpx MockTransport, no network)."""
+import asyncio
+import json
+from datetime import datetime, timezone
+
+import httpx
+
+from lib import http_client, quotes
+
+
+class _Cache:
+    def __init__(self):
+        self.data, self.ttls = {}, {}
+
+    async def get_from_cache(self, key):
+        return self.data.get(key)
+
+    async def save_to_cache(self, key, value, ttl=None):
+        self.data[key], self.ttls[key] = value, ttl
+
+
+def _chart(symbol, price):
+    return {"chart": {"result": [{"meta": {
+        "symbol": symbol, "regularMarketPrice": price, "chartPreviousClose": 50.0,
+        "currency": "PLN", "exchangeName": "WSE",
+    }}], "error": None}}
+
+
+def test_get_quotes_fetches_concurrently_and_caches(monkeypatch):
+    calls, active = [], {"now": 0, "max": 0}
+
+    async def handler(request):
+        symbol = request.url.path.rsplit("/", 1)[-1]
+        calls.append(symbol)
+        active["now"] += 1
+        active["max"] = max(active["max"], active["now"])
+        await asyncio.sleep(0.01)
+        active["now"] -= 1
+        if symbol == "NOPE":
+            return httpx.Response(404, json={"chart": {"result": None, "error": {"code": "Not Found"}}})
+        return httpx.Response(200, json=_chart(symbol, 55.0))
+    monkeypatch.setitem(http_client._CLIENT, "client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(http_client, "_HOST_SLOTS", {})
+    cache = _Cache()
+
+    table = asyncio.run(quotes.get_quotes(cache, ["pko.wa", "PZU.WA", "^WIG20", "PKO.WA", "nope"]))
+    assert active["max"] > 1 and sorted(calls) == sorted(["PKO.WA", "PZU.WA", "^WIG20", "NOPE"])
+    assert [row[0] for row in table["rows"]] == ["PKO.WA", "PZU.WA", "^WIG20"]
+    row = dict(zip(table["columns"], table["rows"][0]))
+    assert row["change_percent"] == 10.0
+    assert list(table["errors"]) == ["NOPE"]
+
+    asyncio.run(quotes.get_quotes(cache, ["PKO.WA"]))
+    assert len(calls) == 4
+    assert json.loads(cache.data["quote:PKO.WA"])["price"] == 55.0
+
+
+def test_quote_ttl_follows_the_trading_session():
+    day = lambda d, h: datetime(2026, 10, d, h, tzinfo=timezone.utc).timestamp()
+    # Friday session 07:00-15:00 UTC
+    meta = {"currentTradingPeriod": {"regular": {"start": day(16, 7), "end": day(16, 15)}}, "gmtoffset": 7200}
+    assert quotes.quote_ttl(meta, now=day(16, 10)) == quotes.QUOTE_TTL_OPEN
+    assert quotes.quote_ttl(meta, now=day(16, 5)) == 2 * 3600
+    # after Friday's close the next open is Monday 07:00
+    assert quotes.quote_ttl(meta, now=day(16, 16)) == int(day(19, 7) - day(16, 16))
@@ -15,7 +15,8 @@ def test_expected_agents_have_tools_registered():
 def test_finance_agent_has_fx_and_stock_tools():
     names = _tool_names("finance_agent")
     assert "get_exchange_rate" in names
-    assert "get_stock_quote" in names
+    assert "get_exchange_rate_change" in names
+    assert "get_stock_quotes" in names
 
 
 def test_news_agent_has_search_tool():
@@ -0,0 +1,83 @@
+"""Tests for the deterministic fast-path pre-router."""
+from lib import router
+from lib.text_utils import fold_diacritics
+
+ALL = set(router.ROUTE_STEMS)
+
+
+def test_fold_diacritics_handles_polish_letters():
+    assert fold_diacritics("Zgaś Światło, Łódź") == "zgas swiatlo, lodz"
+
+
+def test_single_domain_messages_are_routed():
+    r = router.KeywordRouter()
+    assert r.classify("Zgaś światło w salonie") == "iot_operator"
+    assert r.classify("Jaka jutro pogoda w Krakowie?") == "weather_agent"
+    assert r.classify("ile punktów mam w FPL?") == "fpl_agent"
+    assert r.classify("jak dojadę do pracy?") == "maps_agent"
+
+
+def test_ambiguous_or_unknown_messages_fall_back():
+    r = router.KeywordRouter()
+    assert r.classify("cześć, co u ciebie?") is None
+    # two domains -> coordinator
+    assert r.classify("jaka pogoda i zapal lampę") is None
+    # long multi-part request -> coordinator, even with a single domain
+    assert r.classify("pogoda " + "i jeszcze coś " * 10) is None
+
+
+def test_ambiguous_words_do_not_route_unrelated_messages():
+    r = router.KeywordRouter()
+    assert r.classify("Co powiedział premier Tusk?") is None
+    assert r.classify("Jaka jest stolica Europy?") is None
+    assert r.classify("Mieszkanie ma 50 metrów") is None
+    assert r.classify("Mam zapalenie gardła") is None
+    assert r.classify("Codziennie biegam 5 km") is None
+    # a hint still makes a message with another domain's stem ambiguous
+    assert r.classify("codziennie o 7 podawaj mi pogodę") is None
+    # ... while the whole words keep routing
+    assert r.classify("Zapal lampę w kuchni") == "iot_operator"
+    assert r.classify("ile kosztuje euro?") == "finance_agent"
+    assert r.classify("czy metro dziś jeździ?") == "maps_agent"
+    assert r.classify("kto prowadzi w premier league fantasy?") == "fpl_agent"
+
+
+def test_generic_stems_need_a_second_cue():
+    r = router.KeywordRouter()
+    for text in ("kurs angielskiego", "akcja filmu", "Spotkanie we Frankfurcie",
+                 "5 funtów w kilogramach", "temperatura wrzenia wody", "Kup mrożonki",
+                 "Przypomnij mi kto był prezydentem", "lampa naftowa historia"):
+        assert r.classify(text) is None, text
+    # ... and route once the domain is confirmed
+    assert r.classify("jaki jest kurs franka?") == "finance_agent"
+    assert r.classify("ile złotych za funta?") == "finance_agent"
+    assert r.classify("jaka temperatura jutro?") == "weather_agent"
+    assert r.classify("czy będzie mróz?") == "weather_agent"
+    assert r.classify("przypomnij mi jutro o lekach") == "scheduler_agent"
+    assert r.classify("włącz lampę w salonie") == "iot_operator"
+
+
+def test_pre_route_respects_switch_and_enabled_agents(monkeypatch):
+    monkeypatch.setattr(router, "_STATS", {"turns": 0, "fast_path": 0, "by_agent": {}})
+    monkeypatch.delenv("FAST_PATH_ENABLED", raising=False)
+    assert router.pre_route("zgaś światło", ALL) == "iot_operator"
+    assert router.pre_route("zgaś światło", ALL - {"iot_operator"}) is None
+    assert router.pre_route("hej", ALL) is None
+    monkeypatch.setenv("FAST_PATH_ENABLED", "off")
+    assert router.pre_route("zgaś światło", ALL) is None
+
+    stats = router.routing_stats()
+    assert stats["turns"] == 3 and stats["fast_path"] == 1
+    assert stats["hit_rate"] == round(1 / 3, 3)
+    assert stats["by_agent"] == {"iot_operator": 1}
+
+
+def test_set_router_plugs_in_a_custom_router(monkeypatch):
+    monkeypatch.setattr(router, "_ROUTER", {"router": router.KeywordRouter()})
+
+    class Always:
+        def classify(self, text):
+            return "news_agent"
+
+    router.set_router(Always())
+    assert router.pre_route("anything", ALL) == "news_agent"
@@ -0,0 +1,36 @@
+"""Tests for the shared, pooled model provider behind every run's RunConfig."""
+import asyncio
+
+from lib import run_config
+from lib.run_config import Config
+
+
+def _reset(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setattr(run_config, "_PROVIDER", {"provider": None, "http_client": None})
+
+
+def test_runs_share_one_provider_but_get_their_own_run_config(monkeypatch):
+    _reset(monkeypatch)
+    first, second = Config.create_config(), Config.create_config()
+    assert first is not second
+    assert first.model_provider is second.model_provider
+
+
+def test_pool_limits_come_from_env(monkeypatch):
+    _reset(monkeypatch)
+    monkeypatch.setenv("OPENAI_MAX_CONNECTIONS", "7")
+    monkeypatch.setenv("OPENAI_KEEPALIVE_EXPIRY", "not-a-number")
+    client = run_config._build_http_client()
+    pool = client._transport._pool
+    assert pool._max_connections == 7
+    assert pool._keepalive_expiry == 120  # bad value falls back to the default
+    asyncio.run(client.aclose())
+
+
+def test_close_shared_provider_resets_and_is_idempotent(monkeypatch):
+    _reset(monkeypatch)
+    provider = run_config.shared_provider()
+    asyncio.run(run_config.close_shared_provider())
+    asyncio.run(run_config.close_shared_provider())
+    assert run_config.shared_provider() is not provider
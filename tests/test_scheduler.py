@@ -137,7 +137,7 @@ def test_tick_fires_due_once_job_and_marks_done(tmp_path):
     job = st.add(build_job("remind", "log", None, "repl", delay_minutes=0))
     calls, invoke, deliver = _spies()
 
-    fired = asyncio.run(scheduler_runner.tick_once(st, invoke, deliver,
+    fired = asyncio.run(scheduler_runner.tick_once(scheduler._JobStoreProxy(st), invoke, deliver,
                                                    now=now_tz() + timedelta(seconds=1)))
     assert fired == 1
     assert calls["invoke"] == [job["id"]]
@@ -158,7 +158,7 @@ def test_tick_rearms_recurring_job(tmp_path):
     calls, invoke, deliver = _spies()
 
     now = now_tz()
-    fired = asyncio.run(scheduler_runner.tick_once(st, invoke, deliver, now=now))
+    fired = asyncio.run(scheduler_runner.tick_once(scheduler._JobStoreProxy(st), invoke, deliver, now=now))
     assert fired == 1
 
     stored = st.get(job["id"])
@@ -174,7 +174,7 @@ def test_tick_recurring_stops_at_max_runs(tmp_path):
     st.add(job)
     _, invoke, deliver = _spies()
 
-    asyncio.run(scheduler_runner.tick_once(st, invoke, deliver, now=now_tz()))
+    asyncio.run(scheduler_runner.tick_once(scheduler._JobStoreProxy(st), invoke, deliver, now=now_tz()))
     stored = st.get(job["id"])
     assert stored["status"] == "done"
     assert stored["run_count"] == 1
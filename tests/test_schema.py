@@ -0,0 +1,83 @@
+"""Tests for the versioned schema migrations (app/db/schema.py)."""
+import contextlib
+
+import pytest
+
+from app.db import schema
+
+
+class FakeConn:
+    """Records statements; answers the schema_version queries from `applied`."""
+
+    def __init__(self, applied=()):
+        self.applied = list(applied)
+        self.executed = []
+
+    def execute(self, query, params=None):
+        self.executed.append(query)
+        if "max(version)" in query:
+            rows = [(max(self.applied, default=0),)]
+        elif query.startswith("SELECT version FROM schema_version"):
+            rows = [(v,) for v in self.applied]
+        else:
+            rows = []
+        if query.startswith("INSERT INTO schema_version"):
+            self.applied.append(params[0])
+        cur = type("Cur", (), {})()
+        cur.fetchone = lambda: rows[0] if rows else None
+        cur.fetchall = lambda: rows
+        return cur
+
+
+def _migrations(tmp_path, *names):
+    for name in names:
+        (tmp_path / name).write_text(f"CREATE TABLE IF NOT EXISTS t{name[:4]} (id INT);")
+    return schema.load_migrations(tmp_path)
+
+
+def test_repository_migrations_are_ordered_and_cover_every_table():
+    migrations = schema.load_migrations()
+    assert [m.version for m in migrations] == list(range(1, len(migrations) + 1))
+    sql = "\n".join(m.sql() for m in migrations)
+    for table in ("memory_entries", "scheduled_jobs", "fpl_reference", "fx_snapshots", "geocode_cache"):
+        assert f"CREATE TABLE IF NOT EXISTS {table}" in sql
+
+
+def test_misnamed_or_duplicate_migration_files_are_rejected(tmp_path):
+    (tmp_path / "0001_init.sql").write_text("")
+    (tmp_path / "0001_again.sql").write_text("")
+    with pytest.raises(ValueError, match="duplicate"):
+        schema.load_migrations(tmp_path)
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / "init.sql").write_text("")
+    with pytest.raises(ValueError, match="0001_name.sql"):
+        schema.load_migrations(other)
+
+
+def test_migrate_applies_only_pending_versions_in_order(tmp_path):
+    migrations = _migrations(tmp_path, "0001_a.sql", "0002_b.sql", "0003_c.sql")
+    conn = FakeConn(applied=[1])
+    applied = schema.migrate(conn, target=2, migrations=migrations)
+    assert [m.version for m in applied] == [2]
+    assert conn.applied == [1, 2]
+    assert "pg_advisory_xact_lock" in conn.executed[0]
+    assert [m.version for m in schema.migrate(conn, migrations=migrations)] == [3]
+
+
+def test_init_db_is_one_version_check_per_process(monkeypatch):
+    latest = schema.latest_version()
+    conns = []
+
+    @contextlib.contextmanager
+    def fake_connection():
+        conns.append(FakeConn(applied=range(1, latest + 1)))
+        yield conns[-1]
+
+    monkeypatch.setattr(schema, "connection", fake_connection)
+    monkeypatch.setattr(schema, "_ensured", False)
+    schema.init_db()
+    schema.init_db()
+    assert len(conns) == 1
+    assert conns[0].executed == ["SELECT coalesce(max(version), 0) FROM schema_version"]
+    assert schema.schema_ensured()
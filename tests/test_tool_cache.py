@@ -0,0 +1,101 @@
+"""Tests for the tool-result cache decorator."""
+import asyncio
+import types
+
+from lib import tool_cache
+
+
+class _MemCache:
+    def __init__(self):
+        self.data, self.ttls = {}, {}
+
+    async def get_from_cache(self, key):
+        return self.data.get(key)
+
+    async def save_to_cache(self, key, val, ttl=None):
+        self.data[key], self.ttls[key] = val, ttl
+
+
+def _ctx(cache=None, **state):
+    return types.SimpleNamespace(context=types.SimpleNamespace(cache=cache or _MemCache(), **state))
+
+
+def _tool(calls, result=None, **options):
+    @tool_cache.cached_tool(**options)
+    async def lookup(ctx, city: str = "Warsaw", days: int = 1):
+        calls.append(city)
+        await asyncio.sleep(0)
+        return result if result is not None else {"city": city, "days": days}
+    return lookup
+
+
+def test_normalized_arguments_share_an_entry(monkeypatch):
+    monkeypatch.setattr(tool_cache, "_STATS", {})
+    calls = []
+    lookup = _tool(calls, ttl=600)
+    ctx = _ctx()
+
+    async def scenario():
+        first = await lookup(ctx, "Kraków")
+        again = await lookup(ctx, city="  krakow ")
+        default = await lookup(ctx)
+        explicit = await lookup(ctx, "warsaw", days=1)
+        return first, again, default, explicit
+
+    first, again, default, explicit = asyncio.run(scenario())
+    assert calls == ["Kraków", "Warsaw"]
+    assert again == first and explicit == default
+    assert set(ctx.context.cache.ttls.values()) == {600}
+    assert tool_cache.tool_cache_stats()["lookup"] == {"hits": 2, "misses": 2, "coalesced": 0, "hit_rate": 0.5}
+
+
+def test_errors_are_cached_briefly(monkeypatch):
+    calls = []
+    lookup = _tool(calls, result={"Error": "API down"}, ttl=600, error_ttl=15)
+    ctx = _ctx()
+    asyncio.run(lookup(ctx))
+    assert list(ctx.context.cache.ttls.values()) == [15]
+
+
+def test_concurrent_identical_calls_run_once(monkeypatch):
+    monkeypatch.setattr(tool_cache, "_STATS", {})
+    calls = []
+    lookup = _tool(calls, ttl=600)
+    ctx = _ctx()
+
+    async def scenario():
+        return await asyncio.gather(*(lookup(ctx, "Gdańsk") for _ in range(5)))
+
+    results = asyncio.run(scenario())
+    assert calls == ["Gdańsk"]
+    assert all(r == results[0] for r in results)
+    assert tool_cache.tool_cache_stats()["lookup"]["coalesced"] == 4
+
+
+def test_when_and_master_switch_bypass_the_cache(monkeypatch):
+    calls = []
+    lookup = _tool(calls, ttl=600, when=lambda ctx: ctx.context.ready)
+    asyncio.run(lookup(_ctx(ready=False)))
+    asyncio.run(lookup(_ctx(ready=False)))
+    assert len(calls) == 2
+
+    monkeypatch.setenv("TOOL_CACHE_ENABLED", "false")
+    ctx = _ctx(ready=True)
+    asyncio.run(lookup(ctx))
+    assert ctx.context.cache.data == {}
+
+
+def test_decorated_tools_keep_their_schema():
+    from lib import tools
+    assert tools.weather_forecast.name == "weather_forecast"
+    assert set(tools.weather_forecast.params_json_schema["properties"]) == {"forecast_days", "forecast_type", "city", "detail"}
+
+
+def test_results_that_are_not_json_are_not_cached():
+    calls = []
+    lookup = _tool(calls, result={"observed": object()}, ttl=600)
+    ctx = _ctx()
+    first = asyncio.run(lookup(ctx))
+    again = asyncio.run(lookup(ctx))
+    assert len(calls) == 2 and type(first) is type(again) is dict
+    assert ctx.context.cache.data == {}
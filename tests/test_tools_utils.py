@@ -86,7 +86,7 @@ def test_summarize_fixture_events_resolves_names_and_sides():
 
 
 def test_player_playing_status_distinguishes_bench_from_pitch():
-    from lib.tools import _player_playing_status
+    from lib.tools.fpl import _player_playing_status
     live = {"live": True, "finished": False}
     finished = {"live": False, "finished": True}
     # in the owner's XI but benched in the real, live match (the Dalot case)
@@ -130,6 +130,23 @@ def test_validate_currency_code_rejects_unknown_codes():
     assert validate_currency_code("") is False
 
 
+def test_currency_code_maps_polish_names():
+    from lib.currencies import currency_code
+    assert currency_code("Złotych") == "PLN"
+    assert currency_code(" dolarów ") == "USD"
+    assert currency_code("korona szwedzka") == "SEK"
+    assert currency_code("gbp") == "GBP"
+    assert currency_code("talary") is None
+
+
+def test_startup_path_does_not_import_pycountry():
+    import subprocess
+    import sys
+    code = "import sys, lib.tools_utils; print('pycountry' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+
 def test_simplify_directions_response_extracts_leg_summary():
     sample = [
         {
@@ -224,3 +241,43 @@ def test_normalize_departure_time_bare_clock_time_uses_today():
     today = datetime.now(WARSAW_TZ).date()
     expected = int(datetime(today.year, today.month, today.day, 8, 0, tzinfo=WARSAW_TZ).timestamp())
     assert result == expected
+
+
+class _FakeTavily:
+    def __init__(self, fail_general=False):
+        self.fail_general = fail_general
+        self.active = 0
+        self.max_active = 0
+
+    async def search(self, query, include_domains=None, **kwargs):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if include_domains:
+            return {"answer": "r", "results": [{"url": "https://www.reuters.com/a/"}]}
+        if self.fail_general:
+            raise RuntimeError("quota")
+        return {"answer": "g", "results": [{"url": "http://reuters.com/a"}, {"url": "https://bbc.com/b"}]}
+
+
+def test_news_search_runs_concurrently_and_dedupes_urls(monkeypatch):
+    from lib import tools_utils
+    fake = _FakeTavily()
+    monkeypatch.setitem(tools_utils._TAVILY, "client", fake)
+    result = asyncio.run(tools_utils.tavily_news_search("gold price", "finance", "basic"))
+    assert fake.max_active == 2
+    assert [r["url"] for r in result["reputable source"]["results"]] == ["https://www.reuters.com/a/"]
+    assert [r["url"] for r in result["general_search"]["results"]] == ["https://bbc.com/b"]
+    assert "partial_error" not in result
+
+
+def test_news_search_keeps_the_search_that_succeeded(monkeypatch):
+    from lib import tools_utils
+    monkeypatch.setitem(tools_utils._TAVILY, "client", _FakeTavily(fail_general=True))
+    result = asyncio.run(tools_utils.tavily_news_search("election", "news", "basic"))
+    assert result["general_search"] == {"Error": "quota"}
+    assert result["reputable source"]["answer"] == "r"
+    # flagged at the top level, so the tool cache keeps it only for the error TTL
+    from lib.tool_cache import is_error_result
+    assert result["partial_error"] and is_error_result(result)
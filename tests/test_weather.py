@@ -0,0 +1,28 @@
+"""Tests for the current-weather tool's output (OpenWeather response -> plain dict)."""
+import json
+
+from lib.tools.weather import _observation_summary
+
+# A units=metric response, as current_weather requests it.
+_OWM_RESPONSE = {
+    "coord": {"lon": 21.01, "lat": 52.23},
+    "weather": [{"id": 500, "main": "Rain", "description": "light rain", "icon": "10d"}],
+    "main": {"temp": 12.35, "feels_like": 11.45, "temp_min": 10.85, "temp_max": 12.85,
+             "pressure": 1012, "humidity": 80},
+    "visibility": 10000,
+    "wind": {"speed": 4.1, "deg": 240},
+    "rain": {"1h": 0.3},
+    "clouds": {"all": 75},
+    "dt": 1760600000,
+    "sys": {"country": "PL", "sunrise": 1760590000, "sunset": 1760630000},
+    "timezone": 7200, "id": 756135, "name": "Warsaw", "cod": 200,
+}
+
+
+def test_observation_summary_is_plain_json():
+    summary = _observation_summary(_OWM_RESPONSE)
+    assert json.loads(json.dumps(summary)) == summary
+    assert summary["place"] == "Warsaw, PL" and summary["status"] == "light rain"
+    assert summary["temperature_c"] == 12.35 and summary["rain"] == {"1h": 0.3}
+    assert summary["time"] == "2025-10-16T07:33:20+00:00"
+    assert summary["snow"] is None
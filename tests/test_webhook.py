@@ -0,0 +1,32 @@
+"""Tests for the webhook's reply delivery order (Send API calls are faked)."""
+import asyncio
+import logging
+
+from app import webhook
+
+
+def test_reply_waits_for_the_typing_indicator(monkeypatch):
+    log = []
+
+    async def send_sender_action(token, recipient, action="typing_on"):
+        await asyncio.sleep(0.01)
+        log.append(action)
+
+    async def send_message(token, recipient, text):
+        log.append(text)
+
+    monkeypatch.setattr(webhook, "send_sender_action", send_sender_action)
+    monkeypatch.setattr(webhook, "send_message", send_message)
+    # Added by Logger.config_root_logger at service start-up.
+    monkeypatch.setattr(logging.Logger, "conversation", lambda self, msg: None, raising=False)
+
+    async def main():
+        typing = asyncio.create_task(send_sender_action("t", "1"))
+        streamed = webhook._StreamedReply("1", typing)
+        reply = asyncio.get_running_loop().create_future()
+        await streamed.on_text("Pierwszy akapit.\n\nDrugi")
+        reply.set_result("Pierwszy akapit.\n\nDrugi")
+        await webhook._process(reply, "1", typing, streamed)
+
+    asyncio.run(main())
+    assert log == ["typing_on", "Pierwszy akapit.", "typing_on", "Drugi"]